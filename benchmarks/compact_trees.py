@@ -0,0 +1,79 @@
+"""Compare the memory retained by regular and compact recursive trees.
+
+Builds a synthetic recursive :class:`Tree <github3.git.Tree>` of ``ENTRIES``
+entries, as returned by ``Repository.tree(sha)`` followed by
+``Tree.recurse()``, and reports the memory retained once the decoded JSON
+is no longer referenced, as measured by :mod:`tracemalloc`.
+
+Run from the root of the repository::
+
+    $ python benchmarks/compact_trees.py [ENTRIES]
+"""
+from __future__ import print_function
+
+import gc
+import hashlib
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from github3.git import Tree  # noqa: E402
+
+ENTRIES = 300000
+URL = 'https://api.github.com/repos/octocat/monorepo/git/{0}/{1}'
+
+
+def payload(entries):
+    tree = []
+    for i in range(entries):
+        sha = hashlib.sha1(str(i).encode()).hexdigest()
+        kind = 'tree' if i % 10 == 0 else 'blob'
+        entry = {
+            'path': 'src/module{0}/package{1}/file{2}.py'.format(
+                i // 1000, i // 100 % 10, i),
+            'mode': '040000' if kind == 'tree' else '100644',
+            'type': kind,
+            'sha': sha,
+            'url': URL.format(kind + 's', sha),
+        }
+        if kind == 'blob':
+            entry['size'] = i % 5000
+        tree.append(entry)
+    return {'sha': '9fb037999f264ba9a7fc6274d15fa3ae2ab98312',
+            'url': URL.format('trees', 'master'), 'tree': tree,
+            'truncated': False}
+
+
+def retained(entries, compact):
+    gc.collect()
+    tracemalloc.start()
+    tree = Tree(payload(entries), compact=compact)
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(tree.tree) == entries
+    return size
+
+
+def main():
+    entries = int(sys.argv[1]) if len(sys.argv) > 1 else ENTRIES
+    data = payload(1000)
+    print('Tree of {0} entries'.format(entries))
+    for compact in (False, True):
+        size = retained(entries, compact)
+
+        def build():
+            Tree(dict(data, tree=[dict(h) for h in data['tree']]),
+                 compact=compact)
+        seconds = min(timeit.repeat(build, number=1, repeat=5))
+        print('  {0:8} {1:7.1f} MiB retained  {2:5.0f} bytes/entry  '
+              '{3:4.2f} us/entry to build'.format(
+                  'compact' if compact else 'regular', size / 2.0 ** 20,
+                  float(size) / entries, seconds / 1000 * 1e6))
+
+
+if __name__ == '__main__':
+    main()
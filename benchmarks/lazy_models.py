@@ -0,0 +1,65 @@
+"""Compare eager and lazy construction of models.
+
+Builds :class:`Repository <github3.repos.repo.Repository>` and
+:class:`PullRequest <github3.pulls.PullRequest>` objects from the fixtures in
+``tests/json`` eagerly and lazily, both without reading any attribute and
+when reading a single one.
+
+Run from the root of the repository::
+
+    $ python benchmarks/lazy_models.py
+"""
+from __future__ import print_function
+
+import copy
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from github3.pulls import PullRequest  # noqa: E402
+from github3.repos.repo import Repository  # noqa: E402
+from github3.session import GitHubSession  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(__file__), '..', 'tests', 'json')
+NUMBER = 2000
+
+
+def load(name):
+    with open(os.path.join(FIXTURES, name)) as fd:
+        return json.load(fd)
+
+
+def bench(cls, data, attribute, session):
+    payloads = [copy.deepcopy(data) for _ in range(NUMBER)]
+    results = []
+    for lazy in (False, True):
+        for read in (False, True):
+            def build():
+                for payload in payloads:
+                    obj = cls(payload, session, lazy=lazy)
+                    if read:
+                        getattr(obj, attribute)
+            seconds = min(timeit.repeat(build, number=1, repeat=3))
+            results.append((lazy, read, seconds))
+    return results
+
+
+def main():
+    session = GitHubSession()
+    for (cls, fixture, attribute) in [(Repository, 'repo', 'full_name'),
+                                      (PullRequest, 'pull', 'title')]:
+        print('{0} x {1}'.format(cls.__name__, NUMBER))
+        for (lazy, read, seconds) in bench(cls, load(fixture), attribute,
+                                           session):
+            print('  {0:5} {1:20} {2:8.1f} us/object'.format(
+                'lazy' if lazy else 'eager',
+                'reading .' + attribute if read else 'construction only',
+                seconds / NUMBER * 1e6,
+            ))
+
+
+if __name__ == '__main__':
+    main()
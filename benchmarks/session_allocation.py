@@ -0,0 +1,64 @@
+"""Measure the sessions allocated while building nested objects.
+
+Builds a :class:`Comparison <github3.repos.comparison.Comparison>` holding
+250 commits from the fixture in ``tests/json/comparison`` and reports how
+many :class:`GitHubSession <github3.session.GitHubSession>` instances were
+created along with the average construction time.
+
+Run from the root of the repository::
+
+    $ python benchmarks/session_allocation.py
+"""
+from __future__ import print_function
+
+import copy
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from github3 import session  # noqa: E402
+from github3.repos.comparison import Comparison  # noqa: E402
+
+FIXTURE = os.path.join(os.path.dirname(__file__), '..', 'tests', 'json',
+                       'comparison')
+COMMITS = 250
+REPEAT = 20
+
+
+def load_comparison():
+    with open(FIXTURE) as fd:
+        comparison = json.load(fd)
+    commit = comparison['commits'][0]
+    comparison['commits'] = [copy.deepcopy(commit) for _ in range(COMMITS)]
+    comparison['total_commits'] = COMMITS
+    return comparison
+
+
+def main():
+    data = load_comparison()
+    created = [0]
+    original_init = session.GitHubSession.__init__
+
+    def counting_init(self, *args, **kwargs):
+        created[0] += 1
+        original_init(self, *args, **kwargs)
+
+    session.GitHubSession.__init__ = counting_init
+    try:
+        Comparison(copy.deepcopy(data))
+        sessions = created[0]
+        seconds = timeit.timeit(lambda: Comparison(copy.deepcopy(data)),
+                                number=REPEAT) / REPEAT
+    finally:
+        session.GitHubSession.__init__ = original_init
+
+    print('Comparison with {0} commits'.format(COMMITS))
+    print('  sessions created per comparison: {0}'.format(sessions))
+    print('  construction time: {0:.2f} ms'.format(seconds * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""Compare the peak memory of regular and streaming iterators.
+
+Walks ``PAGES`` pages of ``PER_PAGE`` repositories, each padded to roughly
+``ITEM_SIZE`` bytes, served by a fake adapter which generates the bodies on
+the fly. Every mode runs in its own process so that the peak resident set
+size (``ru_maxrss``) of one does not hide the other; the peak of the Python
+allocations traced by :mod:`tracemalloc` is reported as well.
+
+Run from the root of the repository::
+
+    $ python benchmarks/streaming_iterators.py
+"""
+from __future__ import print_function
+
+import json
+import os
+import resource
+import subprocess
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import requests  # noqa: E402
+from requests.adapters import BaseAdapter  # noqa: E402
+
+from github3.repos.repo import Repository  # noqa: E402
+from github3.session import GitHubSession  # noqa: E402
+from github3.structs import GitHubIterator, page_number  # noqa: E402
+
+FIXTURE = os.path.join(os.path.dirname(__file__), '..', 'tests', 'json',
+                       'repo')
+URL = 'https://api.github.com/repositories'
+PAGES = 5
+PER_PAGE = 100
+ITEM_SIZE = 64 * 1024
+
+
+class PageBody(object):
+    """File-like body generating a page of repositories when read."""
+
+    def __init__(self, item):
+        self.chunks = self.generate(item)
+        self.pending = b''
+
+    @staticmethod
+    def generate(item):
+        yield b'['
+        for i in range(PER_PAGE):
+            if i:
+                yield b','
+            yield item
+        yield b']'
+
+    def read(self, size=-1, **kwargs):
+        while size < 0 or len(self.pending) < size:
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                break
+            self.pending += chunk
+        if size < 0:
+            size = len(self.pending)
+        data, self.pending = self.pending[:size], self.pending[size:]
+        return data
+
+    def close(self):
+        pass
+
+
+class FakeAdapter(BaseAdapter):
+    def __init__(self, item):
+        super(FakeAdapter, self).__init__()
+        self.item = item
+
+    def send(self, request, **kwargs):
+        page = page_number(request.url) or 1
+        response = requests.Response()
+        response.status_code = 200
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        response.raw = PageBody(self.item)
+        if page < PAGES:
+            response.headers['Link'] = '<{0}?page={1}>; rel="next"'.format(
+                URL, page + 1)
+        return response
+
+    def close(self):
+        pass
+
+
+def walk(stream):
+    with open(FIXTURE) as fd:
+        data = json.load(fd)
+    data['description'] = 'x' * ITEM_SIZE
+    item = json.dumps(data).encode('utf-8')
+
+    session = GitHubSession()
+    session.mount('https://', FakeAdapter(item))
+    iterator = GitHubIterator(-1, URL, Repository, session)
+    iterator.stream = stream
+
+    tracemalloc.start()
+    count = sum(1 for _ in iterator)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({'count': count, 'peak': peak, 'rss': rss}))
+
+
+def main():
+    if len(sys.argv) > 1:
+        return walk(sys.argv[1] == 'stream')
+
+    print('{0} pages of {1} items of ~{2} KiB'.format(
+        PAGES, PER_PAGE, ITEM_SIZE // 1024))
+    for mode in ('regular', 'stream'):
+        output = subprocess.check_output(
+            [sys.executable, __file__, mode]
+        ).decode('utf-8')
+        result = json.loads(output)
+        print('  {0:8} {1:4} items  traced peak {2:7.1f} MiB  '
+              'max RSS {3:7.1f} MiB'.format(mode, result['count'],
+                                            result['peak'] / 2.0 ** 20,
+                                            result['rss'] / 1024.0))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+"""
+github3.aio
+===========
+
+An asynchronous interface to the GitHub API built on asyncio and aiohttp.
+
+This package requires Python 3.6 or newer and aiohttp, which can be installed
+with ``pip install github3.py[aio]``.
+
+"""
+from .github import GitHub
+from .repos import Repository
+from .session import AsyncGitHubSession
+from .structs import GitHubIterator, SearchIterator
+
+__all__ = (
+    'AsyncGitHubSession', 'GitHub', 'GitHubIterator', 'Repository',
+    'SearchIterator',
+)
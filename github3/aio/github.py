@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+github3.aio.github
+==================
+
+This module contains the asynchronous entry point to the GitHub API.
+
+"""
+from .. import github
+from ..models import GitHubCore
+from ..orgs import Organization
+from ..users import User
+from .models import AsyncGitHubCore, gather_bounded
+from .repos import Repository
+from .session import AsyncGitHubSession
+from .structs import SearchIterator
+
+
+class GitHub(AsyncGitHubCore, github.GitHub):
+
+    """The asynchronous counterpart of :class:`GitHub <github3.GitHub>`.
+
+    Objects are retrieved with coroutines and collections are walked with
+    ``async for``::
+
+        import asyncio
+        from github3 import aio
+
+        async def main():
+            async with aio.GitHub(token='...') as gh:
+                repository = await gh.repository('sigmavirus24', 'github3.py')
+                async for pull in repository.pull_requests(state='all'):
+                    print(pull.title)
+
+        asyncio.get_event_loop().run_until_complete(main())
+
+    The connection pool is closed with :meth:`close` or when leaving the
+    ``async with`` block.
+    """
+
+    def __init__(self, username='', password='', token='', session=None):
+        GitHubCore.__init__(self, {}, session or AsyncGitHubSession())
+        if token:
+            self.login(username, token=token)
+        elif username and password:
+            self.login(username, password)
+
+    def _repr(self):
+        if self.session.auth:
+            return '<AsyncGitHub [{0[0]}]>'.format(self.session.auth)
+        return '<AsyncGitHub at 0x{0:x}>'.format(id(self))
+
+    def _search_iter(self, count, url, cls, params=None, etag=None,
+                     headers=None):
+        return SearchIterator(count, url, cls, self, params, etag, headers)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def close(self):
+        """Close the connections held by this client."""
+        await self.session.close()
+
+    async def me(self):
+        """Retrieves the info for the authenticated user.
+
+        :returns: The representation of the authenticated user.
+        :rtype: :class:`User <github3.users.User>`
+        """
+        url = self._build_url('user')
+        json = self._json(await self._get(url), 200)
+        return self._instance_or_null(User, json)
+
+    async def organization(self, username):
+        """Returns a Organization object for the login name
+
+        :param str username: (required), login name of the org
+        :returns: :class:`Organization <github3.orgs.Organization>`
+        """
+        url = self._build_url('orgs', username)
+        json = self._json(await self._get(url), 200)
+        return self._instance_or_null(Organization, json)
+
+    async def repositories_bulk(self, repositories, workers=8):
+        """Retrieve many repositories concurrently.
+
+        :param list repositories: (required), the repositories to retrieve,
+            either as ``'owner/name'`` strings or ``(owner, name)`` tuples
+        :param int workers: (optional), maximum number of concurrent
+            requests. Default: 8
+        :returns: list with, in the order requested, what :meth:`repository`
+            returned for each repository or the exception it raised
+        """
+        async def fetch(repository):
+            if isinstance(repository, (tuple, list)):
+                owner, name = repository
+            else:
+                owner, _, name = repository.partition('/')
+            return await self.repository(owner, name)
+
+        return await gather_bounded(fetch, repositories, workers)
+
+    async def repository(self, owner, repository):
+        """Returns a Repository object for the specified combination of
+        owner and repository
+
+        :param str owner: (required)
+        :param str repository: (required)
+        :returns: :class:`Repository <github3.aio.repos.Repository>`
+        """
+        json = None
+        if owner and repository:
+            url = self._build_url('repos', owner, repository)
+            json = self._json(await self._get(url), 200)
+        return self._instance_or_null(Repository, json)
+
+    async def repository_with_id(self, number):
+        """Returns the Repository with id ``number``.
+
+        :param int number: id of the repository
+        :returns: :class:`Repository <github3.aio.repos.Repository>`
+        """
+        number = int(number)
+        json = None
+        if number > 0:
+            url = self._build_url('repositories', str(number))
+            json = self._json(await self._get(url), 200)
+        return self._instance_or_null(Repository, json)
+
+    async def user(self, username):
+        """Returns a User object for the specified user name.
+
+        :param str username: name of the user
+        :returns: :class:`User <github3.users.User>`
+        """
+        url = self._build_url('users', username)
+        json = self._json(await self._get(url), 200)
+        return self._instance_or_null(User, json)
+
+    async def users_bulk(self, usernames, workers=8):
+        """Retrieve many users concurrently.
+
+        :param list usernames: (required), login names of the users
+        :param int workers: (optional), maximum number of concurrent
+            requests. Default: 8
+        :returns: list with, in the order requested, what :meth:`user`
+            returned for each login name or the exception it raised
+        """
+        return await gather_bounded(self.user, usernames, workers)
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+github3.aio.models
+==================
+
+This module provides the base class shared by the asynchronous models.
+
+"""
+import asyncio
+
+from .structs import GitHubIterator
+
+#: Maps synchronous model classes to the asynchronous classes used in their
+#: place by the objects in this package
+ASYNC_CLASSES = {}
+
+
+async def gather_bounded(func, items, workers=8):
+    """Await ``func(item)`` for every item, at most ``workers`` at a time.
+
+    This is the asynchronous counterpart of
+    :func:`github3.utils.map_concurrently`; exceptions take the place of the
+    results of the calls that raised them.
+
+    :returns: the results (or exceptions) in the order of ``items``
+    :rtype: list
+    """
+    semaphore = asyncio.Semaphore(workers)
+
+    async def call(item):
+        async with semaphore:
+            return await func(item)
+
+    return await asyncio.gather(*[call(item) for item in items],
+                                return_exceptions=True)
+
+
+class AsyncGitHubCore(object):
+
+    """Mixin turning a :class:`GitHubCore <github3.models.GitHubCore>`
+    sub-class into an asynchronous one.
+
+    Iterators returned by ``_iter`` are asynchronous and the objects they
+    build are replaced by their asynchronous variants when one exists. The
+    methods of the synchronous class that were not made asynchronous cannot
+    be used; those parsing a response raise a :class:`TypeError` saying so.
+    """
+
+    def _boolean(self, response, true_code, false_code):
+        self._check_awaited(response)
+        return super(AsyncGitHubCore, self)._boolean(response, true_code,
+                                                     false_code)
+
+    def _check_awaited(self, response):
+        if asyncio.iscoroutine(response):
+            response.close()
+            raise TypeError('This method of {0} is not available on the '
+                            'asynchronous client'.format(type(self).__name__))
+
+    def _instance_or_null(self, instance_class, json):
+        instance_class = ASYNC_CLASSES.get(instance_class, instance_class)
+        return super(AsyncGitHubCore, self)._instance_or_null(instance_class,
+                                                              json)
+
+    def _iter(self, count, url, cls, params=None, etag=None, headers=None):
+        cls = ASYNC_CLASSES.get(cls, cls)
+        return GitHubIterator(count, url, cls, self, params, etag, headers)
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+github3.aio.repos
+=================
+
+This module contains the asynchronous Repository object.
+
+"""
+from ..issues import Issue
+from ..repos import repo
+from ..repos.contents import Contents
+from .models import ASYNC_CLASSES, AsyncGitHubCore, gather_bounded
+
+
+class Repository(AsyncGitHubCore, repo.Repository):
+
+    """An asynchronous :class:`Repository <github3.repos.repo.Repository>`.
+
+    The iterating methods, e.g., :meth:`issues`, :meth:`pull_requests` and
+    :meth:`commits`, return asynchronous iterators to be used with
+    ``async for``::
+
+        repository = await gh.repository('sigmavirus24', 'github3.py')
+        async for issue in repository.issues(state='open'):
+            print(issue.title)
+    """
+
+    def _repr(self):
+        return '<AsyncRepository [{0}]>'.format(self)
+
+    async def file_contents(self, path, ref=None):
+        """Get the contents of the file pointed to by ``path``.
+
+        :param str path: (required), path to file, e.g.
+            github3/repos/repo.py
+        :param str ref: (optional), the string name of a commit/branch/tag.
+            Default: master
+        :returns: the contents of the file requested
+        :rtype: :class:`~github3.repos.contents.Contents`
+        """
+        url = self._build_url('contents', path, base_url=self._api)
+        json = self._json(await self._get(url, params={'ref': ref}), 200)
+        return self._instance_or_null(Contents, json)
+
+    async def issue(self, number):
+        """Get the issue specified by ``number``.
+
+        :param int number: (required), number of the issue on this repository
+        :returns: :class:`Issue <github3.issues.issue.Issue>` if successful,
+            otherwise None
+        """
+        json = None
+        if int(number) > 0:
+            url = self._build_url('issues', str(number), base_url=self._api)
+            json = self._json(await self._get(url), 200)
+        return self._instance_or_null(Issue, json)
+
+    async def issues_by_number(self, numbers, workers=8):
+        """Retrieve many issues of this repository concurrently.
+
+        :param list numbers: (required), numbers of the issues
+        :param int workers: (optional), maximum number of concurrent
+            requests. Default: 8
+        :returns: list with, in the order requested, what :meth:`issue`
+            returned for each number or the exception it raised
+        """
+        return await gather_bounded(self.issue, numbers, workers)
+
+
+ASYNC_CLASSES[repo.Repository] = Repository
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+github3.aio.session
+===================
+
+This module contains the session used to talk to GitHub asynchronously.
+
+"""
+import asyncio
+import datetime
+
+import aiohttp
+import requests
+
+from requests.structures import CaseInsensitiveDict
+
+from ..session import GitHubSession
+
+
+def build_response(client_response, content):
+    """Convert an aiohttp response into a :class:`requests.Response`.
+
+    This lets the parsing and error handling of the synchronous models
+    (``_json``, ``_boolean``, :func:`github3.exceptions.error_for`, the
+    ``links`` used for pagination) be reused unchanged.
+    """
+    response = requests.Response()
+    response.status_code = client_response.status
+    response.reason = client_response.reason
+    response.headers = CaseInsensitiveDict(client_response.headers)
+    response.url = str(client_response.url)
+    response.encoding = client_response.charset or 'utf-8'
+    response._content = content
+    response._content_consumed = True
+    return response
+
+
+def prepare_request(method, url, params, headers, data):
+    """Describe a request as a :class:`requests.PreparedRequest` for the
+    :attr:`on_request <github3.session.GitHubSession.on_request>` callbacks.
+    """
+    request = requests.PreparedRequest()
+    request.prepare_method(method)
+    request.prepare_url(url, params)
+    request.prepare_headers(headers)
+    request.body = data
+    return request
+
+
+def query_value(value):
+    """Convert a query parameter value as requests would."""
+    if isinstance(value, (int, float, str)) and not isinstance(value, bool):
+        return value
+    return str(value)
+
+
+class AsyncGitHubSession(GitHubSession):
+
+    """A :class:`GitHubSession <github3.session.GitHubSession>` whose
+    requests are coroutines.
+
+    Headers, authentication and URL building are inherited so the session is
+    configured exactly like its synchronous counterpart. ``get``, ``post``,
+    ``patch``, ``put`` and ``delete`` return coroutines resolving to
+    :class:`requests.Response` objects.
+    """
+
+    def __init__(self, connector=None):
+        super(AsyncGitHubSession, self).__init__()
+        self.connector = connector
+        self._client = None
+
+    @property
+    def client(self):
+        """The underlying :class:`aiohttp.ClientSession`, created lazily so
+        that it is bound to the running event loop."""
+        if self._client is None or self._client.closed:
+            self._client = aiohttp.ClientSession(connector=self.connector)
+        return self._client
+
+    async def request(self, method, url, params=None, data=None,
+                      headers=None, allow_redirects=True, stream=False,
+                      **kwargs):
+        merged_headers = dict(self.headers)
+        merged_headers.update(headers or {})
+        merged_headers = dict((k, v) for (k, v) in merged_headers.items()
+                              if v is not None)
+
+        merged_params = dict(self.params)
+        merged_params.update(params or {})
+        merged_params = dict((k, query_value(v))
+                             for (k, v) in merged_params.items()
+                             if v is not None)
+
+        auth = None
+        if self.auth:
+            auth = aiohttp.BasicAuth(*self.auth)
+
+        prepared = prepare_request(method, url, merged_params, merged_headers,
+                                   data)
+        loop = asyncio.get_event_loop()
+        attempt = 0
+        while True:
+            await self.sleep(self.ratelimit.delay(url))
+            self.dispatch('on_request', prepared)
+            start = loop.time()
+            async with self.client.request(
+                    method, url, params=merged_params or None, data=data,
+                    headers=merged_headers, auth=auth,
+                    allow_redirects=allow_redirects,
+                    ssl=None if self.verify else False) as client_response:
+                elapsed = loop.time() - start
+                content = await client_response.read()
+
+            self.request_counter += 1
+            response = build_response(client_response, content)
+            response.request = prepared
+            response.elapsed = datetime.timedelta(seconds=elapsed)
+            self.dispatch('on_response', response)
+            self.ratelimit.update(response)
+
+            wait = self.ratelimit.retry_after(response, attempt)
+            if wait is None:
+                return response
+            attempt += 1
+            self.dispatch('on_retry', response, attempt, wait)
+            await self.sleep(wait)
+
+    async def sleep(self, seconds):
+        """Wait for ``seconds`` without blocking the event loop."""
+        if seconds > 0:
+            await asyncio.sleep(seconds)
+
+    async def close(self):
+        """Close the underlying connection pool."""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+github3.aio.structs
+===================
+
+This module contains the asynchronous iterators over paginated resources.
+
+"""
+from .. import structs
+
+
+class GitHubIterator(structs.GitHubIterator):
+
+    """An asynchronous :class:`GitHubIterator
+    <github3.structs.GitHubIterator>`.
+
+    Use it with ``async for``; each page is requested without blocking the
+    event loop and items are built with the same classes as the synchronous
+    iterator. The :attr:`page_store`, the checkpoints and ``stream`` work
+    as for the synchronous iterator, except that the pages are read
+    entirely before their items are decoded.
+    """
+
+    def _repr(self):
+        return '<AsyncGitHubIterator [{0}, {1}]>'.format(self.count,
+                                                         self.path)
+
+    def __iter__(self):
+        raise TypeError('Use "async for" to iterate over {0!r}'.format(self))
+
+    def __aiter__(self):
+        return self._aiter()
+
+    async def __anext__(self):
+        if not hasattr(self, '__ai__'):
+            self.__ai__ = self._aiter()
+        return await self.__ai__.__anext__()
+
+    async def _aiter(self):
+        params, headers, cls = self._start()
+
+        while (self.count == -1 or self.count > 0) and self.last_url:
+            (page_headers, key, entry) = self._revalidation(
+                self.last_url, params, headers)
+            response = await self._get(self.last_url, params=params,
+                                       headers=page_headers)
+            # The body has been read, so it can be stored even when the
+            # items are streamed
+            response = self._revalidated(response, key, entry)
+            params = None  # rel_next already has the params
+
+            if self.stream and response.status_code == 200:
+                self._record_response(response)
+                json = self._stream_page(response)
+            else:
+                json = self._handle_page(response)
+                if json is None:
+                    break
+
+            for item in self._iter_page(json, cls):
+                yield item
+
+            rel_next = response.links.get('next', {})
+            self._next_page(rel_next.get('url', ''))
+
+    def refresh(self, conditional=False):
+        self._reset(conditional)
+        self.__ai__ = self._aiter()
+        return self
+
+
+class SearchIterator(GitHubIterator, structs.SearchIterator):
+
+    """An asynchronous :class:`SearchIterator
+    <github3.structs.SearchIterator>`."""
+
+    def _repr(self):
+        return structs.SearchIterator._repr(self)
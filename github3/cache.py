@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""
+github3.cache
+=============
+
+This module provides the response caches that can be attached to a
+:class:`GitHubSession <github3.session.GitHubSession>` so that repeated
+``GET`` requests are revalidated with GitHub instead of re-downloaded, and
+the cache of the immutable objects addressed by a SHA.
+
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+
+from collections import OrderedDict
+
+
+def cache_key(method, url, headers):
+    """Compute the key under which a response to a request is stored.
+
+    The ``Accept`` header and the credentials are part of the key so that
+    different media types and different users never share an entry.
+
+    :param str method: HTTP method of the request
+    :param str url: fully prepared URL, including the query string
+    :param dict headers: headers that will be sent with the request
+    :returns: hex digest identifying the request
+    :rtype: str
+    """
+    parts = [method.upper(), url, headers.get('Accept') or '',
+             headers.get('Authorization') or '']
+    digest = hashlib.sha1()
+    for part in parts:
+        if not isinstance(part, bytes):
+            part = part.encode('utf-8')
+        digest.update(part + b'\n')
+    return digest.hexdigest()
+
+
+def object_key(url, params=None, accept=None):
+    """Compute the key under which an object addressed by a SHA is stored.
+
+    Unlike :func:`cache_key` the credentials are not part of the key, so
+    the object is shared by every session using the same
+    :class:`ObjectCache`.
+
+    :param str url: URL of the object, containing its SHA
+    :param dict params: (optional), query string parameters
+    :param str accept: (optional), ``Accept`` header of the request
+    :returns: hex digest identifying the object
+    :rtype: str
+    """
+    query = sorted((params or {}).items())
+    return cache_key('GET', url + '?' + json.dumps(query),
+                     {'Accept': accept})
+
+
+class BaseCache(object):
+
+    """The interface every response cache implements.
+
+    An entry is a dictionary with the keys ``etag``, ``last_modified``,
+    ``headers`` (a plain dictionary), ``encoding`` and ``content`` (bytes).
+    Sub-classes only need to provide :meth:`get`, :meth:`set`,
+    :meth:`delete` and :meth:`clear`.
+    """
+
+    def get(self, key):
+        """Return the entry stored under ``key`` or ``None``."""
+        raise NotImplementedError
+
+    def set(self, key, entry):
+        """Store ``entry`` under ``key``."""
+        raise NotImplementedError
+
+    def delete(self, key):
+        """Remove the entry stored under ``key`` if there is one."""
+        raise NotImplementedError
+
+    def clear(self):
+        """Remove every entry from the cache."""
+        raise NotImplementedError
+
+
+class MemoryCache(BaseCache):
+
+    """An in-memory, least-recently-used response cache.
+
+    :param int maxsize: (optional), number of responses to keep before the
+        least recently used one is evicted. Default: 1000
+    """
+
+    def __init__(self, maxsize=1000):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                # Re-insert to mark it as the most recently used
+                self._entries[key] = entry
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = entry
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteCache(BaseCache):
+
+    """A response cache persisted to a SQLite database on disk.
+
+    The database can be shared by several processes and survives restarts,
+    which makes it suitable for long-running pollers.
+
+    :param str path: path of the database file, it is created if necessary
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                'key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, '
+                'headers TEXT, encoding TEXT, content BLOB)'
+            )
+
+    def __len__(self):
+        with self._lock:
+            cursor = self._connection.execute(
+                'SELECT COUNT(*) FROM responses'
+            )
+            return cursor.fetchone()[0]
+
+    def get(self, key):
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT etag, last_modified, headers, encoding, content '
+                'FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, headers, encoding, content = row
+        return {
+            'etag': etag,
+            'last_modified': last_modified,
+            'headers': json.loads(headers),
+            'encoding': encoding,
+            'content': bytes(content),
+        }
+
+    def set(self, key, entry):
+        with self._lock, self._connection:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)',
+                (key, entry.get('etag'), entry.get('last_modified'),
+                 json.dumps(entry.get('headers', {})), entry.get('encoding'),
+                 sqlite3.Binary(entry.get('content', b'')))
+            )
+
+    def delete(self, key):
+        with self._lock, self._connection:
+            self._connection.execute(
+                'DELETE FROM responses WHERE key = ?', (key,)
+            )
+
+    def clear(self):
+        with self._lock, self._connection:
+            self._connection.execute('DELETE FROM responses')
+
+    def close(self):
+        """Close the underlying database connection."""
+        self._connection.close()
+
+
+class ObjectCache(object):
+
+    """Cache of the objects addressed by a SHA, which never change.
+
+    Blobs, trees, commits, tags and contents fetched at a commit SHA are
+    served from this cache without any request once they were retrieved.
+    The most recently used objects are kept in memory in front of an
+    optional persistent ``store``, e.g., a :class:`SQLiteCache`, which can
+    be shared by several processes.
+
+    The same cache can be used by several sessions. The objects are not
+    separated by user, so only share it between sessions which are allowed
+    to see the same repositories.
+
+    :param int maxsize: (optional), number of objects kept in memory.
+        Default: 1000
+    :param store: (optional), :class:`BaseCache` where every object is
+        persisted
+    """
+
+    def __init__(self, maxsize=1000, store=None):
+        #: :class:`MemoryCache` holding the recently used objects
+        self.memory = MemoryCache(maxsize)
+        #: Persistent :class:`BaseCache`, if any
+        self.store = store
+
+    def get(self, key):
+        """Return the encoded object stored under ``key`` or ``None``."""
+        entry = self.memory.get(key)
+        if entry is None and self.store is not None:
+            entry = self.store.get(key)
+            if entry is not None:
+                self.memory.set(key, entry)
+        if entry is None:
+            return None
+        return entry['content']
+
+    def set(self, key, content):
+        """Store the encoded object ``content`` (bytes) under ``key``."""
+        entry = {'content': content}
+        self.memory.set(key, entry)
+        if self.store is not None:
+            self.store.set(key, entry)
+
+    def clear(self):
+        """Remove every object from the cache and its store."""
+        self.memory.clear()
+        if self.store is not None:
+            self.store.clear()
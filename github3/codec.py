@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+github3.codec
+=============
+
+This module contains the codecs used to decode the JSON sent by GitHub and
+to encode the bodies of requests.
+
+"""
+import json
+import sys
+
+try:
+    import orjson
+except ImportError:  # (No coverage)
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # (No coverage)
+    ujson = None
+
+
+class JSONCodec(object):
+
+    """Encode and decode JSON with the standard library.
+
+    Subclasses wrap faster implementations. A codec decodes from the bytes
+    of a response body as well as from text and encodes to a ``str`` or to
+    ``bytes`` ready to be sent.
+    """
+
+    #: Name used to select the codec, see :func:`get_codec`
+    name = 'json'
+
+    def loads(self, data):
+        """Decode ``data``.
+
+        :param data: JSON document as ``bytes`` or text
+        """
+        if isinstance(data, bytes) and (3, 0) <= sys.version_info < (3, 6):
+            data = data.decode('utf-8')
+        return json.loads(data)
+
+    def dumps(self, obj):
+        """Encode ``obj`` for the body of a request."""
+        return json.dumps(obj)
+
+    def __repr__(self):
+        return '<JSONCodec [{0}]>'.format(self.name)
+
+    def __eq__(self, other):
+        return type(self) is type(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(type(self))
+
+
+class OrjsonCodec(JSONCodec):
+
+    """Encode and decode JSON with orjson_.
+
+    .. _orjson: https://github.com/ijl/orjson
+    """
+
+    name = 'orjson'
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+    def dumps(self, obj):
+        return orjson.dumps(obj)
+
+
+class UJSONCodec(JSONCodec):
+
+    """Encode and decode JSON with ujson_.
+
+    .. _ujson: https://github.com/ultrajson/ultrajson
+    """
+
+    name = 'ujson'
+
+    def loads(self, data):
+        return ujson.loads(data)
+
+    def dumps(self, obj):
+        return ujson.dumps(obj, escape_forward_slashes=False)
+
+
+#: Codecs in order of preference with the module they need
+CODECS = [
+    (OrjsonCodec, orjson),
+    (UJSONCodec, ujson),
+    (JSONCodec, json),
+]
+
+
+def available_codecs():
+    """Return the names of the codecs whose library is installed.
+
+    :returns: names in order of preference
+    :rtype: list
+    """
+    return [cls.name for (cls, module) in CODECS if module is not None]
+
+
+def get_codec(codec=None):
+    """Return the codec named ``codec``.
+
+    :param codec: (optional), name of a codec (``'orjson'``, ``'ujson'`` or
+        ``'json'``) or a codec instance which is returned unchanged. By
+        default the fastest installed codec is picked, falling back to the
+        standard library.
+    :returns: :class:`JSONCodec`
+    :raises ValueError: if the codec is unknown or its library is not
+        installed
+    """
+    if isinstance(codec, JSONCodec):
+        return codec
+    for (cls, module) in CODECS:
+        if module is None or (codec is not None and cls.name != codec):
+            continue
+        return cls()
+    raise ValueError('Unknown or unavailable JSON codec: {0!r}'.format(codec))
@@ -33,7 +33,9 @@ class Event(GitHubCore):
         from .users import User
         from .orgs import Organization
         #: :class:`User <github3.users.User>` object representing the actor.
-        self.actor = User(event.get('actor')) if event.get('actor') else None
+        self.actor = None
+        if event.get('actor'):
+            self.actor = User(event.get('actor'), self)
         #: datetime object representing when the event was created.
         self.created_at = self._strptime(event.get('created_at'))
         #: Unique id of the event
@@ -41,7 +43,7 @@ class Event(GitHubCore):
         #: List all possible types of Events
         self.org = None
         if event.get('org'):
-            self.org = Organization(event.get('org'))
+            self.org = Organization(event.get('org'), self)
         #: Event type http://developer.github.com/v3/activity/events/types/
         self.type = event.get('type')
         handler = _payload_handlers.get(self.type, identity)
@@ -19,6 +19,12 @@ class GistFile(GitHubObject):
 
     """
 
+    __slots__ = ('raw_url', 'filename', 'name', 'language', 'size',
+                 'content')
+    _fields = (('raw_url', 'raw_url'), ('filename', 'filename'),
+               ('language', 'language'), ('size', 'size'),
+               ('content', 'content'))
+
     def _update_attributes(self, attributes):
         #: The raw URL for the file at GitHub.
         self.raw_url = attributes.get('raw_url')
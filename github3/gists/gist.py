@@ -8,7 +8,6 @@ This module contains the Gist class alone for simplicity.
 """
 from __future__ import unicode_literals
 
-from json import dumps
 from ..models import GitHubCore
 from ..decorators import requires_auth
 from .comment import GistComment
@@ -145,7 +144,8 @@ class Gist(GitHubCore):
         if files:
             data['files'] = files
         if data:
-            json = self._json(self._patch(self._api, data=dumps(data)), 200)
+            json = self._json(
+                self._patch(self._api, data=self._dumps(data)), 200)
         if json:
             self._update_attributes(json)
             return True
@@ -9,11 +9,16 @@ See also: http://developer.github.com/v3/git/
 """
 from __future__ import unicode_literals
 
-from json import dumps
+import re
+
+from array import array
 from base64 import b64decode
+from binascii import hexlify, unhexlify
+from . import exceptions
 from .models import GitHubObject, GitHubCore, BaseCommit
 from .users import User
 from .decorators import requires_auth
+from .utils import map_concurrently
 
 
 class Blob(GitHubObject):
@@ -24,6 +29,10 @@ class Blob(GitHubObject):
 
     """
 
+    __slots__ = ('_api', 'content', 'encoding', '_decoded', 'size', 'sha')
+    _fields = (('url', '_api'), ('content', 'content'),
+               ('encoding', 'encoding'), ('size', 'size'), ('sha', 'sha'))
+
     def _update_attributes(self, blob):
         self._api = blob.get('url', '')
 
@@ -33,10 +42,7 @@ class Blob(GitHubObject):
         #: Encoding of the raw content.
         self.encoding = blob.get('encoding')
 
-        #: Decoded content of the blob.
-        self.decoded = self.content
-        if self.encoding == 'base64':
-            self.decoded = b64decode(self.content)
+        self._decoded = None
 
         #: Size of the blob in bytes
         self.size = blob.get('size')
@@ -46,6 +52,26 @@ class Blob(GitHubObject):
     def _repr(self):
         return '<Blob [{0:.10}]>'.format(self.sha)
 
+    @property
+    def decoded(self):
+        """Decoded content of the blob.
+
+        It is only decoded the first time it is read. Use
+        :meth:`Repository.stream_blob
+        <github3.repos.repo.Repository.stream_blob>` to avoid holding large
+        blobs in memory.
+        """
+        if self._decoded is None:
+            self._decoded = self.content
+            if self.encoding == 'base64':
+                self._decoded = b64decode(self.content)
+        return self._decoded
+
+    def _compact_json(self):
+        json = super(Blob, self)._compact_json()
+        json['content'] = self.content.decode()
+        return json
+
 
 class GitData(GitHubCore):
 
@@ -123,7 +149,7 @@ class Reference(GitHubCore):
         #: The reference path, e.g., refs/heads/sc/featureA
         self.ref = ref.get('ref')
         #: :class:`GitObject <GitObject>` the reference points to
-        self.object = GitObject(ref.get('object', {}))
+        self.object = GitObject(ref.get('object', {}), self)
 
     def _repr(self):
         return '<Reference [{0}]>'.format(self.ref)
@@ -147,7 +173,7 @@ class Reference(GitHubCore):
 
         """
         data = {'sha': sha, 'force': force}
-        json = self._json(self._patch(self._api, data=dumps(data)), 200)
+        json = self._json(self._patch(self._api, data=self._dumps(data)), 200)
         if json:
             self._update_attributes(json)
             return True
@@ -184,7 +210,7 @@ class Tag(GitData):
         #: dict containing the name and email of the person
         self.tagger = tag.get('tagger')
         #: :class:`GitObject <GitObject>` for the tag
-        self.object = GitObject(tag.get('object', {}))
+        self.object = GitObject(tag.get('object', {}), self)
 
     def _repr(self):
         return '<Tag [{0}]>'.format(self.tag)
@@ -196,25 +222,118 @@ class Tree(GitData):
 
     See also: http://developer.github.com/v3/git/trees/
 
+    With ``compact=True`` the entries are built as compact :class:`Hash
+    <Hash>` objects and their JSON is not kept, which makes large recursive
+    trees much smaller in memory.
+
+    GitHub limits the number of entries returned for a recursive tree,
+    :attr:`truncated` tells whether some were left out.
     """
 
+    def __init__(self, json, session=None, lazy=False, compact=False):
+        self._compact = compact
+        super(Tree, self).__init__(json, session, lazy)
+
     def _update_attributes(self, tree):
         super(Tree, self)._update_attributes(tree)
+        #: Whether GitHub left some entries out of :attr:`tree`
+        self.truncated = tree.get('truncated', False)
         #: list of :class:`Hash <Hash>` objects
-        self.tree = [Hash(t) for t in tree.get('tree', [])]
+        if self._compact:
+            self.tree = [Hash(t, compact=True) for t in tree.pop('tree', [])]
+        else:
+            self.tree = [Hash(t) for t in tree.get('tree', [])]
+
+    def as_dict(self):
+        json = super(Tree, self).as_dict()
+        if self._compact and json is not None:
+            json = dict(json, tree=[h.as_dict() for h in self.tree])
+        return json
 
     def _repr(self):
         return '<Tree [{0}]>'.format(self.sha)
 
-    def recurse(self):
+    def index(self):
+        """Build a :class:`TreeIndex <TreeIndex>` of the entries of this
+        tree, typically one returned by :meth:`recurse`.
+
+        :returns: :class:`TreeIndex <TreeIndex>`
+        """
+        return TreeIndex(self.tree, self._api)
+
+    def recurse(self, compact=False, complete=True, workers=8):
         """Recurse into the tree.
 
+        When GitHub truncates the listing, the missing entries are fetched
+        by walking the subtrees: each directory is requested recursively
+        and the ones which are themselves truncated are listed one level at
+        a time. Subtrees are requested in parallel and those sharing a SHA
+        are only requested once. The entries of a completed tree are sorted
+        by path.
+
+        :param bool compact: (optional), build compact entries, see
+            :class:`Tree <Tree>`. Default: False
+        :param bool complete: (optional), fetch the entries left out of a
+            truncated listing. Default: True
+        :param int workers: (optional), maximum number of concurrent
+            requests used to complete the tree. Default: 8
         :returns: :class:`Tree <Tree>`
         """
-        json = self._json(self._get(self._api, params={'recursive': '1'}),
-                          200)
+        json = self._json_by_sha(self._api.rsplit('/', 1)[-1], self._api,
+                                 params={'recursive': '1'})
+        if complete and isinstance(json, dict) and json.get('truncated'):
+            json = dict(json, truncated=False,
+                        tree=self._complete(json['sha'], workers))
+        if compact and isinstance(json, dict):
+            return Tree(json, self, compact=True)
         return self._instance_or_null(Tree, json)
 
+    def _tree_url(self, sha):
+        return self._api.rsplit('/trees/', 1)[0] + '/trees/' + sha
+
+    def _complete(self, sha, workers):
+        """Return every entry below the tree ``sha``."""
+        responses = {}
+
+        def fetch(job):
+            sha, recursive = job
+            params = {'recursive': '1'} if recursive else None
+            json = self._json_by_sha(sha, self._tree_url(sha), params=params)
+            if json is None:
+                raise exceptions.UnprocessableResponseBody(
+                    'Tree {0} could not be retrieved'.format(sha), json)
+            return json
+
+        entries = []
+        # (path prefix, sha, recursive) of the trees to request
+        jobs = [('', sha, False)]
+        while jobs:
+            missing = sorted(set((sha, recursive)
+                                 for (_, sha, recursive) in jobs) -
+                             set(responses))
+            results = map_concurrently(fetch, missing, workers)
+            for (job, result) in zip(missing, results):
+                if isinstance(result, Exception):
+                    raise result
+                responses[job] = result
+
+            next_jobs = []
+            for (prefix, sha, recursive) in jobs:
+                json = responses[(sha, recursive)]
+                if recursive and json.get('truncated'):
+                    # List this level only and walk its subtrees instead
+                    next_jobs.append((prefix, sha, False))
+                    continue
+                for entry in json.get('tree', []):
+                    entries.append(dict(entry, path=prefix + entry['path']))
+                    if not recursive and entry.get('type') == 'tree':
+                        next_jobs.append((prefix + entry['path'] + '/',
+                                          entry['sha'], True))
+            jobs = next_jobs
+
+        entries.sort(key=lambda entry: entry['path'])
+        return entries
+
 
 class Hash(GitHubObject):
 
@@ -224,6 +343,10 @@ class Hash(GitHubObject):
 
     """
 
+    __slots__ = ('path', 'mode', 'type', 'size', 'sha', 'url')
+    _fields = (('path', 'path'), ('mode', 'mode'), ('type', 'type'),
+               ('size', 'size'), ('sha', 'sha'), ('url', 'url'))
+
     def _update_attributes(self, info):
         #: Path to file
         self.path = info.get('path')
@@ -240,3 +363,237 @@ class Hash(GitHubObject):
 
     def _repr(self):
         return '<Hash [{0}]>'.format(self.sha)
+
+
+# array typecodes must be native strings on Python 2
+_INDEX, _SMALL = str('l'), str('B')
+
+
+def _glob_regex(pattern):
+    """Translate a glob ``pattern`` into a regular expression.
+
+    ``*`` and ``?`` do not match ``/`` while ``**`` matches any number of
+    directories.
+    """
+    parts, i = [], 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith('**/', i):
+            parts.append('(?:.*/)?')
+            i += 3
+            continue
+        if pattern.startswith('**', i):
+            parts.append('.*')
+            i += 2
+            continue
+        if char == '*':
+            parts.append('[^/]*')
+        elif char == '?':
+            parts.append('[^/]')
+        elif char == '[' and pattern.find(']', i + 1) > i + 1:
+            end = pattern.find(']', i + 1)
+            chars = pattern[i + 1:end]
+            if chars.startswith('!'):
+                chars = '^' + chars[1:]
+            parts.append('[' + chars.replace('\\', '\\\\') + ']')
+            i = end
+        else:
+            parts.append(re.escape(char))
+        i += 1
+    return re.compile('^' + ''.join(parts) + '$')
+
+
+class TreeIndex(object):
+
+    """A compact, sorted index of the entries of a recursive tree.
+
+    ::
+
+        tree = repository.tree('master').recurse()
+        index = tree.index()
+
+        index['src/github3/git.py'].sha
+        [entry.path for entry in index.listdir('src/github3')]
+        [entry.path for entry in index.glob('**/test_*.py')]
+
+    Every path segment is stored once (interned) with the position of its
+    parent directory, and the modes, types, sizes and SHAs are kept in
+    parallel arrays sorted by path. Looking a path up is a binary search,
+    listing a directory only visits its children and all the paths sharing a
+    prefix are contiguous. Entries are returned as compact :class:`Hash
+    <Hash>` objects built on demand.
+
+    Directories missing from the entries, e.g., those of a truncated tree,
+    are added with an unknown SHA.
+
+    :param entries: (required), :class:`Hash <Hash>` objects or dictionaries
+        with their ``path``, ``mode``, ``type``, ``size`` and ``sha``
+    :param str url: (optional), URL of the tree, used to rebuild the ``url``
+        of the entries
+    """
+
+    def __init__(self, entries, url=None):
+        rows = {}
+        for entry in entries:
+            if not isinstance(entry, dict):
+                entry = {'path': entry.path, 'mode': entry.mode,
+                         'type': entry.type, 'size': entry.size,
+                         'sha': entry.sha}
+            rows[entry['path']] = entry
+        for path in list(rows):
+            parent = path.rpartition('/')[0]
+            while parent and parent not in rows:
+                rows[parent] = {'path': parent, 'mode': '040000',
+                                'type': 'tree'}
+                parent = parent.rpartition('/')[0]
+
+        paths = sorted(rows)
+        position = dict((path, i) for (i, path) in enumerate(paths))
+        modes, types, interned = {}, {}, {}
+        self._names = []
+        self._parents = array(_INDEX)
+        self._modes = array(_SMALL)
+        self._types = array(_SMALL)
+        self._sizes = array(_INDEX)
+        self._shas = bytearray()
+        self._children = {}
+        for (i, path) in enumerate(paths):
+            entry = rows[path]
+            parent, _, name = path.rpartition('/')
+            parent = position[parent] if parent else -1
+            self._names.append(interned.setdefault(name, name))
+            self._parents.append(parent)
+            self._children.setdefault(parent, array(_INDEX)).append(i)
+            self._modes.append(modes.setdefault(entry.get('mode'),
+                                                len(modes)))
+            self._types.append(types.setdefault(entry.get('type'),
+                                                len(types)))
+            size = entry.get('size')
+            self._sizes.append(-1 if size is None else size)
+            sha = entry.get('sha')
+            self._shas.extend(unhexlify(sha) if sha else b'\0' * 20)
+        self._mode_table = sorted(modes, key=modes.get)
+        self._type_table = sorted(types, key=types.get)
+        #: URL of the objects of the repository, e.g.,
+        #: ``https://api.github.com/repos/o/r/git/``
+        self.base_url = None
+        if url and '/trees/' in url:
+            self.base_url = url.rsplit('/trees/', 1)[0] + '/'
+
+    def __len__(self):
+        return len(self._names)
+
+    def __iter__(self):
+        """Iterate over the paths in sorted order."""
+        for i in range(len(self)):
+            yield self.path(i)
+
+    def __contains__(self, path):
+        return self._find(path) is not None
+
+    def __getitem__(self, path):
+        i = self._find(path)
+        if i is None:
+            raise KeyError(path)
+        return self.entry(i)
+
+    def _repr(self):
+        return '<TreeIndex [{0} entries]>'.format(len(self))
+
+    def __repr__(self):
+        return self._repr()
+
+    def path(self, i):
+        """Return the path of the ``i``-th entry."""
+        names = []
+        while i >= 0:
+            names.append(self._names[i])
+            i = self._parents[i]
+        return '/'.join(reversed(names))
+
+    def entry(self, i):
+        """Return the ``i``-th entry as a compact :class:`Hash <Hash>`."""
+        sha = bytes(self._shas[i * 20:i * 20 + 20])
+        sha = hexlify(sha).decode('ascii') if sha.strip(b'\0') else None
+        kind = self._type_table[self._types[i]]
+        url = None
+        if self.base_url and sha and kind in ('blob', 'tree'):
+            url = '{0}{1}s/{2}'.format(self.base_url, kind, sha)
+        size = self._sizes[i]
+        return Hash({
+            'path': self.path(i),
+            'mode': self._mode_table[self._modes[i]],
+            'type': kind,
+            'size': None if size < 0 else size,
+            'sha': sha,
+            'url': url,
+        }, compact=True)
+
+    def _bisect(self, path):
+        """Return the position of the first entry not sorted before
+        ``path``."""
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            if self.path(middle) < path:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _find(self, path):
+        path = path.strip('/')
+        i = self._bisect(path)
+        if i < len(self) and self.path(i) == path:
+            return i
+        return None
+
+    def get(self, path, default=None):
+        """Return the entry at ``path`` or ``default``."""
+        i = self._find(path)
+        return default if i is None else self.entry(i)
+
+    def listdir(self, path=''):
+        """Return the entries directly inside the directory ``path``.
+
+        :param str path: (optional), directory, the root by default
+        :returns: list of :class:`Hash <Hash>`
+        :raises KeyError: if there is no such directory
+        """
+        parent = -1
+        if path.strip('/'):
+            parent = self._find(path)
+            if parent is None:
+                raise KeyError(path)
+        return [self.entry(i) for i in self._children.get(parent, ())]
+
+    def iter_prefix(self, prefix):
+        """Iterate over the entries whose path starts with ``prefix``.
+
+        Use a trailing slash, e.g., ``'docs/'``, to only get the contents of
+        a directory.
+
+        :returns: generator of :class:`Hash <Hash>`
+        """
+        for i in range(self._bisect(prefix), len(self)):
+            if not self.path(i).startswith(prefix):
+                break
+            yield self.entry(i)
+
+    def glob(self, pattern):
+        """Iterate over the entries whose path matches ``pattern``.
+
+        ``*`` and ``?`` match within a path segment, ``**`` matches any
+        number of directories and ``[...]`` a set of characters. Only the
+        entries sharing the literal prefix of the pattern are examined.
+
+        :returns: generator of :class:`Hash <Hash>`
+        """
+        regex = _glob_regex(pattern.strip('/'))
+        prefix = re.split(r'[*?\[]', pattern.strip('/'), 1)[0]
+        for i in range(self._bisect(prefix), len(self)):
+            path = self.path(i)
+            if not path.startswith(prefix):
+                break
+            if regex.match(path):
+                yield self.entry(i)
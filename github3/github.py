@@ -8,7 +8,6 @@ This module contains the main GitHub session object.
 """
 from __future__ import unicode_literals
 
-import json
 
 from .auths import Authorization
 from .decorators import (requires_auth, requires_basic_auth,
@@ -19,15 +18,25 @@ from .issues import Issue, issue_params
 from .models import GitHubCore
 from .orgs import Membership, Organization, Team
 from .pulls import PullRequest
+from .session import GitHubSession
 from .repos.repo import Repository, repo_issue_params
 from .search import (CodeSearchResult, IssueSearchResult,
                      RepositorySearchResult, UserSearchResult)
+from .search.sharding import ShardedSearch
 from .structs import SearchIterator
 from .users import User, Key
 from .notifications import Thread
+from .utils import map_concurrently
 from uritemplate import URITemplate
 
 
+def _pool_options(pool_maxsize, max_retries, backoff_factor):
+    """Return the pooling options given to a constructor."""
+    options = {'pool_maxsize': pool_maxsize, 'max_retries': max_retries,
+               'backoff_factor': backoff_factor}
+    return dict((k, v) for (k, v) in options.items() if v is not None)
+
+
 class GitHub(GitHubCore):
 
     """Stores all the session information.
@@ -52,10 +61,40 @@ class GitHub(GitHubCore):
 
     This is simple backward compatibility since originally there was no way to
     call the GitHub object with authentication parameters.
+
+    Applications sharing one instance between threads should size the
+    connection pool accordingly and can retry idempotent requests that fail
+    with a server error
+
+    ::
+
+        g = GitHub(token=token, pool_maxsize=32, max_retries=3,
+                   backoff_factor=0.5)
+
+    Hosts can be given their own pool and retry policy, e.g., to keep large
+    uploads from starving the API calls
+
+    ::
+
+        g = GitHub(token=token, pool_maxsize=32,
+                   hosts={'https://uploads.github.com': {'pool_maxsize': 4}})
+
+    See :func:`github3.session.build_adapter` for the meaning of these
+    options and :meth:`GitHubSession.mount_host
+    <github3.session.GitHubSession.mount_host>`. They configure the session
+    created by the constructor and cannot be combined with ``session``.
     """
 
-    def __init__(self, username='', password='', token=''):
-        super(GitHub, self).__init__({})
+    def __init__(self, username='', password='', token='', session=None,
+                 pool_maxsize=None, max_retries=None, backoff_factor=None,
+                 hosts=None):
+        options = _pool_options(pool_maxsize, max_retries, backoff_factor)
+        if session is None:
+            session = GitHubSession(hosts=hosts, **options)
+        elif options or hosts:
+            raise ValueError('The connection options configure a new session'
+                             ' and cannot be used with an existing one')
+        super(GitHub, self).__init__({}, session)
         if token:
             self.login(username, token=token)
         elif username and password:
@@ -66,6 +105,10 @@ class GitHub(GitHubCore):
             return '<GitHub [{0[0]}]>'.format(self.session.auth)
         return '<GitHub at 0x{0:x}>'.format(id(self))
 
+    def _search_iter(self, count, url, cls, params=None, etag=None,
+                     headers=None):
+        return SearchIterator(count, url, cls, self, params, etag, headers)
+
     def all_events(self, number=-1, etag=None):
         """Iterate over public events.
 
@@ -1011,6 +1054,28 @@ class GitHub(GitHubCore):
 
         return self._iter(int(number), url, Repository, params, etag)
 
+    def repositories_bulk(self, repositories, workers=8):
+        """Retrieve many repositories concurrently.
+
+        The requests share this object's session, and therefore its
+        connection pool and rate limit scheduler.
+
+        :param list repositories: (required), the repositories to retrieve,
+            either as ``'owner/name'`` strings or ``(owner, name)`` tuples
+        :param int workers: (optional), maximum number of concurrent
+            requests. Default: 8
+        :returns: list with, in the order requested, what :meth:`repository`
+            returned for each repository or the exception it raised
+        """
+        def fetch(repository):
+            if isinstance(repository, (tuple, list)):
+                owner, name = repository
+            else:
+                owner, _, name = repository.partition('/')
+            return self.repository(owner, name)
+
+        return map_concurrently(fetch, repositories, workers)
+
     def repositories_by(self, username, type=None, sort=None, direction=None,
                         number=-1, etag=None):
         """List public repositories for the specified ``username``.
@@ -1162,8 +1227,8 @@ class GitHub(GitHubCore):
                 }
 
         url = self._build_url('search', 'code')
-        return SearchIterator(number, url, CodeSearchResult, self, params,
-                              etag, headers)
+        return self._search_iter(number, url, CodeSearchResult, params,
+                                 etag, headers)
 
     def search_issues(self, query, sort=None, order=None, per_page=None,
                       text_match=False, number=-1, etag=None):
@@ -1227,8 +1292,8 @@ class GitHub(GitHubCore):
                 }
 
         url = self._build_url('search', 'issues')
-        return SearchIterator(number, url, IssueSearchResult, self, params,
-                              etag, headers)
+        return self._search_iter(number, url, IssueSearchResult, params,
+                                 etag, headers)
 
     def search_repositories(self, query, sort=None, order=None,
                             per_page=None, text_match=False, number=-1,
@@ -1287,8 +1352,47 @@ class GitHub(GitHubCore):
                 }
 
         url = self._build_url('search', 'repositories')
-        return SearchIterator(number, url, RepositorySearchResult, self,
-                              params, etag, headers)
+        return self._search_iter(number, url, RepositorySearchResult,
+                                 params, etag, headers)
+
+    def search_sharded(self, kind, query, qualifier=None, start=None,
+                       end=None, workers=4, text_match=False):
+        """Find every result of a search, beyond the 1,000 GitHub returns.
+
+        The query is split into shards restricted to ranges of
+        ``qualifier``, which are bisected using their ``total_count`` until
+        each has at most 1,000 results. The shards are then searched
+        concurrently and their results merged, without duplicates, in no
+        particular order. Once the search rate limit is exhausted, the
+        requests wait until it is reset. ::
+
+            results = g.search_sharded('repositories', 'language:python',
+                                       'created', start=date(2015, 1, 1))
+
+        :param str kind: (required), ``'code'``, ``'issues'``,
+            ``'repositories'`` or ``'users'``
+        :param str query: (required), query as for the other search
+            methods, which must not restrict ``qualifier`` itself
+        :param str qualifier: (optional), ``'created'``, ``'pushed'``,
+            ``'updated'`` or ``'size'``, depending on what ``kind`` supports.
+            Default: ``'size'`` for code and ``'created'`` otherwise
+        :param start: (optional), lower bound of the range of ``qualifier``,
+            a date or a datetime in UTC for dates and an integer for sizes.
+            Default: October 2007 or 0
+        :param end: (optional), upper bound of the range of ``qualifier``.
+            Default: now or :data:`MAX_SIZE
+            <github3.search.sharding.MAX_SIZE>`
+        :param int workers: (optional), maximum number of concurrent
+            requests. Default: 4
+        :param bool text_match: (optional), if True, return matching search
+            terms
+        :returns: :class:`ShardedSearch
+            <github3.search.sharding.ShardedSearch>`, an iterable of the
+            search result objects of ``kind``
+        :raises ValueError: if ``qualifier`` cannot be used with ``kind``
+        """
+        return ShardedSearch(self, kind, query, qualifier, start, end,
+                             workers, text_match)
 
     def search_users(self, query, sort=None, order=None, per_page=None,
                      text_match=False, number=-1, etag=None):
@@ -1346,8 +1450,8 @@ class GitHub(GitHubCore):
                 }
 
         url = self._build_url('search', 'users')
-        return SearchIterator(number, url, UserSearchResult, self, params,
-                              etag, headers)
+        return self._search_iter(number, url, UserSearchResult, params,
+                                 etag, headers)
 
     def set_client_id(self, id, secret):
         """Allows the developer to set their client_id and client_secret for
@@ -1506,7 +1610,7 @@ class GitHub(GitHubCore):
                 'hireable': hireable, 'bio': bio}
         self._remove_none(user)
         url = self._build_url('user')
-        _json = self._json(self._patch(url, data=json.dumps(user)), 200)
+        _json = self._json(self._patch(url, data=self._dumps(user)), 200)
         if _json:
             self._update_attributes(_json)
             return True
@@ -1591,6 +1695,20 @@ class GitHub(GitHubCore):
             json = self._json(self._get(url), 200)
         return self._instance_or_null(User, json)
 
+    def users_bulk(self, usernames, workers=8):
+        """Retrieve many users concurrently.
+
+        The requests share this object's session, and therefore its
+        connection pool and rate limit scheduler.
+
+        :param list usernames: (required), login names of the users
+        :param int workers: (optional), maximum number of concurrent
+            requests. Default: 8
+        :returns: list with, in the order requested, what :meth:`user`
+            returned for each login name or the exception it raised
+        """
+        return map_concurrently(self.user, usernames, workers)
+
     def zen(self):
         """Returns a quote from the Zen of GitHub. Yet another API Easter Egg
 
@@ -1612,10 +1730,25 @@ class GitHubEnterprise(GitHub):
 
     If you have a self signed SSL for your local github enterprise you can
     override the validation by passing `verify=False`.
+
+    Unless a ``session`` is given, the requests sent to your instance go
+    through their own connection pool, configured with the ``pool_maxsize``,
+    ``max_retries`` and ``backoff_factor`` options of :class:`GitHub
+    <GitHub>` or with the options of the instance in ``hosts``.
     """
-    def __init__(self, url, username='', password='', token='', verify=True):
-        super(GitHubEnterprise, self).__init__(username, password, token)
-        self.session.base_url = url.rstrip('/') + '/api/v3'
+    def __init__(self, url, username='', password='', token='', verify=True,
+                 session=None, pool_maxsize=None, max_retries=None,
+                 backoff_factor=None, hosts=None):
+        host = url.rstrip('/')
+        if session is None and not any(
+                prefix.rstrip('/') == host for prefix in hosts or {}):
+            hosts = dict(hosts or {}, **{host + '/': _pool_options(
+                pool_maxsize, max_retries, backoff_factor)})
+        super(GitHubEnterprise, self).__init__(username, password, token,
+                                               session, pool_maxsize,
+                                               max_retries, backoff_factor,
+                                               hosts)
+        self.session.base_url = host + '/api/v3'
         self.session.verify = verify
         self.url = url
 
@@ -1654,7 +1787,9 @@ class GitHubStatus(GitHubCore):
     def _recipe(self, *args):
         url = self._build_url(*args)
         resp = self._get(url)
-        return resp.json() if self._boolean(resp, 200, 404) else {}
+        if self._boolean(resp, 200, 404):
+            return self.session.codec.loads(resp.content)
+        return {}
 
     def api(self):
         """GET /api.json"""
@@ -2,7 +2,6 @@
 from __future__ import unicode_literals
 
 from re import match
-from json import dumps
 from ..decorators import requires_auth
 from .comment import IssueComment, issue_comment_params
 from .event import IssueEvent
@@ -214,7 +213,8 @@ class Issue(GitHubCore):
         if data:
             if 'milestone' in data and data['milestone'] == 0:
                 data['milestone'] = None
-            json = self._json(self._patch(self._api, data=dumps(data)), 200)
+            json = self._json(
+                self._patch(self._api, data=self._dumps(data)), 200)
         if json:
             self._update_attributes(json)
             return True
@@ -294,7 +294,7 @@ class Issue(GitHubCore):
         :returns: bool
         """
         url = self._build_url('labels', base_url=self._api)
-        json = self._json(self._put(url, data=dumps(labels)), 200)
+        json = self._json(self._put(url, data=self._dumps(labels)), 200)
         return [Label(l, self) for l in json] if json else []
 
     @requires_auth
@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals
 
-from json import dumps
 from ..decorators import requires_auth
 from ..models import GitHubCore
 
@@ -12,6 +11,9 @@ class Label(GitHubCore):
 
     See also: http://developer.github.com/v3/issues/labels/
     """
+    __slots__ = ('url', '_uri', 'color', 'name')
+    _fields = (('url', 'url'), ('color', 'color'), ('name', 'name'))
+
     def _update_attributes(self, label):
         self._api = label.get('url', '')
         #: Color of the label, e.g., 626262
@@ -48,7 +50,7 @@ class Label(GitHubCore):
         if name and color:
             if color[0] == '#':
                 color = color[1:]
-            json = self._json(self._patch(self._api, data=dumps({
+            json = self._json(self._patch(self._api, data=self._dumps({
                 'name': name, 'color': color})), 200)
 
         if json:
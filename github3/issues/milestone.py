@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals
 
-from json import dumps
 from ..decorators import requires_auth
 from .label import Label
 from ..models import GitHubCore
@@ -90,7 +89,8 @@ class Milestone(GitHubCore):
         json = None
 
         if data:
-            json = self._json(self._patch(self._api, data=dumps(data)), 200)
+            json = self._json(
+                self._patch(self._api, data=self._dumps(data)), 200)
         if json:
             self._update_attributes(json)
             return True
@@ -0,0 +1,322 @@
+# -*- coding: utf-8 -*-
+"""
+github3.metrics
+===============
+
+This module contains a collector which aggregates the requests sent by a
+session per endpoint so the calls dominating the API budget or the latency
+of an application can be found.
+
+"""
+import re
+import threading
+
+from requests.compat import basestring, urlparse
+from requests.utils import super_len
+
+from .ratelimit import _int_header, resource_for
+
+#: Upper bounds, in seconds, of the latency histogram buckets
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Segments followed by parameters in the paths of the API
+_parameters = {
+    'repos': ('{owner}', '{repo}'),
+    'users': ('{user}',),
+    'orgs': ('{org}',),
+    'branches': ('{branch}',),
+    'collaborators': ('{user}',),
+    'commits': ('{sha}',),
+    'compare': ('{basehead}',),
+    'following': ('{user}',),
+    'labels': ('{name}',),
+    'members': ('{user}',),
+    'memberships': ('{user}',),
+    'public_members': ('{user}',),
+    'tags': ('{tag}',),
+    'tarball': ('{ref}',),
+    'zipball': ('{ref}',),
+}
+# Segments followed by a parameter which may contain slashes
+_trailing = {
+    'contents': '{path}',
+    'refs': '{ref}',
+}
+_sha = re.compile('^[0-9a-f]{40}$')
+
+
+def endpoint_template(url):
+    """Return the path of ``url`` with its parameters replaced by names.
+
+    For example, ``https://api.github.com/repos/sigmavirus24/github3.py/
+    issues/42`` becomes ``/repos/{owner}/{repo}/issues/{id}``. Numeric
+    segments become ``{id}``, commit SHAs ``{sha}`` and the names following
+    known segments (``repos``, ``users``, ``branches``, ...) are replaced
+    according to GitHub's documentation.
+
+    :param str url: URL of a request
+    :returns: the template of the endpoint
+    :rtype: str
+    """
+    path = urlparse(url).path
+    if path.startswith('/api/v3/'):
+        # GitHub Enterprise
+        path = path[len('/api/v3'):]
+
+    segments = [s for s in path.split('/') if s]
+    template = []
+    i = 0
+    while i < len(segments):
+        segment = segments[i]
+        template.append(segment)
+        i += 1
+        if segment in _trailing and i < len(segments):
+            template.append(_trailing[segment])
+            break
+        for name in _parameters.get(segment, ()):
+            if i < len(segments):
+                template.append(name)
+                i += 1
+        if template[-1] != segment:
+            continue
+        # Replace the identifiers not introduced by a known segment
+        if segment.isdigit():
+            template[-1] = '{id}'
+        elif _sha.match(segment):
+            template[-1] = '{sha}'
+    return '/' + '/'.join(template)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace(
+        '\n', '\\n')
+
+
+def _labels(le=None, **labels):
+    pairs = sorted(labels.items())
+    if le is not None:
+        # The bucket bound comes last, as in Prometheus' own clients
+        pairs.append(('le', le))
+    return '{' + ','.join('{0}="{1}"'.format(k, _escape(v))
+                          for (k, v) in pairs) + '}'
+
+
+def _body_size(body):
+    if body is None:
+        return 0
+    if isinstance(body, (bytes, bytearray, memoryview)):
+        return len(body)
+    if isinstance(body, basestring):
+        return len(body.encode('utf-8'))
+    if hasattr(body, '__len__'):
+        # e.g., the streamed bodies of uploads
+        return len(body)
+    try:
+        # Files report what is left to read, generators nothing
+        return super_len(body) or 0
+    except Exception:
+        return 0
+
+
+def _content_size(response):
+    # Streamed responses have not been read yet
+    if isinstance(response._content, bytes):
+        return len(response._content)
+    return _int_header(response.headers, 'Content-Length') or 0
+
+
+class MetricsCollector(object):
+
+    """Aggregate the requests sent through a session.
+
+    The collector is registered with :meth:`GitHubSession.instrument
+    <github3.session.GitHubSession.instrument>`::
+
+        from github3.metrics import MetricsCollector
+
+        metrics = MetricsCollector()
+        g.session.instrument(metrics)
+        # ...
+        print(metrics.prometheus())
+
+    For every endpoint template (see :func:`endpoint_template`) and method
+    it records the number of responses by status code, a histogram of their
+    latency, the bytes sent and received, the responses served from the
+    :mod:`cache <github3.cache>` and the requests retried because of the
+    rate limit. The last ``X-RateLimit-Remaining`` seen for each resource is
+    kept as well.
+
+    :param buckets: (optional), upper bounds in seconds of the latency
+        histogram buckets. Default: :data:`DEFAULT_BUCKETS`
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self.reset()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def reset(self):
+        """Forget everything recorded so far."""
+        #: Mapping of ``(method, endpoint template)`` to the statistics of
+        #: the endpoint
+        self.endpoints = {}
+        #: Mapping of rate limit resources to the last remaining budget seen
+        self.ratelimit_remaining = {}
+
+    def _endpoint(self, method, url):
+        key = (method, endpoint_template(url))
+        stats = self.endpoints.get(key)
+        if stats is None:
+            stats = self.endpoints[key] = {
+                'statuses': {},
+                'latency_buckets': [0] * (len(self.buckets) + 1),
+                'latency_sum': 0.0,
+                'bytes_sent': 0,
+                'bytes_received': 0,
+                'cache_hits': 0,
+                'retries': 0,
+            }
+        return stats
+
+    def on_response(self, response):
+        """Record ``response``."""
+        request = response.request
+        method = getattr(request, 'method', None) or 'GET'
+        url = response.url or getattr(request, 'url', '')
+        elapsed = response.elapsed.total_seconds()
+        bucket = len(self.buckets)
+        for (i, bound) in enumerate(self.buckets):
+            if elapsed <= bound:
+                bucket = i
+                break
+        remaining = _int_header(response.headers, 'X-RateLimit-Remaining')
+
+        with self._lock:
+            stats = self._endpoint(method, url)
+            statuses = stats['statuses']
+            statuses[response.status_code] = statuses.get(
+                response.status_code, 0) + 1
+            stats['latency_buckets'][bucket] += 1
+            stats['latency_sum'] += elapsed
+            stats['bytes_sent'] += _body_size(getattr(request, 'body', None))
+            stats['bytes_received'] += _content_size(response)
+            if getattr(response, 'from_cache', False):
+                stats['cache_hits'] += 1
+            if remaining is not None:
+                resource = (response.headers.get('X-RateLimit-Resource') or
+                            resource_for(url))
+                self.ratelimit_remaining[resource] = remaining
+
+    def on_retry(self, response, attempt, wait):
+        """Record that the request of ``response`` is sent again."""
+        request = response.request
+        method = getattr(request, 'method', None) or 'GET'
+        url = response.url or getattr(request, 'url', '')
+        with self._lock:
+            self._endpoint(method, url)['retries'] += 1
+
+    def as_dict(self):
+        """Return the recorded metrics.
+
+        Endpoints are keyed by their method and template, e.g.,
+        ``'GET /repos/{owner}/{repo}'``. The latency histogram is cumulative
+        as in Prometheus: ``latency['buckets'][0.5]`` is the number of
+        responses received in at most half a second.
+
+        :rtype: dict
+        """
+        endpoints = {}
+        with self._lock:
+            for ((method, template), stats) in self.endpoints.items():
+                count, buckets = 0, {}
+                for (bound, n) in zip(self.buckets + ('+Inf',),
+                                      stats['latency_buckets']):
+                    count += n
+                    buckets[bound] = count
+                endpoints['{0} {1}'.format(method, template)] = {
+                    'requests': count,
+                    'statuses': dict(stats['statuses']),
+                    'latency': {
+                        'buckets': buckets,
+                        'count': count,
+                        'sum': stats['latency_sum'],
+                    },
+                    'bytes_sent': stats['bytes_sent'],
+                    'bytes_received': stats['bytes_received'],
+                    'cache_hits': stats['cache_hits'],
+                    'retries': stats['retries'],
+                }
+            remaining = dict(self.ratelimit_remaining)
+        return {'endpoints': endpoints, 'ratelimit_remaining': remaining}
+
+    def prometheus(self, prefix='github3'):
+        """Return the recorded metrics in the Prometheus text format.
+
+        :param str prefix: (optional), prefix of the metric names.
+            Default: ``'github3'``
+        :rtype: str
+        """
+        lines = []
+
+        def header(name, kind, help_text):
+            lines.append('# HELP {0}_{1} {2}'.format(prefix, name, help_text))
+            lines.append('# TYPE {0}_{1} {2}'.format(prefix, name, kind))
+
+        def sample(name, labels, value):
+            lines.append('{0}_{1}{2} {3}'.format(prefix, name, labels, value))
+
+        with self._lock:
+            endpoints = sorted(self.endpoints.items())
+            remaining = sorted(self.ratelimit_remaining.items())
+
+            header('requests_total', 'counter',
+                   'Responses received from the GitHub API.')
+            for ((method, template), stats) in endpoints:
+                for (status, n) in sorted(stats['statuses'].items()):
+                    sample('requests_total', _labels(
+                        method=method, endpoint=template, status=status), n)
+
+            header('request_duration_seconds', 'histogram',
+                   'Time until the response headers were received.')
+            for ((method, template), stats) in endpoints:
+                count = 0
+                for (bound, n) in zip(self.buckets + ('+Inf',),
+                                      stats['latency_buckets']):
+                    count += n
+                    sample('request_duration_seconds_bucket', _labels(
+                        method=method, endpoint=template, le=bound), count)
+                labels = _labels(method=method, endpoint=template)
+                sample('request_duration_seconds_sum', labels,
+                       stats['latency_sum'])
+                sample('request_duration_seconds_count', labels, count)
+
+            for (name, key, help_text) in (
+                    ('request_bytes_total', 'bytes_sent',
+                     'Bytes of request bodies sent.'),
+                    ('response_bytes_total', 'bytes_received',
+                     'Bytes of response bodies received.'),
+                    ('cache_hits_total', 'cache_hits',
+                     'Responses served from the cache.'),
+                    ('retries_total', 'retries',
+                     'Requests retried because of the rate limit.')):
+                header(name, 'counter', help_text)
+                for ((method, template), stats) in endpoints:
+                    sample(name, _labels(method=method, endpoint=template),
+                           stats[key])
+
+            header('ratelimit_remaining', 'gauge',
+                   'Requests left before the rate limit is reached.')
+            for (resource, value) in remaining:
+                sample('ratelimit_remaining', _labels(resource=resource),
+                       value)
+
+        return '\n'.join(lines) + '\n'
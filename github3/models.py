@@ -8,32 +8,93 @@ This module provides the basic models used in github3.py
 """
 from __future__ import unicode_literals
 
+import re
+
 from json import dumps, loads
 from requests.compat import urlparse, is_py2
-from datetime import datetime
 from logging import getLogger
 
 from . import exceptions
+from .cache import object_key
 from .decorators import requires_auth
 from .null import NullObject
 from .session import GitHubSession
-from .utils import UTC
+from .utils import CHUNK_SIZE, parse_timestamp, stream_response_to_file
 
 __timeformat__ = '%Y-%m-%dT%H:%M:%SZ'
 __logs__ = getLogger(__package__)
+_full_sha = re.compile('^[0-9a-fA-F]{40}$')
+
+
+def _iter_content(response, chunk_size):
+    try:
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            yield chunk
+    finally:
+        response.close()
 
 
 class GitHubObject(object):
     """The :class:`GitHubObject <GitHubObject>` object. A basic class to be
     subclassed by GitHubCore and other classes that would otherwise subclass
-    object."""
-    def __init__(self, json):
+    object.
+
+    When ``lazy`` is True, the attributes are only decoded from the JSON the
+    first time one of them is read. This makes building objects that are
+    never inspected, or only serialized with :meth:`as_dict`, much cheaper.
+
+    Small objects created in large numbers (e.g., the entries of a
+    :class:`Tree <github3.git.Tree>`) store their attributes in
+    ``__slots__`` and list them in ``_fields``. Those can also be built with
+    ``compact=True`` to drop the JSON they were built from, in which case
+    :meth:`as_dict` rebuilds it from their attributes.
+    """
+    # Subclasses without __slots__ get a __dict__ as usual
+    __slots__ = ('etag', 'last_modified', '_json_data', '_lazy', '_uniq',
+                 '__weakref__')
+
+    #: Pairs of JSON keys and attribute names from which :meth:`as_dict`
+    #: rebuilds the JSON of compact objects
+    _fields = ()
+
+    def __init__(self, json, lazy=False, compact=False):
         super(GitHubObject, self).__init__()
+        if compact and not self._fields:
+            raise TypeError('{0} objects cannot be compact'.format(
+                type(self).__name__))
+        self._lazy = False
         if json is not None:
             self.etag = json.pop('ETag', None)
             self.last_modified = json.pop('Last-Modified', None)
-            self._uniq = json.get('url', None)
         self._json_data = json
+        if lazy and not compact:
+            self._lazy = True
+        else:
+            self._materialize()
+        if compact:
+            self._json_data = None
+
+    def __getattr__(self, attribute):
+        # Only called when the attribute does not exist (yet)
+        if (attribute != '_lazy' and not attribute.startswith('__') and
+                getattr(self, '_lazy', False)):
+            self._materialize()
+            return getattr(self, attribute)
+        raise AttributeError("'{0}' object has no attribute '{1}'".format(
+            type(self).__name__, attribute))
+
+    def __reduce_ex__(self, protocol):
+        # pickle and copy read every slot, so decode the attributes before
+        # the state is collected rather than half-way through it
+        if self._lazy:
+            self._materialize()
+        return super(GitHubObject, self).__reduce_ex__(protocol)
+
+    def _materialize(self):
+        self._lazy = False
+        json = self._json_data
+        if json is not None:
+            self._uniq = json.get('url', None)
         self._update_attributes(json)
 
     def _update_attributes(self, json):
@@ -49,8 +110,14 @@ class GitHubObject(object):
         :returns: this object's attributes serialized to a dictionary
         :rtype: dict
         """
+        if self._json_data is None and self._fields:
+            return self._compact_json()
         return self._json_data
 
+    def _compact_json(self):
+        return dict((key, getattr(self, attribute))
+                    for (key, attribute) in self._fields)
+
     def as_json(self):
         """Return the json data for this object.
 
@@ -61,7 +128,7 @@ class GitHubObject(object):
         :returns: this object's attributes as a JSON string
         :rtype: str
         """
-        return dumps(self._json_data)
+        return dumps(self.as_dict())
 
     def _strptime(self, time_str):
         """Convert an ISO 8601 formatted string to a datetime object.
@@ -73,11 +140,7 @@ class GitHubObject(object):
         :returns: timezone-aware datetime object
         :rtype: datetime or None
         """
-        if time_str:
-            # Parse UTC string into naive datetime, then add timezone
-            dt = datetime.strptime(time_str, __timeformat__)
-            return dt.replace(tzinfo=UTC())
-        return None
+        return parse_timestamp(time_str)
 
     def _repr(self):
         return '<github3-object at 0x{0:x}>'.format(id(self))
@@ -89,14 +152,14 @@ class GitHubObject(object):
         return repr_string
 
     @classmethod
-    def from_dict(cls, json_dict):
+    def from_dict(cls, json_dict, lazy=False):
         """Return an instance of this class formed from ``json_dict``."""
-        return cls(json_dict)
+        return cls(json_dict, lazy=lazy)
 
     @classmethod
-    def from_json(cls, json):
+    def from_json(cls, json, lazy=False):
         """Return an instance of this class formed from ``json``."""
-        return cls(loads(json))
+        return cls(loads(json), lazy=lazy)
 
     def __eq__(self, other):
         return self._uniq == other._uniq
@@ -117,21 +180,37 @@ class GitHubCore(GitHubObject):
     have.
     """
 
-    def __init__(self, json, session=None):
-        if hasattr(session, 'session'):
-            # i.e. session is actually a GitHubCore instance
+    __slots__ = ('_session', '_github_url', '_remaining')
+
+    def __init__(self, json, session=None, lazy=False, compact=False):
+        if isinstance(session, GitHubCore):
+            # Share the parent's session without forcing its creation
+            session = session._session
+        elif hasattr(session, 'session'):
             session = session.session
-        elif session is None:
-            session = GitHubSession()
-        self.session = session
+        # Objects built without a session (e.g., nested in the JSON of
+        # another object) rarely make requests, so only create one on use
+        self._session = session
 
         # set a sane default
         self._github_url = 'https://api.github.com'
-        super(GitHubCore, self).__init__(json)
+        super(GitHubCore, self).__init__(json, lazy, compact)
 
     def _repr(self):
         return '<github3-core at 0x{0:x}>'.format(id(self))
 
+    @property
+    def session(self):
+        """The :class:`GitHubSession <github3.session.GitHubSession>` used
+        to make requests, created on first access if none was given."""
+        if self._session is None:
+            self._session = GitHubSession()
+        return self._session
+
+    @session.setter
+    def session(self, session):
+        self._session = session
+
     @staticmethod
     def _remove_none(data):
         if not data:
@@ -158,7 +237,7 @@ class GitHubCore(GitHubObject):
             __logs__.info('Attempting to get JSON information from a Response '
                           'with status code %d expecting %d',
                           response.status_code, status_code)
-            ret = response.json()
+            ret = self.session.codec.loads(response.content)
             headers = response.headers
             if ((headers.get('Last-Modified') or headers.get('ETag')) and
                     isinstance(ret, dict)):
@@ -169,6 +248,55 @@ class GitHubCore(GitHubObject):
         __logs__.info('JSON was %sreturned', 'not ' if ret is None else '')
         return ret
 
+    def _json_by_sha(self, sha, url, **kwargs):
+        """Return the JSON of the object addressed by ``sha`` at ``url``.
+
+        Objects addressed by a full SHA never change, so they are served
+        from the :attr:`object_cache <github3.session.GitHubSession.
+        object_cache>` of the session when it has one.
+        """
+        cache = getattr(self.session, 'object_cache', None)
+        if cache is None or not _full_sha.match(sha or ''):
+            return self._json(self._get(url, **kwargs), 200)
+
+        headers = kwargs.get('headers') or {}
+        accept = headers.get('Accept') or self.session.headers.get('Accept')
+        key = object_key(url, kwargs.get('params'), accept)
+        content = cache.get(key)
+        if content is not None:
+            __logs__.info('Serving %s from the object cache', url)
+            return self.session.codec.loads(content)
+
+        json = self._json(self._get(url, **kwargs), 200)
+        if json is not None:
+            content = self.session.codec.dumps(json)
+            if not isinstance(content, bytes):
+                content = content.encode('utf-8')
+            cache.set(key, content)
+        return json
+
+    def _stream_raw(self, url, to=None, chunk_size=CHUNK_SIZE, **kwargs):
+        """Stream the raw content of the file or blob at ``url``.
+
+        :returns: the name of the file written if ``to`` is given, an
+            iterator of ``bytes`` otherwise, ``None`` on a 404
+        """
+        headers = {'Accept': 'application/vnd.github.v3.raw'}
+        response = self._get(url, headers=headers, stream=True, **kwargs)
+        try:
+            found = self._boolean(response, 200, 404)
+        except exceptions.GitHubError:
+            response.close()
+            raise
+        if not found:
+            # Give the connection back to the pool
+            if response is not None:
+                response.close()
+            return None
+        if to is not None:
+            return stream_response_to_file(response, to, chunk_size)
+        return _iter_content(response, chunk_size)
+
     def _boolean(self, response, true_code, false_code):
         if response is not None:
             status_code = response.status_code
@@ -190,14 +318,18 @@ class GitHubCore(GitHubObject):
         __logs__.debug('PATCH %s with %s', url, kwargs)
         return self.session.patch(url, **kwargs)
 
+    def _dumps(self, data):
+        """Encode ``data`` with the JSON codec of the session."""
+        return self.session.codec.dumps(data)
+
     def _post(self, url, data=None, json=True, **kwargs):
         if json:
-            data = dumps(data) if data is not None else data
+            data = self._dumps(data) if data is not None else data
         elif 'headers' in kwargs:
             # Override the Content-Type header
-            kwargs['headers'] = {
-                'Content-Type': None
-                }.update(kwargs['headers'])
+            headers = {'Content-Type': None}
+            headers.update(kwargs['headers'])
+            kwargs['headers'] = headers
         __logs__.debug('POST %s with %s, %s', url, data, kwargs)
         return self.session.post(url, data, **kwargs)
 
@@ -237,8 +369,15 @@ class GitHubCore(GitHubObject):
     def ratelimit_remaining(self):
         """Number of requests before GitHub imposes a ratelimit.
 
+        The value advertised in the headers of the last response is used
+        when there is one, otherwise it is requested from GitHub.
+
         :returns: int
         """
+        remaining = self.session.ratelimit.remaining('core')
+        if remaining is not None:
+            self._remaining = remaining
+            return remaining
         json = self._json(self._get(self._github_url + '/rate_limit'), 200)
         core = json.get('resources', {}).get('core', {})
         self._remaining = core.get('remaining', 0)
@@ -330,7 +469,7 @@ class BaseComment(GitHubCore):
         """
         if body:
             json = self._json(self._patch(self._api,
-                              data=dumps({'body': body})), 200)
+                              data=self._dumps({'body': body})), 200)
             if json:
                 self._update_attributes(json)
                 return True
@@ -9,7 +9,6 @@ See also: http://developer.github.com/v3/activity/notifications/
 """
 from __future__ import unicode_literals
 
-from json import dumps
 from .models import GitHubCore
 
 
@@ -89,7 +88,7 @@ class Thread(GitHubCore):
         """
         url = self._build_url('subscription', base_url=self._api)
         sub = {'subscribed': subscribed, 'ignored': ignored}
-        json = self._json(self._put(url, data=dumps(sub)), 200)
+        json = self._json(self._put(url, data=self._dumps(sub)), 200)
         return self._instance_or_null(Subscription, json)
 
     def subscription(self):
@@ -145,5 +144,5 @@ class Subscription(GitHubCore):
             ignored from this thread.
         """
         sub = {'subscribed': subscribed, 'ignored': ignored}
-        json = self._json(self._put(self._api, data=dumps(sub)), 200)
+        json = self._json(self._put(self._api, data=self._dumps(sub)), 200)
         self._update_attributes(json)
@@ -10,7 +10,6 @@ from __future__ import unicode_literals
 
 import warnings
 
-from json import dumps
 from .events import Event
 from .models import BaseAccount, GitHubCore
 from .repos import Repository
@@ -105,7 +104,8 @@ class Team(GitHubCore):
         """
         if name:
             data = {'name': name, 'permission': permission}
-            json = self._json(self._patch(self._api, data=dumps(data)), 200)
+            json = self._json(
+                self._patch(self._api, data=self._dumps(data)), 200)
             if json:
                 self._update_attributes(json)
                 return True
@@ -426,7 +426,8 @@ class Organization(BaseAccount):
         self._remove_none(data)
 
         if data:
-            json = self._json(self._patch(self._api, data=dumps(data)), 200)
+            json = self._json(
+                self._patch(self._api, data=self._dumps(data)), 200)
 
         if json:
             self._update_attributes(json)
@@ -608,7 +609,7 @@ class Membership(GitHubCore):
         :rtype: bool
         """
         if state and state.lower() == 'active':
-            data = dumps({'state': state.lower()})
+            data = self._dumps({'state': state.lower()})
             json = self._json(self._patch(self._api, data=data))
             self._update_attributes(json)
             return True
@@ -9,7 +9,6 @@ This module contains all the classes relating to pull requests.
 from __future__ import unicode_literals
 
 from re import match
-from json import dumps
 
 from . import models
 from .repos.contents import Contents
@@ -28,8 +27,8 @@ class PullDestination(models.GitHubCore):
     See also: http://developer.github.com/v3/pulls/#get-a-single-pull-request
     """
 
-    def __init__(self, dest, direction):
-        super(PullDestination, self).__init__(dest)
+    def __init__(self, dest, direction, session=None):
+        super(PullDestination, self).__init__(dest, session)
         #: Direction of the merge with respect to this destination
         self.direction = direction
         #: Full reference string of the object
@@ -39,7 +38,7 @@ class PullDestination(models.GitHubCore):
         #: :class:`User <github3.users.User>` representing the owner
         self.user = None
         if dest.get('user'):
-            self.user = User(dest.get('user'), None)
+            self.user = User(dest.get('user'), self)
         #: SHA of the commit at the head
         self.sha = dest.get('sha')
         self._repo_name = ''
@@ -114,7 +113,7 @@ class PullRequest(models.GitHubCore):
     def _update_attributes(self, pull):
         self._api = pull.get('url', '')
         #: Base of the merge
-        self.base = PullDestination(pull.get('base'), 'Base')
+        self.base = PullDestination(pull.get('base'), 'Base', self)
         #: Body of the pull request message
         self.body = pull.get('body', '')
         #: Body of the pull request as HTML
@@ -141,7 +140,7 @@ class PullRequest(models.GitHubCore):
         #: URL to view the diff associated with the pull
         self.diff_url = pull.get('diff_url')
         #: The new head after the pull request
-        self.head = PullDestination(pull.get('head'), 'Head')
+        self.head = PullDestination(pull.get('head'), 'Head', self)
         #: The URL of the pull request
         self.html_url = pull.get('html_url')
         #: The unique id of the pull request
@@ -319,7 +318,7 @@ class PullRequest(models.GitHubCore):
         if sha:
             parameters['sha'] = sha
         url = self._build_url('merge', base_url=self._api)
-        json = self._json(self._put(url, data=dumps(parameters)), 200)
+        json = self._json(self._put(url, data=self._dumps(parameters)), 200)
         if not json:
             return False
         return json['merged']
@@ -367,7 +366,8 @@ class PullRequest(models.GitHubCore):
         self._remove_none(data)
 
         if data:
-            json = self._json(self._patch(self._api, data=dumps(data)), 200)
+            json = self._json(
+                self._patch(self._api, data=self._dumps(data)), 200)
 
         if json:
             self._update_attributes(json)
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+github3.ratelimit
+=================
+
+This module keeps track of GitHub's rate limits as responses come in and
+decides when requests should be delayed or retried.
+
+"""
+import threading
+import time
+
+from contextlib import contextmanager
+from logging import getLogger
+
+from requests.compat import urlparse
+
+__logs__ = getLogger(__package__)
+
+
+def resource_for(url):
+    """Return the name of the rate limit that applies to ``url``.
+
+    :param str url: URL of the request
+    :returns: ``'search'`` for the search API, ``'core'`` otherwise
+    :rtype: str
+    """
+    path = urlparse(url).path
+    if path.startswith('/search/') or '/api/v3/search/' in path:
+        return 'search'
+    return 'core'
+
+
+def _int_header(headers, name):
+    value = headers.get(name)
+    if value is not None and str(value).isdigit():
+        return int(value)
+    return None
+
+
+class RateLimitScheduler(object):
+
+    """Track the rate limits advertised by GitHub and pace requests.
+
+    Every :class:`GitHubSession <github3.session.GitHubSession>` has a
+    scheduler (its ``ratelimit`` attribute) which records the
+    ``X-RateLimit-*`` headers of every response so the remaining budget can
+    be read without an extra request. By default that is all it does; the
+    remaining parameters opt into pacing and automatic retries.
+
+    :param bool wait: (optional), when the budget of a resource is
+        exhausted, sleep until it is reset instead of sending requests that
+        GitHub will reject. Default: False
+    :param float max_wait: (optional), longest time in seconds the scheduler
+        will sleep for a single request, ``None`` means no limit. Requests
+        which would have to wait longer are sent right away and a warning
+        is logged
+    :param float rate: (optional), maximum number of requests per second,
+        enforced with a token bucket. Default: no limit
+    :param int burst: (optional), number of requests that can be sent at
+        once before ``rate`` applies. Default: 1
+    :param bool retry_abuse: (optional), retry requests rejected by the
+        abuse detection mechanism after the ``Retry-After`` delay GitHub
+        asks for. Default: False
+    :param int max_retries: (optional), number of times a single request is
+        retried. Default: 3
+    """
+
+    def __init__(self, wait=False, max_wait=None, rate=None, burst=1,
+                 retry_abuse=False, max_retries=3):
+        self.wait = wait
+        self.max_wait = max_wait
+        self.rate = rate
+        self.burst = burst
+        self.retry_abuse = retry_abuse
+        self.max_retries = max_retries
+        #: Mapping of resource names (``'core'``, ``'search'``) to
+        #: dictionaries with the ``limit``, ``remaining`` and ``reset``
+        #: (epoch seconds) last advertised by GitHub
+        self.resources = {}
+        self._tokens = float(burst)
+        self._last_refill = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        del state['_local']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def waiting(self, *resources):
+        """Wait for the budget of ``resources`` in the current thread.
+
+        Within the block, requests for these resources behave as if
+        :attr:`wait` was set: they are delayed until the budget is reset
+        and retried when GitHub rejects them because it is exhausted::
+
+            with session.ratelimit.waiting('search'):
+                ...
+
+        :param resources: names of the resources, e.g., ``'search'``
+        """
+        previous = getattr(self._local, 'resources', frozenset())
+        self._local.resources = previous | frozenset(resources)
+        try:
+            yield self
+        finally:
+            self._local.resources = previous
+
+    def _waits(self, resource):
+        return self.wait or resource in getattr(self._local, 'resources', ())
+
+    def clock(self):
+        """Return the current time in seconds since the epoch."""
+        return time.time()
+
+    def remaining(self, resource='core'):
+        """Return the number of requests left for ``resource``.
+
+        :returns: the remaining budget or ``None`` if no response carrying
+            the rate limit headers has been seen yet
+        :rtype: int
+        """
+        return self.resources.get(resource, {}).get('remaining')
+
+    def update(self, response):
+        """Record the rate limit headers of ``response``."""
+        headers = response.headers
+        remaining = _int_header(headers, 'X-RateLimit-Remaining')
+        if remaining is None:
+            return
+        resource = headers.get('X-RateLimit-Resource')
+        if not resource:
+            resource = resource_for(getattr(response, 'url', None) or '')
+        with self._lock:
+            self.resources[resource] = {
+                'limit': _int_header(headers, 'X-RateLimit-Limit'),
+                'remaining': remaining,
+                'reset': _int_header(headers, 'X-RateLimit-Reset'),
+            }
+
+    def delay(self, url):
+        """Return how long to wait before sending a request to ``url``.
+
+        This also reserves one request from the known budget so that
+        concurrent callers do not all spend the last one.
+
+        :returns: number of seconds to sleep, 0 if that would exceed
+            :attr:`max_wait`
+        :rtype: float
+        """
+        with self._lock:
+            wait = self._take_token()
+            resource = resource_for(url)
+            limits = self.resources.get(resource)
+            if limits is not None:
+                if (limits['remaining'] <= 0 and self._waits(resource) and
+                        limits['reset']):
+                    wait = max(wait, limits['reset'] - self.clock() + 1)
+                limits['remaining'] = max(limits['remaining'] - 1, 0)
+        if self.max_wait is not None and wait > self.max_wait:
+            __logs__.warning('Not waiting %.0f seconds (more than max_wait) '
+                             'before requesting %s', wait, url)
+            return 0
+        return max(wait, 0)
+
+    def _take_token(self):
+        if not self.rate:
+            return 0
+        now = self.clock()
+        if self._last_refill is not None:
+            elapsed = now - self._last_refill
+            self._tokens = min(float(self.burst),
+                               self._tokens + elapsed * self.rate)
+        self._last_refill = now
+        self._tokens -= 1
+        if self._tokens >= 0:
+            return 0
+        return -self._tokens / self.rate
+
+    def retry_after(self, response, attempt):
+        """Return how long to wait before retrying the request.
+
+        :param response: the response GitHub sent
+        :param int attempt: number of times the request was already retried
+        :returns: number of seconds to sleep before retrying or ``None`` if
+            the response should be returned to the caller
+        """
+        if (response.status_code not in (403, 429) or
+                attempt >= self.max_retries):
+            return None
+
+        headers = response.headers
+        wait = None
+        retry_after = _int_header(headers, 'Retry-After')
+        if retry_after is not None:
+            if self.retry_abuse:
+                wait = retry_after
+        elif (headers.get('X-RateLimit-Remaining') == '0' and
+                self._waits(headers.get('X-RateLimit-Resource') or
+                            resource_for(getattr(response, 'url', None) or
+                                         ''))):
+            reset = _int_header(headers, 'X-RateLimit-Reset')
+            if reset is not None:
+                wait = max(reset - self.clock() + 1, 0)
+
+        if (wait is None or
+                (self.max_wait is not None and wait > self.max_wait)):
+            return None
+        return wait
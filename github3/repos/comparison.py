@@ -43,7 +43,7 @@ class Comparison(GitHubCore):
         self.patch_url = compare.get('patch_url')
         #: :class:`RepoCommit <github3.repos.commit.RepoCommit>` object
         #: representing the base of comparison.
-        self.base_commit = RepoCommit(compare.get('base_commit'), None)
+        self.base_commit = RepoCommit(compare.get('base_commit'), self)
         #: Behind or ahead.
         self.status = compare.get('status')
         #: Number of commits ahead by.
@@ -54,7 +54,8 @@ class Comparison(GitHubCore):
         self.total_commits = compare.get('total_commits')
         #: List of :class:`RepoCommit <github3.repos.commit.RepoCommit>`
         #: objects.
-        self.commits = [RepoCommit(com) for com in compare.get('commits')]
+        self.commits = [RepoCommit(com, self)
+                        for com in compare.get('commits')]
         #: List of dicts describing the files modified.
         self.files = compare.get('files', [])
 
@@ -9,11 +9,11 @@ that can be accessed via the GitHub API.
 """
 from __future__ import unicode_literals
 
-from json import dumps
 from base64 import b64decode, b64encode
 from ..git import Commit
 from ..models import GitHubCore
 from ..decorators import requires_auth
+from ..utils import CHUNK_SIZE
 
 
 class Contents(GitHubCore):
@@ -55,16 +55,7 @@ class Contents(GitHubCore):
         #: Base64-encoded content of the file.
         self.content = content.get('content', '')
 
-        #: Decoded content of the file as a bytes object. If we try to decode
-        #: to character set for you, we might encounter an exception which
-        #: will prevent the object from being created. On python2 this is the
-        #: same as a string, but on python3 you should call the decode method
-        #: with the character set you wish to use, e.g.,
-        #: ``content.decoded.decode('utf-8')``.
-        #: .. versionchanged:: 0.5.2
-        self.decoded = b''
-        if self.encoding == 'base64' and self.content:
-            self.decoded = b64decode(self.content.encode())
+        self._decoded = None
 
         # file name, path, and size
         #: Name of the content.
@@ -86,6 +77,26 @@ class Contents(GitHubCore):
     def _repr(self):
         return '<Content [{0}]>'.format(self.path)
 
+    @property
+    def decoded(self):
+        """Decoded content of the file as a bytes object. If we try to decode
+        to character set for you, we might encounter an exception which
+        will prevent the object from being created. On python2 this is the
+        same as a string, but on python3 you should call the decode method
+        with the character set you wish to use, e.g.,
+        ``content.decoded.decode('utf-8')``.
+
+        It is only decoded the first time it is read, see :meth:`stream` to
+        avoid holding large files in memory.
+
+        .. versionchanged:: 0.5.2
+        """
+        if self._decoded is None:
+            self._decoded = b''
+            if self.encoding == 'base64' and self.content:
+                self._decoded = b64decode(self.content.encode())
+        return self._decoded
+
     def __eq__(self, other):
         return self.decoded == other
 
@@ -115,7 +126,8 @@ class Contents(GitHubCore):
                     'committer': validate_commmitter(committer),
                     'author': validate_commmitter(author)}
             self._remove_none(data)
-            json = self._json(self._delete(self._api, data=dumps(data)), 200)
+            json = self._json(
+                self._delete(self._api, data=self._dumps(data)), 200)
             if 'commit' in json:
                 json['commit'] = Commit(json['commit'], self)
             if 'content' in json:
@@ -123,6 +135,23 @@ class Contents(GitHubCore):
                                                          json['content'])
         return json
 
+    def stream(self, to=None, chunk_size=CHUNK_SIZE):
+        """Retrieve the raw content of this file without encoding it.
+
+        The content is requested with the ``application/vnd.github.v3.raw``
+        media type and streamed, so it is never held in memory as a whole.
+
+        :param to: (optional), path or file-like object to write the
+            content to
+        :param int chunk_size: (optional), size in bytes of the chunks read.
+            Default: :data:`github3.utils.CHUNK_SIZE`
+        :returns: the name of the file written if ``to`` is given, an
+            iterator of ``bytes`` chunks otherwise, or ``None`` if the file
+            does not exist
+        """
+        # Unlike _api, the URL keeps the ref the file was retrieved at
+        return self._stream_raw(self.url, to, chunk_size)
+
     @requires_auth
     def update(self, message, content, branch=None, committer=None,
                author=None):
@@ -155,7 +184,8 @@ class Contents(GitHubCore):
                     'committer': validate_commmitter(committer),
                     'author': validate_commmitter(author)}
             self._remove_none(data)
-            json = self._json(self._put(self._api, data=dumps(data)), 200)
+            json = self._json(
+                self._put(self._api, data=self._dumps(data)), 200)
             if 'content' in json:
                 self._update_attributes(json['content'])
                 json['content'] = self
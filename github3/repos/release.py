@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals
-import json
+
+import mmap
+import os
+import threading
 
 from ..decorators import requires_auth
 from ..exceptions import error_for
@@ -8,6 +11,11 @@ from ..models import GitHubCore
 from .. import utils
 from uritemplate import URITemplate
 
+#: Size of the ranges requested in parallel by :meth:`Asset.download`
+SEGMENT_SIZE = 8 * 1024 * 1024
+# Size of the chunks read from a segment and of the reads when hashing
+_CHUNK_SIZE = 64 * 1024
+
 
 class Release(GitHubCore):
 
@@ -121,36 +129,98 @@ class Release(GitHubCore):
         self._remove_none(data)
 
         r = self.session.patch(
-            url, data=json.dumps(data), headers=Release.CUSTOM_HEADERS
+            url, data=self._dumps(data), headers=Release.CUSTOM_HEADERS
         )
 
         successful = self._boolean(r, 200, 404)
         if successful:
             # If the edit was successful, let's update the object.
-            self._update_attributes(r.json())
+            self._update_attributes(self.session.codec.loads(r.content))
 
         return successful
 
     @requires_auth
-    def upload_asset(self, content_type, name, asset):
+    def upload_asset(self, content_type, name, asset=None, path=None,
+                     progress=None):
         """Upload an asset to this release.
 
-        All parameters are required.
+        Files are streamed rather than read in memory: regular files are
+        memory-mapped and sent in chunks with an explicit ``Content-Length``
+        while other seekable files are read a chunk at a time.
 
-        :param str content_type: The content type of the asset. Wikipedia has
-            a list of common media types
-        :param str name: The name of the file
+        :param str content_type: (required), The content type of the asset.
+            Wikipedia has a list of common media types
+        :param str name: (required), The name of the file
         :param asset: The file or bytes object to upload.
+        :param str path: Path of the file to upload, instead of ``asset``
+        :param progress: (optional), callable receiving the number of bytes
+            sent so far and the total, called as the upload progresses
         :returns: :class:`Asset <Asset>`
         """
+        if (asset is None) == (path is None):
+            raise ValueError('Exactly one of asset and path is required')
         headers = Release.CUSTOM_HEADERS.copy()
         headers.update({'Content-Type': content_type})
         url = self.upload_urlt.expand({'name': name})
-        r = self._post(url, data=asset, json=False, headers=headers)
+
+        fd = open(path, 'rb') if path is not None else None
+        body = _UploadBody.wrap(fd or asset, progress)
+        try:
+            if isinstance(body, _UploadBody):
+                headers['Content-Length'] = str(len(body))
+            r = self._post(url, data=body, json=False, headers=headers)
+        finally:
+            if isinstance(body, _UploadBody):
+                body.close()
+            if fd is not None:
+                fd.close()
         if r.status_code in (201, 202):
-            return Asset(r.json(), self)
+            return Asset(self.session.codec.loads(r.content), self)
         raise error_for(r)
 
+    @requires_auth
+    def upload_assets(self, assets, workers=4, retries=2, progress=None):
+        """Upload several assets to this release concurrently.
+
+        Each asset is described by a dictionary of the arguments of
+        :meth:`upload_asset`, e.g., ``{'content_type': 'application/zip',
+        'name': 'dist.zip', 'path': 'build/dist.zip'}``. Uploads which fail
+        are attempted again up to ``retries`` times; assets given as file
+        objects which cannot be rewound are not retried.
+
+        :param list assets: (required), the assets to upload
+        :param int workers: (optional), maximum number of concurrent
+            uploads. Default: 4
+        :param int retries: (optional), number of times a failed upload is
+            attempted again. Default: 2
+        :param progress: (optional), callable receiving the name of the
+            asset, the bytes sent so far and the total
+        :returns: list with, in the order given, the :class:`Asset <Asset>`
+            uploaded or the exception raised by its last attempt
+        """
+        def upload(spec):
+            spec = dict(spec)
+            name = spec['name']
+            if progress is not None:
+                spec['progress'] = lambda sent, total: progress(
+                    name, sent, total)
+            asset = spec.get('asset')
+            start = asset.tell() if hasattr(asset, 'seek') else None
+            attempt = 0
+            while True:
+                try:
+                    return self.upload_asset(**spec)
+                except Exception:
+                    rewindable = start is not None or not hasattr(asset,
+                                                                  'read')
+                    if attempt >= retries or not rewindable:
+                        raise
+                    attempt += 1
+                    if start is not None:
+                        asset.seek(start)
+
+        return utils.map_concurrently(upload, assets, workers)
+
 
 class Asset(GitHubCore):
 
@@ -181,20 +251,43 @@ class Asset(GitHubCore):
     def _repr(self):
         return '<Asset [{0}]>'.format(self.name)
 
-    def download(self, path=''):
+    def download(self, path='', workers=1, resume=False, checksum=None,
+                 segment_size=SEGMENT_SIZE):
         """Download the data for this asset.
 
+        With more than one worker, the asset is split in segments of
+        ``segment_size`` bytes which are requested in parallel with
+        ``Range`` headers and written in place to a file preallocated to the
+        size of the asset. The segments already written are recorded next to
+        the file, in ``<path>.segments``, so that a download which failed
+        can be continued with ``resume=True``; the record is removed once
+        the download is complete. Servers ignoring ``Range`` headers are
+        handled by downloading the whole asset in a single request.
+
         :param path: (optional), path where the file should be saved
             to, default is the filename provided in the headers and will be
             written in the current directory.
-            it can take a file-like object as well
+            it can take a file-like object as well. Segmented downloads
+            default to the name of the asset.
         :type path: str, file
+        :param int workers: (optional), number of segments downloaded in
+            parallel. Default: 1
+        :param bool resume: (optional), continue a previous download to
+            ``path`` instead of starting over. Default: False
+        :param checksum: (optional), hash object, e.g., ``hashlib.sha256()``,
+            updated with the content of the asset. It is updated while the
+            content is received for sequential downloads and by reading the
+            file back once a segmented download is complete.
+        :param int segment_size: (optional), size in bytes of the ranges
+            requested in parallel. Default: :data:`SEGMENT_SIZE`
         :returns: name of the file, if successful otherwise ``None``
         :rtype: str
         """
         headers = {
             'Accept': 'application/octet-stream'
             }
+        segmented = ((workers > 1 or resume) and self.size and
+                     not hasattr(path, 'write'))
         resp = self._get(self._api, allow_redirects=False, stream=True,
                          headers=headers)
         if resp.status_code == 302:
@@ -203,15 +296,89 @@ class Asset(GitHubCore):
             headers.update({
                 'Content-Type': None,
                 })
+            location = resp.headers['location']
+            resp.close()
 
             with self.session.no_auth():
-                resp = self._get(resp.headers['location'], stream=True,
-                                 headers=headers)
+                if segmented:
+                    return self._download_segments(
+                        location, headers, path or self.name, workers,
+                        resume, checksum, segment_size)
+                resp = self._get(location, stream=True, headers=headers)
+        elif segmented and resp.status_code == 200:
+            resp.close()
+            return self._download_segments(
+                self._api, headers, path or self.name, workers, resume,
+                checksum, segment_size)
 
         if self._boolean(resp, 200, 404):
+            if checksum is not None:
+                resp = _HashingResponse(resp, checksum)
             return utils.stream_response_to_file(resp, path)
         return None
 
+    def _download_segments(self, url, headers, path, workers, resume,
+                           checksum, segment_size):
+        """Download the asset at ``url`` to ``path`` in ranges."""
+        size = self.size
+        segments = [(start, min(start + segment_size, size) - 1)
+                    for start in range(0, size, segment_size)]
+        done = _SegmentRecord(path + '.segments', size, segment_size)
+        if not (resume and os.path.exists(path) and done.load()):
+            done.reset()
+        pending = [s for (i, s) in enumerate(segments) if i not in done]
+
+        with open(path, 'r+b' if os.path.exists(path) else 'wb') as fd:
+            _preallocate(fd, size)
+
+        def fetch(segment):
+            start, end = segment
+            resp = self._get(url, stream=True, headers=dict(
+                headers, Range='bytes={0}-{1}'.format(start, end)))
+            if resp.status_code == 200:
+                # The server ignored the range and sent the whole asset
+                return resp
+            if resp.status_code != 206:
+                raise error_for(resp)
+            written = 0
+            with open(path, 'r+b') as fd:
+                fd.seek(start)
+                for chunk in resp.iter_content(chunk_size=_CHUNK_SIZE):
+                    fd.write(chunk)
+                    written += len(chunk)
+            if written != end - start + 1:
+                raise IOError('Received {0} bytes of the range {1}-{2} of '
+                              '{3}'.format(written, start, end, path))
+            done.add(segments.index(segment))
+
+        # The first range tells whether the server supports them
+        results = [fetch(pending[0])] if pending else []
+        if results and results[0] is not None:
+            with open(path, 'wb') as fd:
+                resp = results[0]
+                for chunk in resp.iter_content(chunk_size=_CHUNK_SIZE):
+                    if checksum is not None:
+                        checksum.update(chunk)
+                    fd.write(chunk)
+            done.remove()
+            return path
+
+        results = utils.map_concurrently(fetch, pending[1:], workers)
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+            if result is not None:
+                result.close()
+                raise IOError('The server stopped honouring ranges while '
+                              'downloading {0}'.format(path))
+        done.remove()
+
+        if checksum is not None:
+            with open(path, 'rb') as fd:
+                for chunk in iter(lambda: fd.read(_CHUNK_SIZE * 16), b''):
+                    checksum.update(chunk)
+        return path
+
     @requires_auth
     def delete(self):
         """Delete this asset if the user has push access.
@@ -239,11 +406,211 @@ class Asset(GitHubCore):
         self._remove_none(edit_data)
         r = self._patch(
             self._api,
-            data=json.dumps(edit_data),
+            data=self._dumps(edit_data),
             headers=Release.CUSTOM_HEADERS
         )
         successful = self._boolean(r, 200, 404)
         if successful:
-            self._update_attributes(r.json())
+            self._update_attributes(self.session.codec.loads(r.content))
 
         return successful
+
+
+class _UploadBody(object):
+
+    """Body of an upload streamed in chunks with a known length.
+
+    Regular files are memory-mapped and sent as views of the mapping, which
+    avoids copying them; other seekable files are read a chunk at a time.
+    The body can be iterated several times, e.g., when a request is retried.
+    """
+
+    chunk_size = _CHUNK_SIZE
+
+    def __init__(self, source, length, progress=None):
+        self._source = source
+        self._start = source.tell() if hasattr(source, 'tell') else 0
+        self._length = length
+        self._progress = progress
+        self._map = None
+        if hasattr(source, 'fileno') and length:
+            try:
+                self._map = mmap.mmap(source.fileno(), 0,
+                                      access=mmap.ACCESS_READ)
+            except (EnvironmentError, ValueError):
+                # Not a regular file, e.g., a pipe or a socket
+                self._map = None
+
+    @classmethod
+    def wrap(cls, asset, progress=None):
+        """Return the body to send for ``asset``.
+
+        Bytes and files whose length cannot be found are returned unchanged.
+        """
+        if isinstance(asset, (bytes, bytearray)):
+            if progress is not None:
+                return cls(_BytesReader(asset), len(asset), progress)
+            return asset
+        try:
+            start = asset.tell()
+            asset.seek(0, os.SEEK_END)
+            length = asset.tell() - start
+            asset.seek(start)
+        except (AttributeError, EnvironmentError, ValueError):
+            return asset
+        return cls(asset, length, progress)
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        sent = 0
+        if self._map is not None:
+            try:
+                view = memoryview(self._map)
+            except TypeError:
+                # Python 2 mappings do not support the buffer protocol,
+                # slicing them copies the chunk instead
+                view = None
+            try:
+                while sent < self._length:
+                    offset = self._start + sent
+                    if view is None:
+                        chunk = self._map[offset:offset + self.chunk_size]
+                    else:
+                        chunk = view[offset:offset + self.chunk_size]
+                    yield chunk
+                    sent += len(chunk)
+                    if view is not None:
+                        chunk.release()
+                    self._report(sent)
+            finally:
+                if view is not None:
+                    view.release()
+        else:
+            self._source.seek(self._start)
+            while sent < self._length:
+                chunk = self._source.read(
+                    min(self.chunk_size, self._length - sent))
+                if not chunk:
+                    break
+                yield chunk
+                sent += len(chunk)
+                self._report(sent)
+        if not self._length:
+            self._report(0)
+
+    def _report(self, sent):
+        if self._progress is not None:
+            self._progress(sent, self._length)
+
+    def close(self):
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # A chunk is still referenced, leave the mapping to the GC
+                pass
+
+
+class _BytesReader(object):
+
+    """Minimal seekable reader over bytes, without copying them."""
+
+    def __init__(self, data):
+        self._view = memoryview(data)
+        self._position = 0
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_END:
+            offset += len(self._view)
+        self._position = offset
+
+    def read(self, size):
+        chunk = self._view[self._position:self._position + size]
+        self._position += len(chunk)
+        return chunk
+
+
+class _HashingResponse(object):
+
+    """Response updating a hash with the content it is iterated over."""
+
+    def __init__(self, response, checksum):
+        self._response = response
+        self._checksum = checksum
+        self.headers = response.headers
+
+    def iter_content(self, chunk_size=1, decode_unicode=False):
+        for chunk in self._response.iter_content(chunk_size, decode_unicode):
+            self._checksum.update(chunk)
+            yield chunk
+
+
+class _SegmentRecord(object):
+
+    """Record of the segments of a download already written to disk.
+
+    The first line holds the size of the asset and of the segments so a
+    record left by a different download is not trusted, every following
+    line the index of a completed segment.
+    """
+
+    def __init__(self, path, size, segment_size):
+        self.path = path
+        self.header = '{0} {1}\n'.format(size, segment_size)
+        self.segments = set()
+        self._lock = threading.Lock()
+
+    def __contains__(self, index):
+        return index in self.segments
+
+    def load(self):
+        """Read the record and return whether it matches this download."""
+        try:
+            with open(self.path) as fd:
+                lines = fd.readlines()
+        except (IOError, OSError):
+            return False
+        if not lines or lines[0] != self.header:
+            return False
+        self.segments = set(int(line) for line in lines[1:]
+                            if line.endswith('\n'))
+        return True
+
+    def reset(self):
+        self.segments = set()
+        with open(self.path, 'w') as fd:
+            fd.write(self.header)
+
+    def add(self, index):
+        with self._lock:
+            self.segments.add(index)
+            with open(self.path, 'a') as fd:
+                fd.write('{0}\n'.format(index))
+
+    def remove(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+def _preallocate(fd, size):
+    """Reserve ``size`` bytes for the file ``fd``."""
+    fd.seek(0, os.SEEK_END)
+    if fd.tell() > size:
+        fd.truncate(size)
+    fd.flush()
+    fallocate = getattr(os, 'posix_fallocate', None)
+    try:
+        if fallocate is None:
+            raise OSError()
+        fallocate(fd.fileno(), 0, size)
+    except OSError:
+        # Not supported by the platform or the file system, extend the file
+        # without reserving its blocks
+        fd.truncate(size)
@@ -9,7 +9,6 @@ parts of GitHub's Repository API.
 """
 from __future__ import unicode_literals
 
-from json import dumps
 from base64 import b64encode
 from ..decorators import requires_auth
 from ..events import Event
@@ -30,11 +29,12 @@ from .deployment import Deployment
 from .hook import Hook
 from .pages import PagesBuild, PagesInfo
 from .status import Status
-from .stats import ContributorStats
+from .stats import STATISTICS, ContributorStats, StatsColumns
 from .release import Release, Asset
 from .tag import RepoTag
 from ..users import User, Key
-from ..utils import stream_response_to_file, timestamp_parameter
+from ..utils import (CHUNK_SIZE, extract_response, map_concurrently,
+                     stream_response_to_file, timestamp_parameter)
 from uritemplate import URITemplate
 
 
@@ -308,6 +308,24 @@ class Repository(GitHubCore):
             json = self._json(self._post(url, data=data), 201)
         return self._instance_or_null(PullRequest, json)
 
+    def _statistics_columns(self, statistic, number=-1, etag=None,
+                            backend=None):
+        """Build the :class:`StatsColumns
+        <github3.repos.stats.StatsColumns>` of ``statistic`` from its JSON.
+        """
+        url = self._build_url('stats', STATISTICS[statistic],
+                              base_url=self._api)
+        if etag:
+            response = self._get(url, headers={'If-None-Match': etag})
+        else:
+            response = self._get(url)
+        if response.status_code in (202, 304):
+            return None
+        json = self._json(response, 200)
+        if isinstance(json, list) and int(number) > 0:
+            json = json[:int(number)]
+        return StatsColumns.from_json(statistic, json, backend)
+
     @requires_auth
     def add_collaborator(self, username):
         """Add ``username`` as a collaborator to a repository.
@@ -322,11 +340,15 @@ class Repository(GitHubCore):
                               base_url=self._api)
         return self._boolean(self._put(url), 204, 404)
 
-    def archive(self, format, path='', ref='master'):
+    def archive(self, format, path='', ref='master', chunk_size=CHUNK_SIZE,
+                extract_to=None, prefixes=None):
         """Get the tarball or zipball archive for this repo at ref.
 
         See: http://developer.github.com/v3/repos/contents/#get-archive-link
 
+        With ``extract_to``, the archive is extracted to that directory
+        instead of being saved, see :func:`github3.utils.extract_response`.
+
         :param str format: (required), accepted values: ('tarball',
             'zipball')
         :param path: (optional), path where the file should be saved
@@ -335,6 +357,12 @@ class Repository(GitHubCore):
             it can take a file-like object as well
         :type path: str, file
         :param str ref: (optional)
+        :param int chunk_size: (optional), size in bytes of the buffer used
+            to copy the archive. Default: :data:`github3.utils.CHUNK_SIZE`
+        :param str extract_to: (optional), directory to extract the archive
+            to
+        :param list prefixes: (optional), with ``extract_to``, only extract
+            the files whose path starts with one of these prefixes
         :returns: bool -- True if successful, False otherwise
 
         """
@@ -344,7 +372,11 @@ class Repository(GitHubCore):
             resp = self._get(url, allow_redirects=True, stream=True)
 
         if resp and self._boolean(resp, 200, 404):
-            stream_response_to_file(resp, path)
+            if extract_to is not None:
+                extract_response(resp, extract_to, format, prefixes,
+                                 chunk_size)
+            else:
+                stream_response_to_file(resp, path, chunk_size)
             return True
         return False
 
@@ -382,7 +414,7 @@ class Repository(GitHubCore):
             None
         """
         url = self._build_url('git', 'blobs', sha, base_url=self._api)
-        json = self._json(self._get(url), 200)
+        json = self._json_by_sha(sha, url)
         return self._instance_or_null(Blob, json)
 
     def branch(self, name):
@@ -411,7 +443,8 @@ class Repository(GitHubCore):
         url = self._build_url('branches', base_url=self._api)
         return self._iter(int(number), url, Branch, etag=etag)
 
-    def code_frequency(self, number=-1, etag=None):
+    def code_frequency(self, number=-1, etag=None, columnar=False,
+                       backend=None):
         """Iterate over the code frequency per week.
 
         Returns a weekly aggregate of the number of additions and deletions
@@ -421,17 +454,28 @@ class Repository(GitHubCore):
             returns all weeks
         :param str etag: (optional), ETag from a previous request to the same
             endpoint
+        :param bool columnar: (optional), return the weeks as
+            :class:`StatsColumns <github3.repos.stats.StatsColumns>` built
+            directly from the JSON, or ``None`` while GitHub computes them
+            or if they did not change since ``etag``. Default: False
+        :param str backend: (optional), with ``columnar``, ``'numpy'`` or
+            ``'array'``
         :returns: generator of lists ``[seconds_from_epoch, additions,
             deletions]``
 
         .. note:: All statistics methods may return a 202. On those occasions,
                   you will not receive any objects. You should store your
                   iterator and check the new ``last_status`` attribute. If it
-                  is a 202 you should wait before re-requesting.
+                  is a 202 you should wait before re-requesting, or use
+                  :func:`poll_statistics
+                  <github3.repos.stats.poll_statistics>`.
 
         .. versionadded:: 0.7
 
         """
+        if columnar:
+            return self._statistics_columns('code_frequency', number, etag,
+                                            backend)
         url = self._build_url('stats', 'code_frequency', base_url=self._api)
         return self._iter(int(number), url, list, etag=etag)
 
@@ -470,10 +514,11 @@ class Repository(GitHubCore):
             successful, otherwise None
         """
         url = self._build_url('commits', sha, base_url=self._api)
-        json = self._json(self._get(url), 200)
+        json = self._json_by_sha(sha, url)
         return self._instance_or_null(RepoCommit, json)
 
-    def commit_activity(self, number=-1, etag=None):
+    def commit_activity(self, number=-1, etag=None, columnar=False,
+                        backend=None):
         """Iterate over last year of commit activity by week.
 
         See: http://developer.github.com/v3/repos/statistics/
@@ -481,7 +526,9 @@ class Repository(GitHubCore):
         .. note:: All statistics methods may return a 202. On those occasions,
                   you will not receive any objects. You should store your
                   iterator and check the new ``last_status`` attribute. If it
-                  is a 202 you should wait before re-requesting.
+                  is a 202 you should wait before re-requesting, or use
+                  :func:`poll_statistics
+                  <github3.repos.stats.poll_statistics>`.
 
         .. versionadded:: 0.7
 
@@ -489,8 +536,16 @@ class Repository(GitHubCore):
             will return all of the weeks.
         :param str etag: (optional), ETag from a previous request to the same
             endpoint
+        :param bool columnar: (optional), return the weeks as
+            :class:`StatsColumns <github3.repos.stats.StatsColumns>`, see
+            :meth:`code_frequency`. Default: False
+        :param str backend: (optional), with ``columnar``, ``'numpy'`` or
+            ``'array'``
         :returns: generator of dictionaries
         """
+        if columnar:
+            return self._statistics_columns('commit_activity', number, etag,
+                                            backend)
         url = self._build_url('stats', 'commit_activity', base_url=self._api)
         return self._iter(int(number), url, dict, etag=etag)
 
@@ -552,7 +607,8 @@ class Repository(GitHubCore):
         json = self._json(self._get(url), 200)
         return self._instance_or_null(Comparison, json)
 
-    def contributor_statistics(self, number=-1, etag=None):
+    def contributor_statistics(self, number=-1, etag=None, columnar=False,
+                               backend=None):
         """Iterate over the contributors list.
 
         See also: http://developer.github.com/v3/repos/statistics/
@@ -560,7 +616,9 @@ class Repository(GitHubCore):
         .. note:: All statistics methods may return a 202. On those occasions,
                   you will not receive any objects. You should store your
                   iterator and check the new ``last_status`` attribute. If it
-                  is a 202 you should wait before re-requesting.
+                  is a 202 you should wait before re-requesting, or use
+                  :func:`poll_statistics
+                  <github3.repos.stats.poll_statistics>`.
 
         .. versionadded:: 0.7
 
@@ -568,9 +626,19 @@ class Repository(GitHubCore):
             will return all of the weeks.
         :param str etag: (optional), ETag from a previous request to the same
             endpoint
+        :param bool columnar: (optional), return the weeks of every
+            contributor as :class:`StatsColumns
+            <github3.repos.stats.StatsColumns>`, see :meth:`code_frequency`.
+            ``number`` then limits the number of contributors.
+            Default: False
+        :param str backend: (optional), with ``columnar``, ``'numpy'`` or
+            ``'array'``
         :returns: generator of
             :class:`ContributorStats <github3.repos.stats.ContributorStats>`
         """
+        if columnar:
+            return self._statistics_columns('contributor_statistics', number,
+                                            etag, backend)
         url = self._build_url('stats', 'contributors', base_url=self._api)
         return self._iter(int(number), url, ContributorStats, etag=etag)
 
@@ -726,7 +794,7 @@ class Repository(GitHubCore):
                     'committer': validate_commmitter(committer),
                     'author': validate_commmitter(author)}
             self._remove_none(data)
-            json = self._json(self._put(url, data=dumps(data)), 201)
+            json = self._json(self._put(url, data=self._dumps(data)), 201)
             if 'content' in json and 'commit' in json:
                 json['content'] = Contents(json['content'], self)
                 json['commit'] = Commit(json['commit'], self)
@@ -1097,7 +1165,7 @@ class Repository(GitHubCore):
         :rtype: list((str, :class:`~github3.repos.contents.Contents`))
         """
         url = self._build_url('contents', directory_path, base_url=self._api)
-        json = self._json(self._get(url, params={'ref': ref}), 200) or []
+        json = self._json_by_sha(ref, url, params={'ref': ref}) or []
         return return_as((j.get('name'), Contents(j, self)) for j in json)
 
     @requires_auth
@@ -1136,7 +1204,8 @@ class Repository(GitHubCore):
         self._remove_none(edit)
         json = None
         if edit:
-            json = self._json(self._patch(self._api, data=dumps(edit)), 200)
+            json = self._json(
+                self._patch(self._api, data=self._dumps(edit)), 200)
             self._update_attributes(json)
             return True
         return False
@@ -1164,7 +1233,7 @@ class Repository(GitHubCore):
         :rtype: :class:`~github3.repos.contents.Contents`
         """
         url = self._build_url('contents', path, base_url=self._api)
-        json = self._json(self._get(url, params={'ref': ref}), 200)
+        json = self._json_by_sha(ref, url, params={'ref': ref})
         return self._instance_or_null(Contents, json)
 
     def forks(self, sort='', number=-1, etag=None):
@@ -1194,7 +1263,7 @@ class Repository(GitHubCore):
         json = {}
         if sha:
             url = self._build_url('git', 'commits', sha, base_url=self._api)
-            json = self._json(self._get(url), 200)
+            json = self._json_by_sha(sha, url)
         return self._instance_or_null(Commit, json)
 
     @requires_auth
@@ -1235,7 +1304,8 @@ class Repository(GitHubCore):
         :returns: :class:`Subscription <github3.notifications.Subscription>`
         """
         url = self._build_url('subscription', base_url=self._api)
-        json = self._json(self._put(url, data=dumps({'ignored': True})), 200)
+        json = self._json(
+            self._put(url, data=self._dumps({'ignored': True})), 200)
         return self._instance_or_null(Subscription, json)
 
     def is_assignee(self, username):
@@ -1326,6 +1396,17 @@ class Repository(GitHubCore):
 
         return self._iter(int(number), url, Issue, params, etag)
 
+    def issues_by_number(self, numbers, workers=8):
+        """Retrieve many issues of this repository concurrently.
+
+        :param list numbers: (required), numbers of the issues
+        :param int workers: (optional), maximum number of concurrent
+            requests. Default: 8
+        :returns: list with, in the order requested, what :meth:`issue`
+            returned for each number or the exception it raised
+        """
+        return map_concurrently(self.issue, numbers, workers)
+
     @requires_auth
     def key(self, id_num):
         """Get the specified deploy key.
@@ -1413,7 +1494,7 @@ class Repository(GitHubCore):
         mark = {'read': True}
         if last_read:
             mark['last_read_at'] = last_read
-        return self._boolean(self._put(url, data=dumps(mark)),
+        return self._boolean(self._put(url, data=self._dumps(mark)),
                              205, 404)
 
     @requires_auth
@@ -1704,6 +1785,47 @@ class Repository(GitHubCore):
             url = self._build_url('statuses', sha, base_url=self._api)
         return self._iter(int(number), url, Status, etag=etag)
 
+    def stream_blob(self, sha, to=None, chunk_size=CHUNK_SIZE):
+        """Retrieve the raw content of a blob without encoding it.
+
+        Unlike :meth:`blob`, the content is requested with the
+        ``application/vnd.github.v3.raw`` media type and streamed, so it is
+        neither base64-encoded nor held in memory as a whole.
+
+        :param str sha: (required), sha of the blob
+        :param to: (optional), path or file-like object to write the
+            content to
+        :param int chunk_size: (optional), size in bytes of the chunks read.
+            Default: :data:`github3.utils.CHUNK_SIZE`
+        :returns: the name of the file written if ``to`` is given, an
+            iterator of ``bytes`` chunks otherwise, or ``None`` if the blob
+            does not exist
+        """
+        url = self._build_url('git', 'blobs', sha, base_url=self._api)
+        return self._stream_raw(url, to, chunk_size)
+
+    def stream_file(self, path, ref=None, to=None, chunk_size=CHUNK_SIZE):
+        """Retrieve the raw content of a file without encoding it.
+
+        Unlike :meth:`file_contents`, the content is requested with the
+        ``application/vnd.github.v3.raw`` media type and streamed, so it is
+        neither base64-encoded nor held in memory as a whole.
+
+        :param str path: (required), path to file, e.g.
+            github3/repos/repo.py
+        :param str ref: (optional), the string name of a commit/branch/tag.
+            Default: master
+        :param to: (optional), path or file-like object to write the
+            content to
+        :param int chunk_size: (optional), size in bytes of the chunks read.
+            Default: :data:`github3.utils.CHUNK_SIZE`
+        :returns: the name of the file written if ``to`` is given, an
+            iterator of ``bytes`` chunks otherwise, or ``None`` if the file
+            does not exist
+        """
+        url = self._build_url('contents', path, base_url=self._api)
+        return self._stream_raw(url, to, chunk_size, params={'ref': ref})
+
     @requires_auth
     def subscribe(self):
         """Subscribe the user to this repository's notifications.
@@ -1719,8 +1841,8 @@ class Repository(GitHubCore):
         :returns: :class:`Subscription <github3.notifications.Subscription>`
         """
         url = self._build_url('subscription', base_url=self._api)
-        json = self._json(self._put(url, data=dumps({'subcribed': True})),
-                          200)
+        json = self._json(
+            self._put(url, data=self._dumps({'subcribed': True})), 200)
         return self._instance_or_null(Subscription, json)
 
     def subscribers(self, number=-1, etag=None):
@@ -1756,7 +1878,7 @@ class Repository(GitHubCore):
         json = None
         if sha:
             url = self._build_url('git', 'tags', sha, base_url=self._api)
-            json = self._json(self._get(url), 200)
+            json = self._json_by_sha(sha, url)
         return self._instance_or_null(Tag, json)
 
     def tags(self, number=-1, etag=None):
@@ -1785,16 +1907,20 @@ class Repository(GitHubCore):
         url = self._build_url('teams', base_url=self._api)
         return self._iter(int(number), url, Team, etag=etag)
 
-    def tree(self, sha):
+    def tree(self, sha, compact=False):
         """Get a tree.
 
         :param str sha: (required), sha of the object for this tree
+        :param bool compact: (optional), build compact entries, see
+            :class:`Tree <github3.git.Tree>`. Default: False
         :returns: :class:`Tree <github3.git.Tree>`
         """
         json = None
         if sha:
             url = self._build_url('git', 'trees', sha, base_url=self._api)
-            json = self._json(self._get(url), 200)
+            json = self._json_by_sha(sha, url)
+        if compact and isinstance(json, dict):
+            return Tree(json, self, compact=True)
         return self._instance_or_null(Tree, json)
 
     @requires_auth
@@ -1813,13 +1939,14 @@ class Repository(GitHubCore):
             resp = upd(new_name, color) if new_name else upd(name, color)
         return resp
 
-    def weekly_commit_count(self):
+    def weekly_commit_count(self, columnar=False, backend=None):
         """Retrieve the total commit counts.
 
         .. note:: All statistics methods may return a 202. If github3.py
             receives a 202 in this case, it will return an emtpy dictionary.
             You should give the API a moment to compose the data and then re
-            -request it via this method.
+            -request it via this method, or use :func:`poll_statistics
+            <github3.repos.stats.poll_statistics>`.
 
         ..versionadded:: 0.7
 
@@ -1828,8 +1955,16 @@ class Repository(GitHubCore):
         includes the owner.) ``d['all'][0]`` will be the oldest week,
         ``d['all'][51]`` will be the most recent.
 
+        :param bool columnar: (optional), return the counts as
+            :class:`StatsColumns <github3.repos.stats.StatsColumns>`, or
+            ``None`` while GitHub computes them. Default: False
+        :param str backend: (optional), with ``columnar``, ``'numpy'`` or
+            ``'array'``
         :returns: dict
         """
+        if columnar:
+            return self._statistics_columns('weekly_commit_count',
+                                            backend=backend)
         url = self._build_url('stats', 'participation', base_url=self._api)
         resp = self._get(url)
         if resp.status_code == 202:
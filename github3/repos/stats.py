@@ -1,10 +1,41 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals
 
+import heapq
+import random
+import time
+
+from array import array
 from datetime import datetime
+from multiprocessing.pool import ThreadPool
 from ..models import GitHubCore
 from ..users import User
 
+try:
+    import numpy
+except ImportError:  # (No coverage)
+    numpy = None
+
+#: Statistics :func:`poll_statistics` can wait for, named after the methods
+#: of :class:`Repository <github3.repos.repo.Repository>`, with their
+#: endpoint
+STATISTICS = {
+    'contributor_statistics': 'contributors',
+    'code_frequency': 'code_frequency',
+    'commit_activity': 'commit_activity',
+    'weekly_commit_count': 'participation',
+}
+
+# Returned while GitHub is still computing the statistics
+_PENDING = object()
+
+try:
+    _TYPECODE = str('q')
+    array(_TYPECODE)
+except ValueError:  # (No coverage)
+    # Python 2 has no 64-bit typecode
+    _TYPECODE = str('l')
+
 
 def alternate_week(week):
     return {
@@ -31,12 +62,380 @@ class ContributorStats(GitHubCore):
         self.total = stats_object.get('total')
         #: List of weekly dictionaries.
         self.weeks = stats_object.get('weeks', [])
-        #: Alternative collection of weekly dictionaries
-        #: This provides a datetime object and easy to remember keys for each
-        #: element in the list.
-        #: 'w' -> 'start of week', 'a' -> 'Number of additions',
-        #: 'd' -> 'Number of deletions', 'c' -> 'Number of commits'
-        self.alt_weeks = [alternate_week(w) for w in self.weeks]
+        self._alt_weeks = None
 
     def _repr(self):
         return '<Contributor Statistics [{0}]>'.format(self.author)
+
+    @property
+    def alt_weeks(self):
+        """Alternative collection of weekly dictionaries
+
+        This provides a datetime object and easy to remember keys for each
+        element in the list.
+        'w' -> 'start of week', 'a' -> 'Number of additions',
+        'd' -> 'Number of deletions', 'c' -> 'Number of commits'
+
+        It is only built the first time it is read.
+        """
+        if self._alt_weeks is None:
+            self._alt_weeks = [alternate_week(w) for w in self.weeks]
+        return self._alt_weeks
+
+    def columns(self, backend=None):
+        """Return the weeks of this contributor as :class:`StatsColumns`.
+
+        :param str backend: (optional), ``'numpy'`` or ``'array'``, see
+            :class:`StatsColumns`
+        :returns: :class:`StatsColumns`
+        """
+        return StatsColumns.from_json('contributor_statistics', [
+            {'author': {'login': self.author.login}, 'weeks': self.weeks}
+        ], backend)
+
+
+def _statistics(repository, statistic, json, columnar=False, backend=None):
+    """Build the result returned by ``statistic`` from its JSON."""
+    if columnar:
+        return StatsColumns.from_json(statistic, json, backend)
+    if statistic == 'contributor_statistics':
+        return [ContributorStats(c, repository) for c in json or []]
+    if statistic == 'weekly_commit_count':
+        json = dict(json or {})
+        json.pop('ETag', None)
+        json.pop('Last-Modified', None)
+        return json
+    return list(json or [])
+
+
+def _fetch_statistics(repository, statistic, columnar=False, backend=None):
+    url = repository._build_url('stats', STATISTICS[statistic],
+                                base_url=repository._api)
+    response = repository._get(url)
+    if response is not None and response.status_code == 202:
+        return _PENDING
+    # Repositories without any commit answer with a 204
+    return _statistics(repository, statistic,
+                       repository._json(response, 200), columnar, backend)
+
+
+def _backoff(attempt, base_delay, max_delay):
+    """Exponential delay with jitter before the next poll."""
+    delay = min(max_delay, base_delay * 2 ** attempt)
+    return delay / 2.0 + random.uniform(0, delay / 2.0)
+
+
+def poll_statistics(repositories, statistic='contributor_statistics',
+                    workers=8, timeout=600, base_delay=1, max_delay=60,
+                    columnar=False, backend=None):
+    """Wait for the statistics of several repositories.
+
+    GitHub answers with a ``202 Accepted`` while it computes statistics
+    which are not cached yet. The statistics of every repository are first
+    requested concurrently, which starts their computation, then the
+    repositories answering with a ``202`` are polled again with an
+    exponential backoff and jitter until their statistics are ready.
+
+    ::
+
+        from github3.repos.stats import poll_statistics
+
+        repos = [g.repository('sigmavirus24', name) for name in names]
+        for (repo, stats) in poll_statistics(repos, 'code_frequency'):
+            print(repo, len(stats))
+
+    :param repositories: (required), the :class:`Repository
+        <github3.repos.repo.Repository>` objects
+    :param str statistic: (optional), name of the :class:`Repository
+        <github3.repos.repo.Repository>` method whose statistics are
+        retrieved, one of :data:`STATISTICS`.
+        Default: ``'contributor_statistics'``
+    :param int workers: (optional), maximum number of concurrent requests.
+        Default: 8
+    :param float timeout: (optional), seconds after which repositories still
+        computing their statistics are given up on. Default: 600
+    :param float base_delay: (optional), seconds before the first poll, the
+        delay doubles with every poll. Default: 1
+    :param float max_delay: (optional), longest delay in seconds between
+        two polls of a repository. Default: 60
+    :param bool columnar: (optional), return the statistics as
+        :class:`StatsColumns` built directly from the JSON. Default: False
+    :param str backend: (optional), with ``columnar``, ``'numpy'`` or
+        ``'array'``, see :class:`StatsColumns`
+    :returns: generator of ``(repository, statistics)`` tuples in the order
+        the statistics become ready. ``statistics`` is what the method named
+        ``statistic`` returns as a list (a dictionary for
+        ``weekly_commit_count``) or :class:`StatsColumns`, the exception
+        raised while retrieving them, or ``None`` when the ``timeout``
+        expired
+    """
+    if statistic not in STATISTICS:
+        raise ValueError('Unknown statistics: {0!r}'.format(statistic))
+    if columnar:
+        backend = _backend(backend)
+    repositories = list(repositories)
+    if not repositories:
+        return
+    deadline = time.time() + timeout
+    # (time of the next poll, number of polls, index of the repository)
+    queue = [(0, 0, i) for i in range(len(repositories))]
+
+    def poll(item):
+        (attempt, i) = item
+        try:
+            return item, _fetch_statistics(repositories[i], statistic,
+                                           columnar, backend)
+        except Exception as exc:
+            return item, exc
+
+    pool = ThreadPool(max(1, min(workers, len(repositories))))
+    try:
+        while queue:
+            now = time.time()
+            if queue[0][0] > now:
+                time.sleep(queue[0][0] - now)
+                continue
+            due = []
+            while queue and queue[0][0] <= now:
+                (_, attempt, i) = heapq.heappop(queue)
+                due.append((attempt, i))
+
+            for ((attempt, i), result) in pool.imap_unordered(poll, due):
+                if result is not _PENDING:
+                    yield repositories[i], result
+                    continue
+                when = time.time() + _backoff(attempt, base_delay, max_delay)
+                if when > deadline:
+                    yield repositories[i], None
+                else:
+                    heapq.heappush(queue, (when, attempt + 1, i))
+    finally:
+        pool.terminate()
+
+
+def _backend(backend=None):
+    """Return the name of the backend used to store columns."""
+    if backend is None:
+        return 'numpy' if numpy is not None else 'array'
+    if backend == 'array' or (backend == 'numpy' and numpy is not None):
+        return backend
+    raise ValueError('Unknown or unavailable backend: {0!r}'.format(backend))
+
+
+def _column(values, backend):
+    if backend == 'numpy':
+        if not isinstance(values, (numpy.ndarray, array, list)):
+            values = list(values)
+        return numpy.asarray(values, dtype=numpy.int64)
+    return array(_TYPECODE, values)
+
+
+class StatsColumns(object):
+
+    """Statistics stored column by column.
+
+    Every row holds the statistics of a week, and of a contributor for
+    :meth:`Repository.contributor_statistics
+    <github3.repos.repo.Repository.contributor_statistics>`. The columns are
+    NumPy arrays of 64-bit integers when NumPy is installed, or
+    :class:`array.array` objects otherwise, so that no object is built per
+    week. Statistics which GitHub does not return for an endpoint are zero.
+    The statistics methods of :class:`Repository
+    <github3.repos.repo.Repository>` return them when called with
+    ``columnar=True``::
+
+        columns = repository.code_frequency(columnar=True)
+
+    For :meth:`Repository.weekly_commit_count
+    <github3.repos.repo.Repository.weekly_commit_count>`, which has no
+    timestamps, ``weeks`` holds the index of the week, the oldest first, and
+    the contributors are ``'owner'`` and ``'others'``.
+
+    :param str backend: ``'numpy'`` or ``'array'``. Default: ``'numpy'``
+        when it is installed
+    """
+
+    __slots__ = ('weeks', 'additions', 'deletions', 'commits',
+                 'contributors', 'names', 'backend')
+
+    def __init__(self, weeks, additions, deletions, commits,
+                 contributors=None, names=None, backend=None):
+        backend = _backend(backend)
+        #: Start of every week, in seconds since the epoch
+        self.weeks = _column(weeks, backend)
+        #: Lines added
+        self.additions = _column(additions, backend)
+        #: Lines deleted, as a positive number
+        self.deletions = _column(deletions, backend)
+        #: Number of commits
+        self.commits = _column(commits, backend)
+        #: Index in :attr:`names` of the contributor of every row, or
+        #: ``None`` when the rows are not split by contributor
+        self.contributors = (_column(contributors, backend)
+                             if contributors is not None else None)
+        #: Login of the contributors
+        self.names = list(names or [])
+        #: ``'numpy'`` or ``'array'``
+        self.backend = backend
+
+    def __len__(self):
+        return len(self.weeks)
+
+    def __repr__(self):
+        return '<StatsColumns [{0} rows, {1}]>'.format(len(self),
+                                                       self.backend)
+
+    @classmethod
+    def from_json(cls, statistic, json, backend=None):
+        """Build the columns from the JSON returned by GitHub.
+
+        :param str statistic: (required), name of the method of
+            :class:`Repository <github3.repos.repo.Repository>` which
+            returned the JSON, see :data:`STATISTICS`
+        :param json: (required), decoded JSON
+        :param str backend: (optional), ``'numpy'`` or ``'array'``
+        :returns: :class:`StatsColumns`
+        """
+        if statistic == 'contributor_statistics':
+            json = json or []
+            names = [(c.get('author') or {}).get('login', '') for c in json]
+            columns = [[], [], [], [], []]
+            (weeks, additions, deletions, commits, contributors) = columns
+            for (i, contributor) in enumerate(json):
+                rows = contributor.get('weeks', [])
+                weeks.extend([w['w'] for w in rows])
+                additions.extend([w['a'] for w in rows])
+                deletions.extend([w['d'] for w in rows])
+                commits.extend([w['c'] for w in rows])
+                contributors.extend([i] * len(rows))
+            return cls(*columns, names=names, backend=backend)
+        if statistic == 'code_frequency':
+            json = json or []
+            return cls((r[0] for r in json), (r[1] for r in json),
+                       (-r[2] for r in json), (0 for _ in json),
+                       backend=backend)
+        if statistic == 'commit_activity':
+            json = json or []
+            return cls((w['week'] for w in json), (0 for _ in json),
+                       (0 for _ in json), (w['total'] for w in json),
+                       backend=backend)
+        if statistic == 'weekly_commit_count':
+            owner = list((json or {}).get('owner', []))
+            total = list((json or {}).get('all', []))
+            owner += [0] * (len(total) - len(owner))
+            n = len(total)
+            return cls(list(range(n)) * 2, [0] * n * 2, [0] * n * 2,
+                       owner + [t - o for (t, o) in zip(total, owner)],
+                       [0] * n + [1] * n, ['owner', 'others'], backend)
+        raise ValueError('Unknown statistics: {0!r}'.format(statistic))
+
+    def totals(self):
+        """Return the sum of every statistic.
+
+        :returns: dictionary with the ``additions``, ``deletions`` and
+            ``commits``
+        :rtype: dict
+        """
+        totals = {}
+        for name in ('additions', 'deletions', 'commits'):
+            column = getattr(self, name)
+            if self.backend == 'numpy':
+                totals[name] = int(column.sum())
+            else:
+                totals[name] = sum(column)
+        return totals
+
+    def by_week(self):
+        """Sum the statistics of every week, e.g., across contributors.
+
+        :returns: :class:`StatsColumns` with one row per week, sorted by
+            week
+        """
+        if self.backend == 'numpy':
+            weeks, inverse = numpy.unique(self.weeks, return_inverse=True)
+
+            def total(column):
+                return numpy.bincount(inverse, weights=column,
+                                      minlength=len(weeks)).astype(
+                                          numpy.int64)
+            return StatsColumns(weeks, total(self.additions),
+                                total(self.deletions), total(self.commits),
+                                backend='numpy')
+
+        sums = {}
+        for row in zip(self.weeks, self.additions, self.deletions,
+                       self.commits):
+            current = sums.get(row[0])
+            if current is None:
+                sums[row[0]] = list(row[1:])
+            else:
+                current[0] += row[1]
+                current[1] += row[2]
+                current[2] += row[3]
+        weeks = sorted(sums)
+        return StatsColumns(weeks, (sums[w][0] for w in weeks),
+                            (sums[w][1] for w in weeks),
+                            (sums[w][2] for w in weeks), backend='array')
+
+    def by_contributor(self):
+        """Sum the statistics of every contributor.
+
+        :returns: dictionary of the logins of the contributors to
+            dictionaries of their ``additions``, ``deletions`` and
+            ``commits``
+        :rtype: dict
+        """
+        if self.contributors is None:
+            return {}
+        columns = ('additions', 'deletions', 'commits')
+        if self.backend == 'numpy':
+            n = len(self.names)
+            sums = dict((name, numpy.bincount(
+                self.contributors, weights=getattr(self, name), minlength=n
+            ).astype(numpy.int64)) for name in columns)
+            return dict((login, dict((c, int(sums[c][i])) for c in columns))
+                        for (i, login) in enumerate(self.names))
+
+        totals = [[0, 0, 0] for _ in self.names]
+        for (i, a, d, c) in zip(self.contributors, self.additions,
+                                self.deletions, self.commits):
+            total = totals[i]
+            total[0] += a
+            total[1] += d
+            total[2] += c
+        return dict((login, dict(zip(columns, totals[i])))
+                    for (i, login) in enumerate(self.names))
+
+
+def combine(columns):
+    """Sum the statistics of several :class:`StatsColumns` by week.
+
+    The ``None`` and the exceptions :func:`poll_statistics` returns for the
+    repositories whose statistics could not be retrieved are skipped::
+
+        results = poll_statistics(repos, 'code_frequency', columnar=True)
+        organization = combine(stats for (_, stats) in results)
+
+    :param columns: (required), :class:`StatsColumns`, e.g., of several
+        repositories, which use the same backend
+    :returns: :class:`StatsColumns` with one row per week, sorted by week
+    """
+    columns = [c for c in columns if isinstance(c, StatsColumns)]
+    backends = set(c.backend for c in columns)
+    if len(backends) > 1:
+        raise ValueError('Cannot combine columns of different backends')
+    backend = backends.pop() if backends else _backend()
+
+    def concatenate(name):
+        parts = [getattr(c, name) for c in columns]
+        if backend == 'numpy':
+            return (numpy.concatenate(parts) if parts else
+                    numpy.zeros(0, dtype=numpy.int64))
+        result = array(_TYPECODE)
+        for part in parts:
+            result.extend(part)
+        return result
+
+    return StatsColumns(concatenate('weeks'), concatenate('additions'),
+                        concatenate('deletions'), concatenate('commits'),
+                        backend=backend).by_week()
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""
+github3.search.sharding
+=======================
+
+This module splits search queries whose results exceed the 1,000 GitHub
+returns for a single query into shards restricted to ranges of a qualifier.
+
+"""
+from __future__ import unicode_literals
+
+import re
+
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from logging import getLogger
+from multiprocessing.pool import ThreadPool
+
+from ..utils import map_concurrently
+from .code import CodeSearchResult
+from .issue import IssueSearchResult
+from .repository import RepositorySearchResult
+from .user import UserSearchResult
+
+__logs__ = getLogger(__package__)
+
+#: Largest number of results GitHub returns for a query
+SEARCH_LIMIT = 1000
+
+#: Oldest date used by default to shard on dates, before GitHub existed
+EPOCH = datetime(2007, 10, 1)
+
+#: Largest size used by default to shard on ``size:``
+MAX_SIZE = 2 ** 31
+
+# Search endpoint, result class and qualifiers which can be sharded on
+_kinds = {
+    'code': ('code', CodeSearchResult, ('size',)),
+    'issues': ('issues', IssueSearchResult, ('created', 'updated')),
+    'repositories': ('repositories', RepositorySearchResult,
+                     ('created', 'pushed', 'size')),
+    'users': ('users', UserSearchResult, ('created',)),
+}
+_dates = ('created', 'pushed', 'updated')
+_format = '%Y-%m-%dT%H:%M:%SZ'
+_second = timedelta(seconds=1)
+
+
+def _range(qualifier, low, high):
+    if qualifier in _dates:
+        return '{0}:{1}..{2}'.format(qualifier, low.strftime(_format),
+                                     high.strftime(_format))
+    return '{0}:{1}..{2}'.format(qualifier, low, high)
+
+
+def _split(qualifier, low, high):
+    """Return the two halves of a range or None if it cannot be split."""
+    if qualifier in _dates:
+        if high - low < _second:
+            return None
+        middle = low + timedelta(seconds=(high - low).total_seconds() // 2)
+        return (low, middle), (middle + _second, high)
+    if high <= low:
+        return None
+    middle = (low + high) // 2
+    return (low, middle), (middle + 1, high)
+
+
+def _bounds(qualifier, start, end):
+    if qualifier not in _dates:
+        return (0 if start is None else int(start),
+                MAX_SIZE if end is None else int(end))
+    bounds = []
+    for (value, default) in ((start, EPOCH), (end, datetime.utcnow())):
+        if value is None:
+            value = default
+        elif not isinstance(value, datetime) and isinstance(value, date):
+            value = datetime(value.year, value.month, value.day)
+        bounds.append(value.replace(microsecond=0, tzinfo=None))
+    return tuple(bounds)
+
+
+@contextmanager
+def _unpaced():
+    yield
+
+
+class ShardedSearch(object):
+
+    """Search with a query whose results may exceed :data:`SEARCH_LIMIT`.
+
+    The query is restricted to a range of ``qualifier`` (e.g.,
+    ``created:2008-01-01T00:00:00Z..2015-12-31T23:59:59Z``) and the
+    ``total_count`` of every range is requested. Ranges with more results
+    than GitHub returns are split in two until each fits, then the results
+    of every range are retrieved concurrently.
+
+    Splitting a query takes many requests and the search API only allows a
+    few of them per minute, so the requests wait for the search budget to
+    be reset once it is exhausted, see :meth:`RateLimitScheduler.waiting
+    <github3.ratelimit.RateLimitScheduler.waiting>`, whether or not the
+    :class:`RateLimitScheduler <github3.ratelimit.RateLimitScheduler>` of
+    the session waits otherwise. Its ``max_wait`` still applies.
+
+    Use :meth:`GitHub.search_sharded <github3.github.GitHub.search_sharded>`
+    rather than this class directly.
+    """
+
+    def __init__(self, github, kind, query, qualifier=None, start=None,
+                 end=None, workers=4, text_match=False):
+        if kind not in _kinds:
+            raise ValueError('Unknown kind of search: {0!r}'.format(kind))
+        (path, self.cls, qualifiers) = _kinds[kind]
+        if qualifier is None:
+            qualifier = qualifiers[0]
+        if qualifier not in qualifiers:
+            raise ValueError('Cannot shard {0} searches on {1!r}'.format(
+                kind, qualifier))
+        if re.search(r'(^|\s){0}:'.format(qualifier), query):
+            raise ValueError('The query already restricts {0}'.format(
+                qualifier))
+        self.github = github
+        self.url = github._build_url('search', path)
+        self.query = query
+        self.qualifier = qualifier
+        self.bounds = _bounds(qualifier, start, end)
+        self.workers = workers
+        self.headers = {}
+        if text_match:
+            self.headers = {
+                'Accept': 'application/vnd.github.v3.full.text-match+json'
+            }
+        #: ``(query, total_count)`` of every shard, once :meth:`shards`
+        #: was called
+        self.shard_counts = None
+
+    def __repr__(self):
+        return '<ShardedSearch [{0!r} on {1}]>'.format(self.query,
+                                                       self.qualifier)
+
+    def _query(self, low, high):
+        return '{0} {1}'.format(self.query, _range(self.qualifier, low, high))
+
+    def _paced(self):
+        session = getattr(self.github, 'session', None)
+        scheduler = getattr(session, 'ratelimit', None)
+        if scheduler is None:
+            return _unpaced()
+        return scheduler.waiting('search')
+
+    def _count(self, bounds):
+        params = {'q': self._query(*bounds), 'per_page': 1}
+        with self._paced():
+            json = self.github._json(self.github._get(
+                self.url, params=params, headers=self.headers), 200)
+        return (json or {}).get('total_count', 0)
+
+    def shards(self):
+        """Split the query until every shard fits under the limit.
+
+        :returns: the queries of the shards with their ``total_count``
+        :rtype: list
+        """
+        shards = []
+        level = [self.bounds]
+        while level:
+            counts = map_concurrently(self._count, level, self.workers)
+            next_level = []
+            for (bounds, count) in zip(level, counts):
+                if isinstance(count, Exception):
+                    raise count
+                if count == 0:
+                    continue
+                halves = None
+                if count > SEARCH_LIMIT:
+                    halves = _split(self.qualifier, *bounds)
+                    if halves is None:
+                        __logs__.warning('%s has %d results but cannot be '
+                                         'split further', self._query(
+                                             *bounds), count)
+                if halves is None:
+                    shards.append((self._query(*bounds), count))
+                else:
+                    next_level.extend(halves)
+            level = next_level
+        self.shard_counts = shards
+        return shards
+
+    def _search(self, query):
+        iterator = self.github._search_iter(
+            -1, self.url, self.cls, {'q': query, 'per_page': 100}, None,
+            self.headers)
+        with self._paced():
+            return list(iterator)
+
+    def __iter__(self):
+        shards = [query for (query, _) in self.shards()]
+        if not shards:
+            return
+        seen = set()
+        pool = ThreadPool(max(1, min(self.workers, len(shards))))
+        try:
+            for results in pool.imap_unordered(self._search, shards):
+                for result in results:
+                    data = result.as_dict()
+                    key = data.get('url') or data.get('html_url')
+                    if key is not None:
+                        if key in seen:
+                            continue
+                        seen.add(key)
+                    yield result
+        finally:
+            pool.terminate()
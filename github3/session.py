@@ -1,13 +1,25 @@
 # -*- coding: utf-8 -*-
+import time
+
 import requests
 
 from collections import Callable
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.util.retry import Retry
+from requests.structures import CaseInsensitiveDict
 from . import __version__
+from .cache import cache_key
+from .codec import get_codec
+from .ratelimit import RateLimitScheduler
 from logging import getLogger
 from contextlib import contextmanager
 
 __url_cache__ = {}
 __logs__ = getLogger(__package__)
+__entity_headers__ = frozenset(['content-length', 'content-type',
+                                'content-encoding', 'transfer-encoding'])
+#: Status codes of the server errors retried when ``max_retries`` is set
+__retry_statuses__ = frozenset([500, 502, 503, 504])
 
 
 def requires_2fa(response):
@@ -17,11 +29,100 @@ def requires_2fa(response):
     return False
 
 
+def build_adapter(pool_connections=10, pool_maxsize=10, max_retries=0,
+                  backoff_factor=0, pool_block=False):
+    """Build an adapter with its own connection pool and retry policy.
+
+    Only idempotent requests (``GET``, ``HEAD``, ``PUT``, ``DELETE``,
+    ``OPTIONS``, ``TRACE``) are retried, after connection errors and
+    server errors alike. The response of the last attempt is returned
+    instead of raising once the retries are exhausted.
+
+    :param int pool_connections: (optional), number of hosts whose
+        connections are kept. Default: 10
+    :param int pool_maxsize: (optional), number of connections kept for
+        each host, i.e., how many threads can send requests at once without
+        opening throw-away connections. Default: 10
+    :param int max_retries: (optional), number of times an idempotent
+        request is retried. Default: 0
+    :param float backoff_factor: (optional), the n-th retry sleeps for
+        ``backoff_factor * 2 ** (n - 1)`` seconds. Default: 0
+    :param bool pool_block: (optional), wait for a connection to be free
+        instead of opening one that is discarded after use once the pool is
+        full. Default: False
+    :returns: :class:`requests.adapters.HTTPAdapter`
+    """
+    retries = max_retries
+    if max_retries:
+        retries = Retry(total=max_retries, backoff_factor=backoff_factor,
+                        status_forcelist=__retry_statuses__,
+                        raise_on_status=False)
+    return HTTPAdapter(pool_connections=pool_connections,
+                       pool_maxsize=pool_maxsize, max_retries=retries,
+                       pool_block=pool_block)
+
+
+def response_from_cache(entry, not_modified):
+    """Build a 200 response from a cache entry and a 304 response.
+
+    The headers of the ``304`` (e.g., the rate limit headers) take precedence
+    over the stored ones.
+    """
+    response = requests.Response()
+    response.status_code = 200
+    response.reason = 'OK'
+    response.headers = CaseInsensitiveDict(entry['headers'])
+    for (name, value) in not_modified.headers.items():
+        if name.lower() not in __entity_headers__:
+            response.headers[name] = value
+    response.encoding = entry.get('encoding')
+    response._content = entry['content']
+    response._content_consumed = True
+    response.url = not_modified.url
+    response.request = not_modified.request
+    response.connection = getattr(not_modified, 'connection', None)
+    response.elapsed = not_modified.elapsed
+    response.from_cache = True
+    return response
+
+
 class GitHubSession(requests.Session):
-    auth = None
-    __attrs__ = requests.Session.__attrs__ + ['base_url', 'two_factor_auth_cb']
 
-    def __init__(self):
+    """The session used to send every request to the API.
+
+    :param cache: (optional), response cache, see :mod:`github3.cache`
+    :param object_cache: (optional), :class:`ObjectCache
+        <github3.cache.ObjectCache>` serving the objects addressed by a SHA
+    :param int pool_connections: (optional), number of hosts whose
+        connections are kept. Default: 10
+    :param int pool_maxsize: (optional), number of connections kept for
+        each host. Default: 10
+    :param int max_retries: (optional), number of times idempotent requests
+        are retried. Default: 0
+    :param float backoff_factor: (optional), factor of the exponential
+        delay between retries. Default: 0
+    :param bool pool_block: (optional), wait for a free connection once the
+        pool is full. Default: False
+    :param codec: (optional), name of the JSON codec or codec instance used
+        for every response and request body, see :func:`get_codec
+        <github3.codec.get_codec>`. Default: the fastest one installed
+    :param dict hosts: (optional), mapping of URL prefixes, e.g.,
+        ``'https://uploads.github.com'``, to the pooling options of their
+        own adapter, see :meth:`mount_host`. The options left out are those
+        of the session.
+
+    See :func:`build_adapter` for the details of the pooling options.
+    """
+
+    auth = None
+    cache = None
+    object_cache = None
+    __attrs__ = requests.Session.__attrs__ + ['base_url', 'two_factor_auth_cb',
+                                              'ratelimit', 'codec']
+
+    def __init__(self, cache=None, pool_connections=10, pool_maxsize=10,
+                 max_retries=0, backoff_factor=0, pool_block=False,
+                 codec=None, object_cache=None, hosts=None):
         super(GitHubSession, self).__init__()
         self.headers.update({
             # Only accept JSON responses
@@ -36,6 +137,69 @@ class GitHubSession(requests.Session):
         self.base_url = 'https://api.github.com'
         self.two_factor_auth_cb = None
         self.request_counter = 0
+        #: Response cache used to revalidate GET requests, see
+        #: :mod:`github3.cache`
+        self.cache = cache
+        #: :class:`ObjectCache <github3.cache.ObjectCache>` serving blobs,
+        #: trees, commits and tags addressed by a SHA without any request
+        self.object_cache = object_cache
+        #: :class:`RateLimitScheduler <github3.ratelimit.RateLimitScheduler>`
+        #: tracking the rate limit and pacing requests
+        self.ratelimit = RateLimitScheduler()
+        #: :class:`JSONCodec <github3.codec.JSONCodec>` decoding the
+        #: responses and encoding the bodies of the requests
+        self.codec = get_codec(codec)
+        self._init_hooks()
+        for prefix in ('https://', 'http://'):
+            self.mount_host(prefix, pool_connections, pool_maxsize,
+                            max_retries, backoff_factor, pool_block)
+        for (prefix, options) in (hosts or {}).items():
+            options = dict({
+                'pool_connections': pool_connections,
+                'pool_maxsize': pool_maxsize,
+                'max_retries': max_retries,
+                'backoff_factor': backoff_factor,
+                'pool_block': pool_block,
+            }, **options)
+            self.mount_host(prefix, **options)
+
+    def __setstate__(self, state):
+        super(GitHubSession, self).__setstate__(state)
+        # Callbacks are not pickled
+        self._init_hooks()
+
+    def _init_hooks(self):
+        #: Callbacks called with every :class:`requests.PreparedRequest`
+        #: before it is sent
+        self.on_request = []
+        #: Callbacks called with every :class:`requests.Response`, including
+        #: those answered from the :attr:`cache`
+        self.on_response = []
+        #: Callbacks called with the response, the number of the retry and
+        #: the delay in seconds when a request is retried because of the
+        #: rate limit
+        self.on_retry = []
+
+    def instrument(self, observer):
+        """Register the ``on_request``, ``on_response`` and ``on_retry``
+        methods of ``observer`` as callbacks of this session.
+
+        :param observer: e.g., a :class:`MetricsCollector
+            <github3.metrics.MetricsCollector>`
+        """
+        for event in ('on_request', 'on_response', 'on_retry'):
+            callback = getattr(observer, event, None)
+            if callback is not None:
+                getattr(self, event).append(callback)
+
+    def dispatch(self, event, *args):
+        """Call the callbacks registered for ``event`` with ``args``.
+
+        :param str event: ``'on_request'``, ``'on_response'`` or
+            ``'on_retry'``
+        """
+        for callback in getattr(self, event):
+            callback(*args)
 
     def basic_auth(self, username, password):
         """Set the Basic Auth credentials on this Session.
@@ -74,6 +238,22 @@ class GitHubSession(requests.Session):
     def has_auth(self):
         return (self.auth or self.headers.get('Authorization'))
 
+    def mount_host(self, url, pool_connections=10, pool_maxsize=10,
+                   max_retries=0, backoff_factor=0, pool_block=False):
+        """Send the requests to ``url`` through a dedicated adapter.
+
+        The requests whose URL starts with ``url`` (e.g.,
+        ``'https://uploads.github.com'``) get their own connection pool and
+        retry policy. The parameters are those of :func:`build_adapter`.
+
+        :param str url: (required), prefix of the URLs served by the adapter
+        :returns: the mounted :class:`requests.adapters.HTTPAdapter`
+        """
+        adapter = build_adapter(pool_connections, pool_maxsize, max_retries,
+                                backoff_factor, pool_block)
+        self.mount(url, adapter)
+        return adapter
+
     def oauth2_auth(self, client_id, client_secret):
         """Use OAuth2 for authentication.
 
@@ -85,16 +265,88 @@ class GitHubSession(requests.Session):
         raise NotImplementedError('These features are not implemented yet')
 
     def request(self, *args, **kwargs):
-        response = super(GitHubSession, self).request(*args, **kwargs)
-        self.request_counter += 1
-        if requires_2fa(response) and self.two_factor_auth_cb:
-            # No need to flatten and re-collect the args in
-            # handle_two_factor_auth
-            new_response = self.handle_two_factor_auth(args, kwargs)
-            new_response.history.append(response)
-            response = new_response
+        url = args[1] if len(args) > 1 else kwargs.get('url', '')
+        # File-like bodies cannot be sent a second time
+        retriable = not hasattr(kwargs.get('data'), 'read')
+        attempt = 0
+        while True:
+            self.sleep(self.ratelimit.delay(url))
+            response = super(GitHubSession, self).request(*args, **kwargs)
+            self.request_counter += 1
+            if requires_2fa(response) and self.two_factor_auth_cb:
+                # No need to flatten and re-collect the args in
+                # handle_two_factor_auth
+                new_response = self.handle_two_factor_auth(args, kwargs)
+                new_response.history.append(response)
+                response = new_response
+            self.ratelimit.update(response)
+
+            wait = self.ratelimit.retry_after(response, attempt)
+            if wait is None or not retriable:
+                return response
+            attempt += 1
+            self.dispatch('on_retry', response, attempt, wait)
+            __logs__.info('Rate limited by GitHub, retrying %s in %d seconds',
+                          url, wait)
+            self.sleep(wait)
+
+    def send(self, request, **kwargs):
+        """Send a prepared request, revalidating it against the cache.
+
+        When a :attr:`cache` is configured, ``GET`` requests are sent with
+        the ``If-None-Match``/``If-Modified-Since`` headers of the stored
+        response and a ``304 Not Modified`` is answered from the cache.
+        Requests that already carry conditional headers or that are
+        streamed bypass the cache.
+
+        The :attr:`on_request` and :attr:`on_response` callbacks are called
+        around every request sent.
+        """
+        self.dispatch('on_request', request)
+        response = self._send(request, **kwargs)
+        self.dispatch('on_response', response)
+        return response
+
+    def _send(self, request, **kwargs):
+        cache = self.cache
+        if (cache is None or request.method != 'GET' or
+                kwargs.get('stream') or
+                'If-None-Match' in request.headers or
+                'If-Modified-Since' in request.headers):
+            return super(GitHubSession, self).send(request, **kwargs)
+
+        key = cache_key(request.method, request.url, request.headers)
+        entry = cache.get(key)
+        if entry is not None:
+            if entry.get('etag'):
+                request.headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                request.headers['If-Modified-Since'] = entry['last_modified']
+
+        response = super(GitHubSession, self).send(request, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            __logs__.info('Serving %s from the cache', request.url)
+            return response_from_cache(entry, response)
+
+        if response.status_code == 200:
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified:
+                cache.set(key, {
+                    'etag': etag,
+                    'last_modified': last_modified,
+                    'headers': dict(response.headers),
+                    'encoding': response.encoding,
+                    'content': response.content,
+                })
         return response
 
+    def sleep(self, seconds):
+        """Block for ``seconds`` while the rate limit scheduler waits."""
+        if seconds > 0:
+            time.sleep(seconds)
+
     def retrieve_client_credentials(self):
         """Return the client credentials.
 
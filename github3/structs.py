@@ -1,17 +1,238 @@
 # -*- coding: utf-8 -*-
+import codecs
 import collections
 import functools
+import importlib
+import json as jsonlib
+import os
+import re
 
+from multiprocessing.pool import ThreadPool
 from requests.compat import urlparse, urlencode
 
 from . import exceptions
 from . import models
+from .cache import cache_key
+from .session import response_from_cache
+
+try:
+    from urllib.parse import parse_qsl, urlunparse
+except ImportError:  # (No coverage)
+    from urlparse import parse_qsl, urlunparse
+
+
+def page_url(url, page):
+    """Return ``url`` with its ``page`` query parameter set to ``page``."""
+    parsed = urlparse(url)
+    query = [(k, v) for (k, v) in parse_qsl(parsed.query) if k != 'page']
+    query.append(('page', str(page)))
+    return urlunparse(parsed._replace(query=urlencode(query)))
+
+
+def url_key(url):
+    """Return a representation of ``url`` independent of query ordering."""
+    parsed = urlparse(url)
+    return (parsed.scheme, parsed.netloc, parsed.path,
+            tuple(sorted(parse_qsl(parsed.query))))
+
+
+def page_key(url, params=None, headers=None):
+    """Compute the key under which a page is stored in a page store.
+
+    :param str url: URL of the page
+    :param dict params: (optional), query string parameters sent with it
+    :param dict headers: (optional), headers of the request, only the
+        ``Accept`` and ``Authorization`` headers are part of the key
+    :returns: hex digest identifying the page
+    :rtype: str
+    """
+    (scheme, netloc, path, query) = url_key(url)
+    query = sorted(set(query) | set(
+        (k, str(v)) for (k, v) in (params or {}).items() if v is not None
+    ))
+    url = urlunparse((scheme, netloc, path, '', urlencode(query), ''))
+    return cache_key('GET', url, headers or {})
+
+
+def page_number(url):
+    """Return the value of the ``page`` query parameter of ``url``."""
+    for (k, v) in parse_qsl(urlparse(url).query):
+        if k == 'page' and v.isdigit():
+            return int(v)
+    return None
+
+
+#: Version of the format of :meth:`GitHubIterator.checkpoint`
+CHECKPOINT_VERSION = 1
+
+_replace = getattr(os, 'replace', os.rename)
+
+
+def _class_path(cls):
+    name = getattr(cls, '__name__', '<lambda>')
+    if name == '<lambda>':
+        return None
+    return '{0}.{1}'.format(cls.__module__, name)
+
+
+def _import_class(path):
+    (module, name) = path.rsplit('.', 1)
+    return getattr(importlib.import_module(module), name)
+
+
+_special_characters = re.compile(r'["\[\]{},:]')
+_string_end = re.compile(r'["\\]')
+
+
+class JSONItemScanner(object):
+
+    """Split a JSON document into the items of one of its arrays as the
+    document is received.
+
+    Text is passed to :meth:`feed` in chunks of any size, which returns the
+    items completed by that chunk. Only the text of the item being received
+    is buffered.
+
+    :param str key: (optional), name of the member of the top-level object
+        holding the array, e.g., ``'items'`` for search results. By default
+        the document is expected to be an array.
+    :param loads: (optional), function decoding the text of an item, e.g.,
+        the ``loads`` method of the :attr:`codec
+        <github3.session.GitHubSession.codec>` of a session.
+        Default: :func:`json.loads`
+    """
+
+    def __init__(self, key=None, loads=None):
+        self.key = key
+        self.loads = loads or jsonlib.loads
+        #: Members of the top-level object preceding the array, e.g.,
+        #: ``total_count`` for search results
+        self.members = {}
+        #: ``True`` once the document turned out not to have the expected
+        #: shape, in which case it is buffered in its entirety and decoded
+        #: by :meth:`document`
+        self.fallback = False
+        self._buffer = ''
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._string_start = None
+        self._last_string = None
+        self._current_key = None
+        self._in_array = False
+        self._item_start = None
+        self._done = False
+
+    def feed(self, text):
+        """Scan ``text`` and return the items it completed.
+
+        :param str text: next chunk of the document
+        :returns: list of decoded items
+        """
+        if self._done:
+            return []
+        self._buffer += text
+        if self.fallback:
+            return []
+        items = []
+        buf, pos = self._buffer, self._pos
+        target = 2 if self.key else 1
+        while True:
+            if self._in_string:
+                match = _string_end.search(buf, pos)
+                if match is None:
+                    pos = len(buf)
+                    break
+                if match.group() == '\\':
+                    if match.end() >= len(buf):
+                        # The escaped character has not been received
+                        pos = match.start()
+                        break
+                    pos = match.end() + 1
+                    continue
+                self._in_string = False
+                pos = match.end()
+                if self._string_start is not None:
+                    self._last_string = buf[self._string_start + 1:pos - 1]
+                    self._string_start = None
+                continue
+
+            match = _special_characters.search(buf, pos)
+            if match is None:
+                pos = len(buf)
+                break
+            char, i, pos = match.group(), match.start(), match.end()
+
+            if self._depth == 0 and char != ('{' if self.key else '['):
+                self.fallback = True
+                return items
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1 and self.key:
+                    self._string_start = i
+            elif char == ':':
+                if self._depth == 1:
+                    self._current_key = self._last_string
+            elif char in '[{':
+                self._depth += 1
+                if (self._depth == target and char == '[' and
+                        (not self.key or self._current_key == self.key)):
+                    if self.key:
+                        self.members = self.loads(buf[:i] + 'null}')
+                        self.members.pop(self.key, None)
+                    self._in_array = True
+                    self._item_start = pos
+            elif char in ']}':
+                if self._in_array and self._depth == target:
+                    items.extend(self._item(buf, i))
+                    self._in_array = False
+                    self._done = True
+                    break
+                self._depth -= 1
+            elif char == ',' and self._in_array and self._depth == target:
+                items.extend(self._item(buf, i))
+                self._item_start = pos
+
+        if self._done:
+            self._buffer, self._pos = '', 0
+        elif self._in_array:
+            # Release the text of the items already decoded
+            start = self._item_start
+            self._buffer, self._pos = buf[start:], pos - start
+            self._item_start = 0
+        else:
+            self._pos = pos
+        return items
+
+    def _item(self, buf, end):
+        text = buf[self._item_start:end].strip()
+        return [self.loads(text)] if text else []
+
+    def document(self):
+        """Decode the whole document when it did not have the expected shape.
+        """
+        return self.loads(self._buffer)
 
 
 class GitHubIterator(models.GitHubCore, collections.Iterator):
-    """The :class:`GitHubIterator` class powers all of the iter_* methods."""
+    """The :class:`GitHubIterator` class powers all of the iter_* methods.
+
+    Collections walked repeatedly can be given a :attr:`page_store`, e.g., a
+    :class:`MemoryCache <github3.cache.MemoryCache>` or a :class:`SQLiteCache
+    <github3.cache.SQLiteCache>` shared by successive walks. Every page is
+    then requested with the ``ETag`` it had the last time it was seen and
+    the pages GitHub reports as not modified, which do not count against
+    the rate limit, are served from the store::
+
+        store = MemoryCache(maxsize=500)
+        members = org.members()
+        members.page_store = store
+        list(members)
+        # ... later
+        list(members.refresh())
+    """
     def __init__(self, count, url, cls, session, params=None, etag=None,
-                 headers=None):
+                 headers=None, prefetch=0, page_store=None):
         models.GitHubCore.__init__(self, {}, session)
         #: Original number of items requested
         self.original = count
@@ -39,6 +260,35 @@ class GitHubIterator(models.GitHubCore, collections.Iterator):
         self.last_response = None
         #: Last status code received
         self.last_status = 0
+        #: Number of pages to request in the background while the current
+        #: page is being consumed. ``0`` disables prefetching.
+        self.prefetch = prefetch
+        #: Build the items lazily, i.e., only decode their attributes when
+        #: one of them is first read
+        self.lazy = False
+        #: Decode the items as the pages are received instead of reading
+        #: whole pages first, so that memory use does not depend on the
+        #: size of the pages. Prefetching is disabled in this mode.
+        self.stream = False
+        #: :class:`BaseCache <github3.cache.BaseCache>` holding the ``ETag``
+        #: and body of every page, used to revalidate the pages instead of
+        #: downloading them again. Streamed pages are revalidated but not
+        #: stored. ``None`` disables it.
+        self.page_store = page_store
+        #: Number of pages served from the :attr:`page_store` because they
+        #: were not modified during the last walk
+        self.pages_not_modified = 0
+        #: Path of the file a :meth:`checkpoint` is saved to as the pages
+        #: are completed. ``None`` disables it.
+        self.checkpoint_path = None
+        #: Number of pages completed between two checkpoints
+        self.checkpoint_every = 1
+        # Items of the current page already returned
+        self._offset = 0
+        # Pages completed since the iteration started
+        self._pages = 0
+        # Whether the cursor was restored from a checkpoint
+        self._restored = False
 
         if etag:
             self.headers.update({'If-None-Match': etag})
@@ -49,56 +299,343 @@ class GitHubIterator(models.GitHubCore, collections.Iterator):
         return '<GitHubIterator [{0}, {1}]>'.format(self.count, self.path)
 
     def __iter__(self):
-        self.last_url, params = self.url, self.params
-        headers = self.headers
+        params, headers, cls = self._start()
+
+        if self.stream:
+            for item in self._iter_streamed(params, headers, cls):
+                yield item
+            return
+
+        pool = ThreadPool(self.prefetch) if self.prefetch > 0 else None
+        # (url_key, AsyncResult) pairs of the pages requested in the
+        # background, in page order
+        pending = collections.deque()
+
+        try:
+            while (self.count == -1 or self.count > 0) and self.last_url:
+                if pending and pending[0][0] == url_key(self.last_url):
+                    response = pending.popleft()[1].get()
+                else:
+                    pending.clear()
+                    response = self._get_page(self.last_url, params=params,
+                                              headers=headers)
+                params = None  # rel_next already has the params
+
+                json = self._handle_page(response)
+
+                if json is None:
+                    break
+
+                if pool is not None and isinstance(json, list):
+                    self._prefetch_pages(pool, pending, response, len(json),
+                                         headers)
+
+                for item in self._iter_page(json, cls):
+                    yield item
+
+                rel_next = response.links.get('next', {})
+                self._next_page(rel_next.get('url', ''))
+        finally:
+            if pool is not None:
+                pool.terminate()
 
-        if 0 < self.count <= 100 and self.count != -1:
-            params['per_page'] = self.count
+    def _start(self):
+        """Reset the cursor and return the params, headers and item factory.
 
-        if 'per_page' not in params and self.count == -1:
-            params['per_page'] = 100
+        :returns: tuple(params, headers, cls)
+        """
+        self.pages_not_modified = 0
+        self._pages = 0
+        if self._restored:
+            # Resume from the cursor of a checkpoint, the pages following
+            # the first one already have the params
+            self._restored = False
+            params = self.params if self.last_url == self.url else None
+        else:
+            self.last_url, params = self.url, self.params
+            self._offset = 0
+
+            if 0 < self.count <= 100 and self.count != -1:
+                params['per_page'] = self.count
+
+            if 'per_page' not in params and self.count == -1:
+                params['per_page'] = 100
 
         cls = self.cls
         if issubclass(self.cls, models.GitHubCore):
-            cls = functools.partial(self.cls, session=self)
+            cls = functools.partial(self.cls, session=self, lazy=self.lazy)
+        elif self.lazy and issubclass(self.cls, models.GitHubObject):
+            cls = functools.partial(self.cls, lazy=True)
 
-        while (self.count == -1 or self.count > 0) and self.last_url:
-            response = self._get(self.last_url, params=params,
-                                 headers=headers)
-            self.last_response = response
-            self.last_status = response.status_code
-            if params:
-                params = None  # rel_next already has the params
+        return params, self.headers, cls
 
-            if not self.etag and response.headers.get('ETag'):
-                self.etag = response.headers.get('ETag')
+    def _iter_page(self, json, cls):
+        """Yield the items of a page, skipping those yielded before the
+        checkpoint the iterator was restored from.
+        """
+        skip = self._offset
+        for (index, i) in enumerate(json):
+            if index < skip:
+                continue
+            item = cls(i)
+            # Account for the item before yielding it so that a checkpoint
+            # taken while it is processed does not yield it again
+            self._offset = index + 1
+            self.count -= 1 if self.count > 0 else 0
+            yield item
+            if self.count == 0:
+                break
 
-            json = self._get_json(response)
+    def _next_page(self, url):
+        """Move the cursor to ``url`` and save a checkpoint if one is due."""
+        self.last_url, self._offset = url, 0
+        self._pages += 1
+        if self.checkpoint_path and (
+                not url or self.count == 0 or
+                self._pages % max(1, self.checkpoint_every) == 0):
+            self.save_checkpoint(self.checkpoint_path)
 
-            if json is None:
-                break
+    def checkpoint(self):
+        """Return the position of the iterator as a JSON serializable dict.
 
-            # languages returns a single dict. We want the items.
-            if isinstance(json, dict):
-                if issubclass(self.cls, models.GitHubObject):
-                    raise exceptions.UnprocessableResponseBody(
-                        "GitHub's API returned a body that could not be"
-                        " handled", json
-                    )
-                if json.get('ETag'):
-                    del json['ETag']
-                if json.get('Last-Modified'):
-                    del json['Last-Modified']
-                json = json.items()
-
-            for i in json:
-                yield cls(i)
-                self.count -= 1 if self.count > 0 else 0
-                if self.count == 0:
-                    break
+        The checkpoint holds the URL of the current page, the number of its
+        items already returned, the number of items left, the query params,
+        the headers and the ``ETag``. The iterator is restored with
+        :meth:`from_checkpoint`.
+
+        :rtype: dict
+        """
+        return {
+            'version': CHECKPOINT_VERSION,
+            'url': self.url,
+            'last_url': self.last_url,
+            'offset': self._offset,
+            'original': self.original,
+            'count': self.count,
+            'params': dict(self.params),
+            'headers': dict(self.headers),
+            'etag': self.etag,
+            'cls': _class_path(self.cls),
+        }
+
+    def save_checkpoint(self, path):
+        """Write :meth:`checkpoint` to the file at ``path``.
+
+        The file is replaced atomically so that it is never left half
+        written if the process dies.
+
+        :param str path: path of the checkpoint file
+        """
+        tmp = '{0}.tmp'.format(path)
+        with open(tmp, 'w') as fd:
+            jsonlib.dump(self.checkpoint(), fd)
+        _replace(tmp, path)
+
+    @classmethod
+    def from_checkpoint(cls, checkpoint, session, item_class=None):
+        """Restore an iterator from a checkpoint.
+
+        Iterating over the restored iterator continues with the first item
+        that had not been returned when the checkpoint was taken.
+
+        :param checkpoint: dict returned by :meth:`checkpoint` or path of a
+            file written by :meth:`save_checkpoint`
+        :param session: :class:`GitHub <github3.github.GitHub>` instance or
+            session used to request the pages
+        :param item_class: (optional), class of the items, by default the
+            one recorded in the checkpoint is imported
+        :returns: the iterator
+        :raises ValueError: if the checkpoint has an unknown version or the
+            class of the items is needed but was not recorded
+        """
+        if not isinstance(checkpoint, dict):
+            with open(checkpoint) as fd:
+                checkpoint = jsonlib.load(fd)
+        if checkpoint.get('version') != CHECKPOINT_VERSION:
+            raise ValueError('Unknown checkpoint version: {0!r}'.format(
+                checkpoint.get('version')))
+        if item_class is None:
+            if not checkpoint.get('cls'):
+                raise ValueError('The class of the items must be given')
+            item_class = _import_class(checkpoint['cls'])
+
+        iterator = cls(checkpoint['original'], checkpoint['url'], item_class,
+                       session, checkpoint['params'],
+                       headers=checkpoint['headers'])
+        iterator.count = checkpoint['count']
+        iterator.etag = checkpoint['etag']
+        if checkpoint['last_url'] is not None:
+            # Otherwise the iteration had not started
+            iterator.last_url = checkpoint['last_url']
+            iterator._offset = checkpoint['offset']
+            iterator._restored = True
+        return iterator
+
+    def _get_page(self, url, params=None, headers=None, stream=False):
+        """Request a page, revalidating it against the :attr:`page_store`.
+
+        :returns: the response, rebuilt from the store when GitHub answered
+            ``304 Not Modified``
+        """
+        (headers, key, entry) = self._revalidation(url, params, headers)
+        if stream:
+            response = self._get(url, params=params, headers=headers,
+                                 stream=True)
+        else:
+            response = self._get(url, params=params, headers=headers)
+        return self._revalidated(response, key, entry, stream)
+
+    def _revalidation(self, url, params, headers):
+        """Return the headers revalidating a page against the
+        :attr:`page_store`, the key of the page and its stored entry.
+        """
+        store = self.page_store
+        if store is None:
+            return (headers, None, None)
+
+        key = page_key(url, params, {
+            'Accept': (headers or {}).get('Accept'),
+            'Authorization': getattr(self.session, 'headers', {}).get(
+                'Authorization'),
+        })
+        entry = store.get(key)
+        if entry is not None and entry.get('etag'):
+            headers = dict(headers or {}, **{'If-None-Match': entry['etag']})
+        return (headers, key, entry)
+
+    def _revalidated(self, response, key, entry, stream=False):
+        """Serve ``response`` from the :attr:`page_store` if it was not
+        modified, otherwise store it unless it is streamed.
+        """
+        if key is None:
+            return response
+
+        if response.status_code == 304 and entry is not None:
+            self.pages_not_modified += 1
+            return response_from_cache(entry, response)
+
+        if (response.status_code == 200 and not stream and
+                response.headers.get('ETag')):
+            self.page_store.set(key, {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'headers': dict(response.headers),
+                'encoding': response.encoding,
+                'content': response.content,
+            })
+        return response
+
+    def _iter_streamed(self, params, headers, cls):
+        while (self.count == -1 or self.count > 0) and self.last_url:
+            response = self._get_page(self.last_url, params=params,
+                                      headers=headers, stream=True)
+            params = None  # rel_next already has the params
+            try:
+                if response.status_code == 200:
+                    self._record_response(response)
+                    json = self._stream_page(response)
+                else:
+                    json = self._handle_page(response)
+                    if json is None:
+                        break
+
+                for item in self._iter_page(json, cls):
+                    yield item
+            finally:
+                # Give the connection back to the pool even when the page
+                # is not read until the end
+                response.close()
 
             rel_next = response.links.get('next', {})
-            self.last_url = rel_next.get('url', '')
+            self._next_page(rel_next.get('url', ''))
+
+    def _stream_page(self, response):
+        """Decode the items of ``response`` as its body is received."""
+        scanner = JSONItemScanner(self._stream_key, self.session.codec.loads)
+        decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')()
+        members_seen = False
+        for chunk in response.iter_content(8192):
+            items = scanner.feed(decoder.decode(chunk))
+            if scanner.members and not members_seen:
+                members_seen = True
+                self._stream_members(scanner.members)
+            for item in items:
+                yield item
+        for item in scanner.feed(decoder.decode(b'', True)):
+            yield item
+        if scanner.fallback:
+            for item in self._page_items(scanner.document()) or []:
+                yield item
+
+    #: Member of the page holding the items when pages are objects
+    _stream_key = None
+
+    def _stream_members(self, members):
+        """Handle the members of a streamed page preceding its items."""
+
+    def _record_response(self, response):
+        self.last_response = response
+        self.last_status = response.status_code
+
+        if not self.etag and response.headers.get('ETag'):
+            self.etag = response.headers.get('ETag')
+
+    def _handle_page(self, response):
+        """Record ``response`` and return the items of its page.
+
+        :returns: the items on the page or ``None`` if there are none
+        """
+        self._record_response(response)
+        return self._page_items(self._get_json(response))
+
+    def _page_items(self, json):
+        # languages returns a single dict. We want the items.
+        if isinstance(json, dict):
+            if issubclass(self.cls, models.GitHubObject):
+                raise exceptions.UnprocessableResponseBody(
+                    "GitHub's API returned a body that could not be"
+                    " handled", json
+                )
+            if json.get('ETag'):
+                del json['ETag']
+            if json.get('Last-Modified'):
+                del json['Last-Modified']
+            json = list(json.items())
+
+        return json
+
+    def _prefetch_pages(self, pool, pending, response, page_size, headers):
+        """Request the pages following ``response`` in the background.
+
+        When GitHub provides a ``rel="last"`` link, the numbered pages up to
+        it are requested in parallel, otherwise only the ``rel="next"`` page
+        can be known in advance.
+        """
+        next_url = response.links.get('next', {}).get('url')
+        if not next_url or not page_size:
+            return
+
+        limit = self.prefetch
+        if self.count > 0:
+            # Do not request pages that we will never yield items from
+            remaining = self.count - page_size
+            limit = min(limit, max(0, -(-remaining // page_size)))
+
+        urls = [next_url]
+        last_url = response.links.get('last', {}).get('url')
+        first, last = page_number(next_url), page_number(last_url or '')
+        if first is not None and last is not None:
+            urls.extend(page_url(next_url, page)
+                        for page in range(first + 1, last + 1))
+
+        requested = set(key for (key, _) in pending)
+        for url in urls:
+            if len(pending) >= limit:
+                break
+            if url_key(url) not in requested:
+                pending.append((url_key(url), pool.apply_async(
+                    self._get_page, (url,), {'headers': headers}
+                )))
 
     def __next__(self):
         if not hasattr(self, '__i__'):
@@ -109,12 +646,23 @@ class GitHubIterator(models.GitHubCore, collections.Iterator):
         return self._json(response, 200)
 
     def refresh(self, conditional=False):
+        """Start the iteration over again.
+
+        :param bool conditional: (optional), send the ``ETag`` of the first
+            page seen so that nothing is returned if it did not change. Not
+            needed with a :attr:`page_store`, which revalidates every page.
+        :returns: this iterator
+        """
+        self._reset(conditional)
+        self.__i__ = self.__iter__()
+        return self
+
+    def _reset(self, conditional=False):
         self.count = self.original
-        if conditional:
+        self._restored = False
+        if conditional and self.page_store is None:
             self.headers['If-None-Match'] = self.etag
         self.etag = None
-        self.__i__ = self.__iter__()
-        return self
 
     def next(self):
         return self.__next__()
@@ -131,9 +679,10 @@ class SearchIterator(GitHubIterator):
     """
 
     def __init__(self, count, url, cls, session, params=None, etag=None,
-                 headers=None):
+                 headers=None, prefetch=0, page_store=None):
         super(SearchIterator, self).__init__(count, url, cls, session, params,
-                                             etag, headers)
+                                             etag, headers, prefetch,
+                                             page_store)
         #: Total count returned by GitHub
         self.total_count = 0
         #: Items array returned in the last request
@@ -143,6 +692,13 @@ class SearchIterator(GitHubIterator):
         return '<SearchIterator [{0}, {1}?{2}]>'.format(self.count, self.path,
                                                         urlencode(self.params))
 
+    _stream_key = 'items'
+
+    def _stream_members(self, members):
+        self.total_count = members.get('total_count', self.total_count)
+        # The items are not kept in streaming mode
+        self.items = []
+
     def _get_json(self, response):
         json = self._json(response, 200)
         # I'm not sure if another page will retain the total_count attribute,
@@ -8,7 +8,6 @@ This module contains everything relating to Users.
 """
 from __future__ import unicode_literals
 
-from json import dumps
 from uritemplate import URITemplate
 from .events import Event
 from .models import GitHubObject, GitHubCore, BaseAccount
@@ -65,7 +64,8 @@ class Key(GitHubCore):
         json = None
         if title and key:
             data = {'title': title, 'key': key}
-            json = self._json(self._patch(self._api, data=dumps(data)), 200)
+            json = self._json(
+                self._patch(self._api, data=self._dumps(data)), 200)
         if json:
             self._update_attributes(json)
             return True
@@ -78,6 +78,10 @@ class Plan(GitHubObject):
     <http://developer.github.com/v3/users/#get-the-authenticated-user>`_
     documentation for more specifics.
     """
+    __slots__ = ('collaborators', 'name', 'private_repos', 'space')
+    _fields = (('collaborators', 'collaborators'), ('name', 'name'),
+               ('private_repos', 'private_repos'), ('space', 'space'))
+
     def _update_attributes(self, plan):
         #: Number of collaborators
         self.collaborators = plan.get('collaborators')
@@ -234,7 +238,7 @@ class User(BaseAccount):
         :returns: bool
         """
         url = self._build_url('user', 'emails')
-        return self._boolean(self._delete(url, data=dumps(addresses)),
+        return self._boolean(self._delete(url, data=self._dumps(addresses)),
                              204, 404)
 
     def is_assignee_on(self, username, repository):
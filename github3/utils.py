@@ -2,8 +2,15 @@
 """A collection of useful utilities."""
 import collections
 import datetime
+import io
+import os
+import posixpath
 import re
+import tarfile
+import tempfile
+import zipfile
 
+from multiprocessing.pool import ThreadPool
 from requests import compat
 
 # with thanks to https://code.google.com/p/jquery-localtime/issues/detail?id=4
@@ -12,6 +19,9 @@ ISO_8601 = re.compile("^(-?(?:[1-9][0-9]*)?[0-9]{4})-(1[0-2]|0[1-9])-(3[0-1]|0"
                       "-5][0-9])(\.[0-9]+)?(Z|[+-](?:2[0-3]|[0-1][0-9]):[0-5]["
                       "0-9])?)?$")
 
+#: Size of the buffer used to copy response bodies to files
+CHUNK_SIZE = 256 * 1024
+
 
 def timestamp_parameter(timestamp, allow_none=True):
     """Function to check the conformance of timestamps passed by users.
@@ -34,9 +44,14 @@ def timestamp_parameter(timestamp, allow_none=True):
         raise ValueError("Timestamp value cannot be None")
 
     if isinstance(timestamp, datetime.datetime):
+        if timestamp.utcoffset() is not None:
+            timestamp = timestamp.astimezone(utc).replace(tzinfo=None)
         return timestamp.isoformat() + 'Z'
 
     if isinstance(timestamp, compat.basestring):
+        # Strings we parsed before are GitHub's own timestamps
+        if timestamp in _timestamp_cache:
+            return timestamp
         if not ISO_8601.match(timestamp):
             raise ValueError(("Invalid timestamp: %s is not a valid ISO-8601"
                               " formatted date") % timestamp)
@@ -65,15 +80,70 @@ class UTC(datetime.tzinfo):
         return self.ZERO
 
 
-def stream_response_to_file(response, path=None):
+#: Shared :class:`UTC` instance attached to every parsed timestamp
+utc = UTC()
+
+#: Timestamps GitHub sends repeat a lot (e.g., ``created_at`` of the owner of
+#: every repository in a listing), so parsed values are memoized. When the
+#: cache is full it is simply emptied.
+_timestamp_cache = {}
+_timestamp_cache_size = 2048
+
+
+def _parse_timestamp(time_str):
+    if (len(time_str) == 20 and time_str[4] == '-' and time_str[7] == '-' and
+            time_str[10] == 'T' and time_str[13] == ':' and
+            time_str[16] == ':' and time_str[19] == 'Z'):
+        try:
+            return datetime.datetime(
+                int(time_str[0:4]), int(time_str[5:7]), int(time_str[8:10]),
+                int(time_str[11:13]), int(time_str[14:16]),
+                int(time_str[17:19]), tzinfo=utc
+            )
+        except ValueError:
+            pass
+    # Let strptime report the error for strings in an unexpected format
+    dt = datetime.datetime.strptime(time_str, '%Y-%m-%dT%H:%M:%SZ')
+    return dt.replace(tzinfo=utc)
+
+
+def parse_timestamp(time_str):
+    """Convert an ISO 8601 formatted string to a datetime object.
+
+    The string must be in the ``YYYY-MM-DDTHH:MM:SSZ`` format GitHub uses.
+    The returned datetime is timezone-aware and in UTC.
+
+    :param str time_str: ISO 8601 formatted string
+    :returns: timezone-aware datetime object
+    :rtype: datetime or None
+    :raises: ValueError
+    """
+    if not time_str:
+        return None
+    dt = _timestamp_cache.get(time_str)
+    if dt is None:
+        dt = _parse_timestamp(time_str)
+        if len(_timestamp_cache) >= _timestamp_cache_size:
+            _timestamp_cache.clear()
+        _timestamp_cache[time_str] = dt
+    return dt
+
+
+def stream_response_to_file(response, path=None, chunk_size=CHUNK_SIZE):
     """Stream a response body to the specified file.
 
     Either use the ``path`` provided or use the name provided in the
     ``Content-Disposition`` header.
 
+    Bodies which are not compressed in transit are read directly into a
+    reusable buffer of ``chunk_size`` bytes, the others are decoded by
+    requests a chunk at a time.
+
     :param response: A Response object from requests
     :type response: requests.models.Response
     :param str path: The full path and file name used to save the response
+    :param int chunk_size: (optional), size of the buffer in bytes.
+        Default: :data:`CHUNK_SIZE`
     :return: path to the file
     :rtype: str
     """
@@ -94,10 +164,161 @@ def stream_response_to_file(response, path=None):
         filename = header[i:]
         fd = open(filename, 'wb')
 
-    for chunk in response.iter_content(chunk_size=512):
-        fd.write(chunk)
+    raw = _readable_body(response)
+    if raw is not None:
+        buf = bytearray(chunk_size)
+        view = memoryview(buf)
+        # Objects which are not io files, e.g., Python 2 files, may not
+        # accept buffers
+        copy = not isinstance(fd, io.IOBase)
+        while True:
+            n = raw.readinto(buf)
+            if not n:
+                break
+            fd.write(view[:n].tobytes() if copy else view[:n])
+    else:
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            fd.write(chunk)
 
     if not pre_opened:
         fd.close()
 
     return filename
+
+
+def _readable_body(response):
+    """Return the raw body of ``response`` if it can be read as is."""
+    raw = getattr(response, 'raw', None)
+    if (raw is None or not hasattr(raw, 'readinto') or
+            getattr(response, '_content_consumed', True) or
+            response.headers.get('Content-Encoding', 'identity') !=
+            'identity'):
+        return None
+    return raw
+
+
+def _member_path(name):
+    """Return the normalized ``name`` of a member, None if it is unsafe."""
+    name = name.replace('\\', '/')
+    parts = [p for p in name.split('/') if p not in ('', '.')]
+    if not parts or name.startswith('/') or '..' in parts or \
+            ':' in parts[0]:
+        return None
+    return '/'.join(parts)
+
+
+def _selected(path, prefixes):
+    if prefixes is None:
+        return True
+    # Archives of GitHub put everything under an "owner-repo-sha" directory
+    relative = path.partition('/')[2]
+    return any(relative.startswith(p) or (relative + '/').startswith(p)
+               for p in prefixes)
+
+
+def extract_response(response, directory, format='tarball', prefixes=None,
+                     chunk_size=CHUNK_SIZE):
+    """Extract the archive in a response body to ``directory``.
+
+    Tarballs are extracted as the body is received without being written
+    to a file first. The index of a zip file is at its end so zipballs are
+    written to a temporary file before being extracted.
+
+    Members whose path is absolute or goes up the tree, and links pointing
+    outside of ``directory``, are skipped.
+
+    :param response: A Response object from requests, opened with
+        ``stream=True``
+    :type response: requests.models.Response
+    :param str directory: (required), directory where the archive is
+        extracted, created if necessary
+    :param str format: (optional), ``'tarball'`` or ``'zipball'``.
+        Default: ``'tarball'``
+    :param prefixes: (optional), only extract the files whose path, below
+        the top-level directory of the archive, starts with one of these,
+        e.g., ``['src/', 'setup.py']``
+    :param int chunk_size: (optional), size of the reads from the response
+        in bytes. Default: :data:`CHUNK_SIZE`
+    :returns: paths of the extracted members, relative to ``directory``
+    :rtype: list
+    """
+    if format not in ('tarball', 'zipball'):
+        raise ValueError('Unknown archive format: {0!r}'.format(format))
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    if prefixes is not None:
+        prefixes = [p.lstrip('/') for p in prefixes]
+    raw = response.raw
+    # Let urllib3 undo a Content-Encoding applied in transit
+    raw.decode_content = True
+
+    extracted = []
+    if format == 'tarball':
+        with tarfile.open(fileobj=raw, mode='r|*', bufsize=chunk_size) as tar:
+            for member in tar:
+                path = _member_path(member.name)
+                if path is None or not _selected(path, prefixes):
+                    continue
+                if member.issym() or member.islnk():
+                    target = member.linkname
+                    if member.issym():
+                        target = posixpath.join(posixpath.dirname(path),
+                                                target)
+                    if _member_path(posixpath.normpath(target)) is None:
+                        continue
+                member.name = path
+                tar.extract(member, directory)
+                extracted.append(path)
+        return extracted
+
+    with tempfile.TemporaryFile() as spool:
+        while True:
+            chunk = raw.read(chunk_size)
+            if not chunk:
+                break
+            spool.write(chunk)
+        spool.seek(0)
+        with zipfile.ZipFile(spool) as archive:
+            for info in archive.infolist():
+                path = _member_path(info.filename)
+                if path is None or not _selected(path, prefixes):
+                    continue
+                if info.filename.endswith('/'):
+                    # Keep the trailing slash which marks directories
+                    info.filename = path + '/'
+                else:
+                    info.filename = path
+                archive.extract(info, directory)
+                extracted.append(path)
+    return extracted
+
+
+def map_concurrently(func, items, workers=8):
+    """Call ``func`` on every item using a bounded pool of threads.
+
+    Exceptions raised by ``func`` do not interrupt the other calls; the
+    exception instance takes the place of the result instead.
+
+    :param func: callable accepting a single item
+    :param items: iterable of items
+    :param int workers: maximum number of concurrent calls. Default: 8
+    :returns: the results (or exceptions) in the order of ``items``
+    :rtype: list
+    """
+    items = list(items)
+
+    def call(item):
+        try:
+            return func(item)
+        except Exception as exc:
+            return exc
+
+    workers = min(workers, len(items))
+    if workers <= 1:
+        return [call(item) for item in items]
+
+    pool = ThreadPool(workers)
+    try:
+        return pool.map(call, items)
+    finally:
+        pool.terminate()
@@ -16,6 +16,12 @@ packages = [
     "github3.issues",
     "github3.search",
 ]
+extras = {}
+
+# The asynchronous client relies on syntax that only exists on Python 3.6+
+if sys.version_info >= (3, 6):
+    packages.append("github3.aio")
+    extras['aio'] = ['aiohttp']
 
 SNI_requirements = [
     'pyOpenSSL',
@@ -88,10 +94,10 @@ setup(
         'Programming Language :: Python :: 3.4',
         'Programming Language :: Python :: Implementation :: CPython',
     ],
-    extras_require={
+    extras_require=dict(extras, **{
         'test': kwargs['tests_require'],
         ';python_version<="2.7"': SNI_requirements,
-    },
+    }),
     cmdclass={'test': PyTest},
     **kwargs
 )
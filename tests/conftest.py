@@ -1,6 +1,7 @@
 import base64
 import betamax
 import os
+import sys
 
 from betamax_matchers import json_body
 
@@ -25,3 +26,8 @@ with betamax.Betamax.configure() as config:
         '<BASIC_AUTH>',
         base64.b64encode(b':'.join(credentials)).decode()
         )
+
+# The asynchronous client relies on syntax that only exists on Python 3.6+
+collect_ignore = []
+if sys.version_info < (3, 6):
+    collect_ignore.append('unit/test_aio.py')
@@ -3,9 +3,11 @@ try:
     from unittest import mock
 except ImportError:
     import mock
+import datetime
 import github3
 import json
 import os.path
+import requests
 import unittest
 
 
@@ -34,6 +36,35 @@ def create_example_data_helper(example_filename):
     return data_helper
 
 
+def build_response(url='https://api.github.com/user', status_code=200,
+                   body=None, content=b'{}', headers=None, links=None,
+                   method='GET', data=None, elapsed=0.2):
+    """Build a response to a ``method`` request to ``url``, as if it was
+    received from GitHub.
+
+    ``body`` is serialized to JSON in place of ``content``, ``data`` is the
+    body of the request and ``links`` a list of ``(rel, url)`` pairs for the
+    ``Link`` header.
+    """
+    response = requests.Response()
+    response.request = requests.Request(method, url, data=data).prepare()
+    response.url = url
+    response.status_code = status_code
+    if body is not None:
+        content = json.dumps(body).encode('utf-8')
+    response._content = content
+    # The content was read already, as in github3.aio.session.build_response
+    response._content_consumed = True
+    response.encoding = 'utf-8'
+    response.headers.update(headers or {})
+    if links:
+        response.headers['Link'] = ', '.join(
+            '<{0}>; rel="{1}"'.format(link, rel) for (rel, link) in links
+        )
+    response.elapsed = datetime.timedelta(seconds=elapsed)
+    return response
+
+
 def build_url(self, *args, **kwargs):
     """A function to proxy to the actual GitHubSession#build_url method."""
     # We want to assert what is happening with the actual calls to the
@@ -63,6 +94,8 @@ class UnitHelper(unittest.TestCase):
             (key, mock.Mock()) for key in set(args).union(base_attrs)
         )
         session.configure_mock(**attrs)
+        session.codec = github3.codec.JSONCodec()
+        session.object_cache = None
         session.delete.return_value = None
         session.get.return_value = None
         session.patch.return_value = None
@@ -0,0 +1,237 @@
+"""Unit tests for the asynchronous client in github3.aio."""
+import asyncio
+import copy
+import os
+import shutil
+import tempfile
+
+import pytest
+
+aio = pytest.importorskip('github3.aio')
+
+from github3.repos.contents import Contents  # noqa: E402
+from github3.users import User  # noqa: E402
+
+from .helper import (  # noqa: E402
+    build_response, create_example_data_helper, mock
+)
+from .test_repos_repo import repo_example_data  # noqa: E402
+
+
+get_issue_example_data = create_example_data_helper('issue_example_data')
+
+
+def get_repo_example_data():
+    return copy.deepcopy(repo_example_data)
+
+
+def run(coroutine):
+    return asyncio.get_event_loop().run_until_complete(coroutine)
+
+
+async def collect(iterator):
+    return [item async for item in iterator]
+
+
+class TestAsyncGitHub:
+    def setup_method(self, method):
+        self.gh = aio.GitHub(token='token')
+        self.responses = []
+        self.calls = []
+
+        async def request(method, url, **kwargs):
+            self.calls.append((method, url, kwargs))
+            return self.responses.pop(0)
+
+        self.gh.session.request = request
+
+    def test_uses_an_asynchronous_session(self):
+        assert isinstance(self.gh.session, aio.AsyncGitHubSession)
+        assert self.gh.session.headers['Authorization'] == 'token token'
+
+    def test_repository(self):
+        """Verify repositories are built with the asynchronous class."""
+        self.responses.append(build_response(body=get_repo_example_data()))
+        repository = run(self.gh.repository('octocat', 'Hello-World'))
+
+        assert isinstance(repository, aio.Repository)
+        assert self.calls[0][:2] == (
+            'GET', 'https://api.github.com/repos/octocat/Hello-World'
+        )
+
+    def test_user(self):
+        self.responses.append(build_response(body={'login': 'octocat'}))
+        user = run(self.gh.user('octocat'))
+
+        assert isinstance(user, User)
+        assert user.login == 'octocat'
+
+    def test_iterators_are_asynchronous(self):
+        """Verify that pages are followed by the asynchronous iterator."""
+        self.responses.extend([
+            build_response(body=[{'login': 'a'}],
+                           links=[('next', 'https://api.github.com/p2')]),
+            build_response(body=[{'login': 'b'}]),
+        ])
+        users = run(collect(self.gh.all_users()))
+
+        assert [u.login for u in users] == ['a', 'b']
+        assert self.calls[1][1] == 'https://api.github.com/p2'
+
+    def test_iterators_build_asynchronous_repositories(self):
+        self.responses.append(build_response(body=[get_repo_example_data()]))
+        repositories = run(collect(self.gh.all_repositories()))
+
+        assert isinstance(repositories[0], aio.Repository)
+
+    def test_search_returns_asynchronous_iterator(self):
+        iterator = self.gh.search_users('octocat')
+        assert isinstance(iterator, aio.SearchIterator)
+
+    def test_synchronous_iteration_is_refused(self):
+        with pytest.raises(TypeError):
+            list(self.gh.all_users())
+
+    def test_synchronous_only_methods_raise_type_error(self):
+        """Verify methods without an asynchronous variant fail loudly."""
+        with pytest.raises(TypeError):
+            self.gh.emojis()
+
+
+class TestAsyncGitHubIterator:
+    url = 'https://api.github.com/users'
+
+    def setup_method(self, method):
+        self.gh = aio.GitHub(token='token')
+        self.page2 = self.url + '?per_page=100&since=2'
+        self.pages = {
+            self.url: ([{'login': 'a'}, {'login': 'b'}], '"1"'),
+            self.page2: ([{'login': 'c'}], '"2"'),
+        }
+        self.calls = []
+
+        async def request(method, url, params=None, headers=None, **kwargs):
+            self.calls.append((url, params, dict(headers or {})))
+            (body, etag) = self.pages[url]
+            if (headers or {}).get('If-None-Match') == etag:
+                response = build_response(url, 304)
+            else:
+                links = [('next', self.page2)] if url == self.url else None
+                response = build_response(url, body=body, links=links)
+                response.headers['ETag'] = etag
+            return response
+
+        self.gh.session.request = request
+        self.directory = tempfile.mkdtemp()
+
+    def teardown_method(self, method):
+        shutil.rmtree(self.directory)
+
+    def logins(self, iterator):
+        return [u.login for u in run(collect(iterator))]
+
+    def test_resumes_from_a_checkpoint(self):
+        users = self.gh.all_users()
+        run(users.__anext__())
+        checkpoint = users.checkpoint()
+
+        restored = aio.GitHubIterator.from_checkpoint(checkpoint, self.gh)
+        assert isinstance(restored, aio.GitHubIterator)
+        assert self.logins(restored) == ['b', 'c']
+
+    def test_saves_checkpoints(self):
+        path = os.path.join(self.directory, 'users.json')
+        users = self.gh.all_users()
+        users.checkpoint_path = path
+        assert self.logins(users) == ['a', 'b', 'c']
+
+        restored = aio.GitHubIterator.from_checkpoint(path, self.gh)
+        assert restored.last_url == ''
+        assert self.logins(restored) == []
+
+    def test_refresh_forgets_the_checkpoint(self):
+        users = self.gh.all_users()
+        run(users.__anext__())
+        restored = aio.GitHubIterator.from_checkpoint(users.checkpoint(),
+                                                      self.gh)
+        assert self.logins(restored.refresh()) == ['a', 'b', 'c']
+
+    def test_page_store(self):
+        from github3.cache import MemoryCache
+        users = self.gh.all_users()
+        users.page_store = MemoryCache()
+        self.logins(users)
+        self.calls = []
+
+        assert self.logins(users.refresh()) == ['a', 'b', 'c']
+        etags = [c[2].get('If-None-Match') for c in self.calls]
+        assert etags == ['"1"', '"2"']
+        assert users.pages_not_modified == 2
+
+    def test_stream(self):
+        users = self.gh.all_users()
+        users.stream = True
+        assert self.logins(users) == ['a', 'b', 'c']
+
+
+class TestAsyncRepository:
+    def setup_method(self, method):
+        self.session = aio.AsyncGitHubSession()
+        self.session.request = mock.Mock()
+        self.repository = aio.Repository(get_repo_example_data(),
+                                         self.session)
+
+    def respond_with(self, *responses):
+        responses = list(responses)
+
+        async def request(method, url, **kwargs):
+            self.session.request.calls.append((method, url, kwargs))
+            return responses.pop(0)
+
+        self.session.request = request
+        request.calls = []
+
+    def test_issues(self):
+        issue = get_issue_example_data()
+        self.respond_with(build_response(body=[issue]))
+        issues = run(collect(self.repository.issues(state='all')))
+
+        assert [i.title for i in issues] == [issue['title']]
+        url, kwargs = self.session.request.calls[0][1:]
+        assert url.endswith('/issues')
+        assert kwargs['params']['state'] == 'all'
+
+    def test_file_contents(self):
+        self.respond_with(build_response(body={
+            'type': 'file', 'encoding': 'base64', 'content': 'Zm9v',
+            'name': 'README', 'path': 'README', 'sha': 'abc',
+        }))
+        contents = run(self.repository.file_contents('README'))
+
+        assert isinstance(contents, Contents)
+        assert contents.decoded == b'foo'
+
+
+class TestBuildResponse:
+    def test_converts_client_responses(self):
+        client_response = mock.Mock(
+            status=200, reason='OK', charset=None,
+            url='https://api.github.com/users',
+            headers={'Link': '<https://api.github.com/p2>; rel="next"'},
+        )
+        response = aio.session.build_response(client_response, b'[]')
+
+        assert response.status_code == 200
+        assert response.json() == []
+        assert response.links['next']['url'] == 'https://api.github.com/p2'
+
+    def test_prepare_request(self):
+        """Verify the request given to the on_request callbacks."""
+        request = aio.session.prepare_request(
+            'get', 'https://api.github.com/users', {'per_page': 100},
+            {'Accept': 'application/json'}, None,
+        )
+
+        assert request.method == 'GET'
+        assert request.url == 'https://api.github.com/users?per_page=100'
+        assert request.headers['Accept'] == 'application/json'
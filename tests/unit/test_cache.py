@@ -0,0 +1,137 @@
+import os
+import shutil
+import tempfile
+
+from github3 import cache
+
+
+def build_entry(content=b'{}'):
+    return {
+        'etag': '"etag"',
+        'last_modified': None,
+        'headers': {'ETag': '"etag"'},
+        'encoding': 'utf-8',
+        'content': content,
+    }
+
+
+class TestCacheKey:
+    def test_depends_on_url(self):
+        """Test that distinct URLs produce distinct keys."""
+        headers = {'Accept': 'application/json'}
+        assert (cache.cache_key('GET', 'https://a', headers) !=
+                cache.cache_key('GET', 'https://b', headers))
+
+    def test_depends_on_accept_and_authorization(self):
+        """Test that media types and credentials produce distinct keys."""
+        url = 'https://api.github.com/user'
+        keys = set([
+            cache.cache_key('GET', url, {}),
+            cache.cache_key('GET', url, {'Accept': 'application/json'}),
+            cache.cache_key('GET', url, {'Authorization': 'token foo'}),
+        ])
+        assert len(keys) == 3
+
+
+class TestMemoryCache:
+    def test_stores_and_retrieves_entries(self):
+        c = cache.MemoryCache()
+        c.set('key', build_entry())
+        assert c.get('key') == build_entry()
+        assert c.get('missing') is None
+
+    def test_evicts_least_recently_used_entries(self):
+        """Test that the cache never grows past its maximum size."""
+        c = cache.MemoryCache(maxsize=2)
+        c.set('a', build_entry())
+        c.set('b', build_entry())
+        c.get('a')
+        c.set('c', build_entry())
+        assert len(c) == 2
+        assert c.get('b') is None
+        assert c.get('a') is not None
+
+    def test_delete_and_clear(self):
+        c = cache.MemoryCache()
+        c.set('a', build_entry())
+        c.set('b', build_entry())
+        c.delete('a')
+        assert c.get('a') is None
+        c.clear()
+        assert len(c) == 0
+
+
+class TestSQLiteCache:
+    def setup_method(self, method):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'cache.sqlite')
+
+    def teardown_method(self, method):
+        shutil.rmtree(self.directory)
+
+    def test_stores_and_retrieves_entries(self):
+        c = cache.SQLiteCache(self.path)
+        c.set('key', build_entry(b'\x00binary'))
+        assert c.get('key') == build_entry(b'\x00binary')
+        assert c.get('missing') is None
+        c.close()
+
+    def test_entries_persist_across_instances(self):
+        """Test that a new cache on the same file sees old entries."""
+        c = cache.SQLiteCache(self.path)
+        c.set('key', build_entry())
+        c.close()
+        c = cache.SQLiteCache(self.path)
+        assert c.get('key') == build_entry()
+        assert len(c) == 1
+        c.close()
+
+    def test_delete_and_clear(self):
+        c = cache.SQLiteCache(self.path)
+        c.set('a', build_entry())
+        c.set('b', build_entry())
+        c.delete('a')
+        assert c.get('a') is None
+        c.clear()
+        assert len(c) == 0
+        c.close()
+
+
+class TestObjectCache:
+    def setup_method(self, method):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'objects.sqlite')
+
+    def teardown_method(self, method):
+        shutil.rmtree(self.directory)
+
+    def test_object_key(self):
+        url = 'https://api.github.com/repos/o/r/git/trees/' + 'a' * 40
+        keys = set([
+            cache.object_key(url),
+            cache.object_key(url, {'recursive': '1'}),
+            cache.object_key(url, accept='application/vnd.github.v3.raw'),
+        ])
+        assert len(keys) == 3
+        assert cache.object_key(url, {}) == cache.object_key(url)
+
+    def test_memory_only(self):
+        c = cache.ObjectCache(maxsize=1)
+        c.set('a', b'{"a": 1}')
+        assert c.get('a') == b'{"a": 1}'
+        c.set('b', b'{}')
+        assert c.get('a') is None
+
+    def test_store_outlives_memory(self):
+        """Test that evicted objects are read back from the store."""
+        c = cache.ObjectCache(maxsize=1, store=cache.SQLiteCache(self.path))
+        c.set('a', b'{"a": 1}')
+        c.set('b', b'{}')
+        assert c.get('a') == b'{"a": 1}'
+
+        other = cache.ObjectCache(store=cache.SQLiteCache(self.path))
+        assert other.get('b') == b'{}'
+        other.clear()
+        assert c.get('a') == b'{"a": 1}'
+        c.memory.clear()
+        assert c.get('a') is None
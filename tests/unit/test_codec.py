@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from github3 import codec
+from .helper import mock
+
+
+class TestJSONCodec:
+    def test_decodes_bytes_and_text(self):
+        c = codec.JSONCodec()
+        assert c.loads(b'{"login": "octocat"}') == {'login': 'octocat'}
+        assert c.loads(u'[1, 2]') == [1, 2]
+
+    def test_decodes_utf8_bytes(self):
+        data = u'{"name": "☃"}'.encode('utf-8')
+        assert codec.JSONCodec().loads(data) == {'name': u'☃'}
+
+    def test_dumps(self):
+        assert codec.JSONCodec().dumps({'a': 1}) == '{"a": 1}'
+
+    def test_codecs_compare_by_type(self):
+        assert codec.JSONCodec() == codec.JSONCodec()
+        assert codec.JSONCodec() != codec.UJSONCodec()
+
+
+class TestGetCodec:
+    def test_returns_codec_instances_unchanged(self):
+        c = codec.JSONCodec()
+        assert codec.get_codec(c) is c
+
+    def test_selects_by_name(self):
+        assert isinstance(codec.get_codec('json'), codec.JSONCodec)
+
+    def test_prefers_the_fastest_installed_codec(self):
+        orjson = mock.Mock()
+        with mock.patch.object(codec, 'CODECS', [
+                (codec.OrjsonCodec, orjson),
+                (codec.JSONCodec, codec.json)]):
+            assert isinstance(codec.get_codec(), codec.OrjsonCodec)
+            assert codec.available_codecs() == ['orjson', 'json']
+
+    def test_falls_back_on_the_standard_library(self):
+        with mock.patch.object(codec, 'CODECS', [
+                (codec.OrjsonCodec, None),
+                (codec.UJSONCodec, None),
+                (codec.JSONCodec, codec.json)]):
+            assert type(codec.get_codec()) is codec.JSONCodec
+
+    def test_rejects_unavailable_codecs(self):
+        with mock.patch.object(codec, 'CODECS', [
+                (codec.OrjsonCodec, None),
+                (codec.JSONCodec, codec.json)]):
+            with pytest.raises(ValueError):
+                codec.get_codec('orjson')
+
+    def test_rejects_unknown_codecs(self):
+        with pytest.raises(ValueError):
+            codec.get_codec('yaml')
@@ -0,0 +1,189 @@
+import json
+
+import mock
+import pytest
+
+from github3.codec import JSONCodec
+from github3.git import Hash, Tree, TreeIndex
+
+url = 'https://api.github.com/repos/o/r/git/trees/' + 'f' * 40
+
+
+def entry(path, kind='blob', sha=None, size=10):
+    data = {'path': path, 'type': kind, 'sha': sha or ('%040x' % len(path)),
+            'mode': '100644' if kind == 'blob' else '040000'}
+    if kind == 'blob':
+        data['size'] = size
+    return data
+
+
+def build_index():
+    entries = [
+        entry('setup.py'),
+        entry('docs', 'tree'),
+        entry('docs/index.rst'),
+        entry('src', 'tree'),
+        entry('src/pkg', 'tree'),
+        entry('src/pkg/__init__.py', size=0),
+        entry('src/pkg/git.py'),
+        entry('src/pkg.txt'),
+        entry('tests', 'tree'),
+        entry('tests/test_git.py'),
+        entry('tests/unit/test_pkg.py'),
+    ]
+    return Tree({'url': url, 'sha': 'f' * 40, 'tree': entries}).index()
+
+
+class TestTreeIndex:
+    def setup_method(self, method):
+        self.index = build_index()
+
+    def test_sorted_paths(self):
+        paths = list(self.index)
+        assert paths == sorted(paths)
+        assert len(self.index) == 12
+
+    def test_lookup(self):
+        found = self.index['src/pkg/git.py']
+        assert isinstance(found, Hash)
+        assert found.path == 'src/pkg/git.py'
+        assert found.sha == '%040x' % len('src/pkg/git.py')
+        assert found.size == 10
+        assert found.url == ('https://api.github.com/repos/o/r/git/blobs/' +
+                             found.sha)
+
+    def test_missing_paths(self):
+        assert 'src/missing.py' not in self.index
+        assert self.index.get('src/missing.py') is None
+        with pytest.raises(KeyError):
+            self.index['src/missing.py']
+
+    def test_directories_have_no_size(self):
+        assert self.index['src/pkg'].size is None
+        assert self.index['src/pkg'].type == 'tree'
+
+    def test_listdir(self):
+        assert [e.path for e in self.index.listdir()] == [
+            'docs', 'setup.py', 'src', 'tests',
+        ]
+        assert [e.path for e in self.index.listdir('src')] == [
+            'src/pkg', 'src/pkg.txt',
+        ]
+        with pytest.raises(KeyError):
+            self.index.listdir('nope')
+
+    def test_adds_missing_directories(self):
+        unit = self.index['tests/unit']
+        assert unit.type == 'tree' and unit.sha is None
+        assert [e.path for e in self.index.listdir('tests/unit')] == [
+            'tests/unit/test_pkg.py',
+        ]
+
+    def test_iter_prefix(self):
+        assert [e.path for e in self.index.iter_prefix('src/pkg/')] == [
+            'src/pkg/__init__.py', 'src/pkg/git.py',
+        ]
+        assert [e.path for e in self.index.iter_prefix('src/pkg')] == [
+            'src/pkg', 'src/pkg.txt', 'src/pkg/__init__.py', 'src/pkg/git.py',
+        ]
+
+    def test_glob(self):
+        def glob(pattern):
+            return [e.path for e in self.index.glob(pattern)]
+
+        assert glob('*.py') == ['setup.py']
+        assert glob('src/*/*.py') == ['src/pkg/__init__.py',
+                                      'src/pkg/git.py']
+        assert glob('**/test_*.py') == ['tests/test_git.py',
+                                        'tests/unit/test_pkg.py']
+        assert glob('src/pkg.[!p]xt') == ['src/pkg.txt']
+        assert glob('docs/index.rs?') == ['docs/index.rst']
+
+    def test_accepts_dictionaries(self):
+        index = TreeIndex([entry('a/b.py')])
+        assert index['a/b.py'].url is None
+        assert list(index) == ['a', 'a/b.py']
+
+
+class FakeTrees(object):
+    """Session serving trees keyed by SHA, truncating some listings."""
+
+    def __init__(self, trees, truncated=()):
+        self.trees = trees
+        self.truncated = set(truncated)
+        self.requests = []
+        self.codec = JSONCodec()
+
+    def listing(self, sha, recursive):
+        entries = []
+        for e in self.trees[sha]:
+            entries.append(e)
+            if recursive and e['type'] == 'tree':
+                entries.extend(dict(child, path=e['path'] + '/' + c_path)
+                               for (c_path, child) in self.walk(e['sha']))
+        if recursive and sha in self.truncated:
+            return {'sha': sha, 'tree': entries[:1], 'truncated': True}
+        return {'sha': sha, 'tree': entries, 'truncated': False}
+
+    def walk(self, sha):
+        for e in self.listing(sha, True)['tree']:
+            yield e['path'], e
+
+    def get(self, url, params=None, **kwargs):
+        sha = url.rsplit('/', 1)[1]
+        recursive = bool(params)
+        self.requests.append((sha, recursive))
+        response = mock.Mock(status_code=200, headers={})
+        response.content = json.dumps(
+            self.listing(sha, recursive)).encode('utf-8')
+        return response
+
+
+class TestTreeRecurse:
+    root, lib, pkg, util = ('%040x' % i for i in range(1, 5))
+
+    def trees(self):
+        return {
+            self.root: [entry('setup.py'), entry('lib', 'tree', self.lib),
+                        entry('vendor', 'tree', self.lib)],
+            self.lib: [entry('pkg', 'tree', self.pkg),
+                       entry('util', 'tree', self.util)],
+            self.pkg: [entry('a.py'), entry('b.py')],
+            self.util: [entry('c.py')],
+        }
+
+    def recurse(self, session, **kwargs):
+        tree = Tree({'url': url[:-40] + self.root, 'sha': self.root,
+                     'tree': []}, session)
+        return tree.recurse(**kwargs)
+
+    def test_not_truncated(self):
+        session = FakeTrees(self.trees())
+        tree = self.recurse(session)
+        assert tree.truncated is False
+        assert session.requests == [(self.root, True)]
+        assert len(tree.tree) == 13
+
+    def test_completes_truncated_tree(self):
+        session = FakeTrees(self.trees(), truncated=[self.root, self.lib])
+        tree = self.recurse(session)
+        expected = self.recurse(FakeTrees(self.trees()))
+        assert tree.truncated is False
+        assert ([(h.path, h.sha) for h in tree.tree] ==
+                sorted((h.path, h.sha) for h in expected.tree))
+        # lib and vendor share a SHA and are only requested once
+        assert sorted(session.requests) == sorted([
+            (self.root, True), (self.root, False), (self.lib, True),
+            (self.lib, False), (self.pkg, True), (self.util, True)])
+
+    def test_incomplete(self):
+        session = FakeTrees(self.trees(), truncated=[self.root])
+        tree = self.recurse(session, complete=False)
+        assert tree.truncated is True
+        assert len(tree.tree) == 1
+
+    def test_compact(self):
+        session = FakeTrees(self.trees(), truncated=[self.root])
+        tree = self.recurse(session, compact=True)
+        assert len(tree.tree) == 13
+        assert tree.as_dict()['truncated'] is False
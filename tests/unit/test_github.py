@@ -1,9 +1,10 @@
 import pytest
 
+import github3
 from github3 import AuthenticationFailed, GitHubError
-from github3.github import GitHub
+from github3.github import GitHub, GitHubEnterprise
 
-from .helper import UnitHelper, UnitIteratorHelper
+from .helper import UnitHelper, UnitIteratorHelper, mock
 
 
 def url_for(path=''):
@@ -301,6 +302,96 @@ class TestGitHub(UnitHelper):
 
         self.session.get.assert_called_once_with(url_for('user/10'))
 
+    def test_repositories_bulk(self):
+        """Verify every repository is requested."""
+        results = self.instance.repositories_bulk(
+            ['user/repo', ('other', 'project')]
+        )
+
+        assert len(results) == 2
+        requested = sorted(c[0][0] for c in self.session.get.call_args_list)
+        assert requested == [url_for('repos/other/project'),
+                             url_for('repos/user/repo')]
+
+    def test_users_bulk(self):
+        """Verify every user is requested."""
+        self.instance.users_bulk(['a', 'b', 'c'], workers=2)
+
+        requested = sorted(c[0][0] for c in self.session.get.call_args_list)
+        assert requested == [url_for('users/a'), url_for('users/b'),
+                             url_for('users/c')]
+
+    def test_users_bulk_returns_exceptions_per_user(self):
+        """Verify that a failure does not abort the other requests."""
+        error = github3.exceptions.ServerError(mock.Mock(status_code=500))
+
+        def get(url):
+            if url.endswith('/b'):
+                raise error
+
+        self.session.get.side_effect = get
+        results = self.instance.users_bulk(['a', 'b', 'c'])
+
+        assert results[1] is error
+        assert not isinstance(results[0], Exception)
+        assert self.session.get.call_count == 3
+
+
+class TestGitHubConnectionPooling:
+    def test_session_options(self):
+        """Verify the pooling options are given to the session."""
+        g = GitHub(pool_maxsize=20, max_retries=2, backoff_factor=1)
+        adapter = g.session.get_adapter('https://api.github.com/user')
+
+        assert adapter._pool_maxsize == 20
+        assert adapter.max_retries.total == 2
+        assert adapter.max_retries.backoff_factor == 1
+
+    def test_uses_given_session(self):
+        s = github3.session.GitHubSession()
+        assert GitHub(session=s).session is s
+
+    def test_enterprise_host_has_its_own_adapter(self):
+        g = GitHubEnterprise('https://github.example.com', pool_maxsize=20)
+        url = 'https://github.example.com/api/v3/user'
+
+        assert g.session.adapters['https://github.example.com/'] is (
+            g.session.get_adapter(url))
+        assert g.session.get_adapter(url)._pool_maxsize == 20
+
+    def test_hosts(self):
+        g = GitHub(pool_maxsize=20, max_retries=2, hosts={
+            'https://uploads.github.com': {'pool_maxsize': 4},
+        })
+        adapter = g.session.get_adapter('https://uploads.github.com/x')
+
+        assert adapter._pool_maxsize == 4
+        assert adapter.max_retries.total == 2
+
+    def test_rejects_options_with_a_session(self):
+        s = github3.session.GitHubSession()
+        with pytest.raises(ValueError):
+            GitHub(session=s, pool_maxsize=20)
+        with pytest.raises(ValueError):
+            GitHub(session=s, hosts={'https://uploads.github.com': {}})
+
+    def test_enterprise_keeps_the_adapters_of_a_session(self):
+        s = github3.session.GitHubSession()
+        adapter = s.mount_host('https://github.example.com/',
+                               pool_maxsize=50)
+        g = GitHubEnterprise('https://github.example.com', session=s)
+
+        assert g.session.adapters['https://github.example.com/'] is adapter
+
+    def test_enterprise_host_options(self):
+        g = GitHubEnterprise('https://github.example.com/', pool_maxsize=20,
+                             hosts={'https://github.example.com': {
+                                 'pool_maxsize': 5}})
+        url = 'https://github.example.com/api/v3/user'
+
+        assert 'https://github.example.com/' not in g.session.adapters
+        assert g.session.get_adapter(url)._pool_maxsize == 5
+
 
 class TestGitHubIterators(UnitIteratorHelper):
     described_class = GitHub
@@ -3,11 +3,14 @@ try:
 except ImportError:
     import pickle
 
+import io
+
 import pytest
 
 import requests
 
-from github3 import session
+from github3 import codec, ratelimit, session
+from github3.cache import MemoryCache
 from .helper import mock
 
 
@@ -237,6 +240,17 @@ class TestGitHubSession:
         s = self.build_session()
         assert s.retrieve_client_credentials() == (None, None)
 
+    def test_codec(self):
+        """Verify the JSON codec can be chosen."""
+        assert isinstance(self.build_session().codec, codec.JSONCodec)
+        s = session.GitHubSession(codec='json')
+        assert type(s.codec) is codec.JSONCodec
+
+    def test_pickling_keeps_the_codec(self):
+        s = session.GitHubSession(codec='json')
+        loaded = pickle.loads(pickle.dumps(s, pickle.HIGHEST_PROTOCOL))
+        assert loaded.codec == s.codec
+
     def test_pickling(self):
         s = self.build_session('https://api.github.com')
         dumped = pickle.dumps(s, pickle.HIGHEST_PROTOCOL)
@@ -247,3 +261,288 @@ class TestGitHubSession:
 
         assert loaded.base_url == s.base_url
         assert loaded.two_factor_auth_cb == s.two_factor_auth_cb
+
+
+class TestGitHubSessionPooling:
+    def test_uses_requests_defaults(self):
+        """Verify the default adapters match those of requests."""
+        s = session.GitHubSession()
+        adapter = s.get_adapter('https://api.github.com/user')
+        assert adapter._pool_maxsize == 10
+        assert adapter.max_retries.total == 0
+
+    def test_configures_pool_and_retries(self):
+        s = session.GitHubSession(pool_maxsize=32, max_retries=3,
+                                  backoff_factor=0.5, pool_block=True)
+        for url in ('https://api.github.com/user', 'http://example.com'):
+            adapter = s.get_adapter(url)
+            assert adapter._pool_maxsize == 32
+            assert adapter._pool_block is True
+            assert adapter.max_retries.total == 3
+            assert adapter.max_retries.backoff_factor == 0.5
+            assert 503 in adapter.max_retries.status_forcelist
+
+    def test_only_retries_idempotent_methods(self):
+        retries = session.build_adapter(max_retries=3).max_retries
+        assert retries.is_retry('GET', 503)
+        assert not retries.is_retry('POST', 503)
+        assert not retries.is_retry('GET', 404)
+
+    def test_mount_host(self):
+        """Verify that a host can have its own adapter."""
+        s = session.GitHubSession(pool_maxsize=32)
+        adapter = s.mount_host('https://uploads.github.com', pool_maxsize=4)
+
+        assert s.get_adapter('https://uploads.github.com/x') is adapter
+        assert adapter._pool_maxsize == 4
+        assert s.get_adapter(
+            'https://api.github.com/user')._pool_maxsize == 32
+
+    def test_hosts(self):
+        s = session.GitHubSession(pool_maxsize=32, max_retries=2, hosts={
+            'https://uploads.github.com': {'pool_maxsize': 4},
+        })
+        adapter = s.get_adapter('https://uploads.github.com/x')
+
+        assert adapter._pool_maxsize == 4
+        assert adapter.max_retries.total == 2
+        assert s.get_adapter(
+            'https://api.github.com/user')._pool_maxsize == 32
+
+    def test_pickling_keeps_adapters(self):
+        s = session.GitHubSession(pool_maxsize=32, max_retries=2)
+        loaded = pickle.loads(pickle.dumps(s, pickle.HIGHEST_PROTOCOL))
+        adapter = loaded.get_adapter('https://api.github.com/user')
+        assert adapter._pool_maxsize == 32
+        assert adapter.max_retries.total == 2
+
+
+def build_response(status_code, content=b'', headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content
+    response.headers.update(headers or {})
+    response.encoding = 'utf-8'
+    return response
+
+
+class TestGitHubSessionCache:
+    def build_session(self, cache=None):
+        return session.GitHubSession(cache=cache or MemoryCache())
+
+    def prepare(self, s, url='https://api.github.com/users/octocat',
+                method='GET', headers=None):
+        request = requests.Request(method, url, headers=headers)
+        return s.prepare_request(request)
+
+    @mock.patch.object(requests.Session, 'send')
+    def test_stores_responses_with_validators(self, send_mock):
+        """Test that a 200 with an ETag is stored in the cache."""
+        s = self.build_session()
+        send_mock.return_value = build_response(200, b'{}', {'ETag': '"a"'})
+        s.send(self.prepare(s))
+        assert len(s.cache) == 1
+
+    @mock.patch.object(requests.Session, 'send')
+    def test_does_not_store_responses_without_validators(self, send_mock):
+        """Test that responses lacking ETag and Last-Modified are skipped."""
+        s = self.build_session()
+        send_mock.return_value = build_response(200, b'{}')
+        s.send(self.prepare(s))
+        assert len(s.cache) == 0
+
+    @mock.patch.object(requests.Session, 'send')
+    def test_revalidates_and_serves_304_from_cache(self, send_mock):
+        """Test that a 304 is turned into the stored 200 response."""
+        s = self.build_session()
+        send_mock.return_value = build_response(
+            200, b'{"login": "octocat"}',
+            {'ETag': '"a"', 'Link': '<https://next>; rel="next"'}
+        )
+        s.send(self.prepare(s))
+
+        send_mock.return_value = build_response(
+            304, headers={'X-RateLimit-Remaining': '4999'}
+        )
+        request = self.prepare(s)
+        response = s.send(request)
+
+        assert request.headers['If-None-Match'] == '"a"'
+        assert response.status_code == 200
+        assert response.json() == {'login': 'octocat'}
+        assert response.from_cache is True
+        assert response.headers['X-RateLimit-Remaining'] == '4999'
+        assert response.links['next']['url'] == 'https://next'
+
+    @mock.patch.object(requests.Session, 'send')
+    def test_sends_if_modified_since(self, send_mock):
+        """Test that Last-Modified is replayed as If-Modified-Since."""
+        s = self.build_session()
+        last_modified = 'Tue, 14 Jul 2015 00:00:00 GMT'
+        send_mock.return_value = build_response(
+            200, b'{}', {'Last-Modified': last_modified}
+        )
+        s.send(self.prepare(s))
+        request = self.prepare(s)
+        s.send(request)
+        assert request.headers['If-Modified-Since'] == last_modified
+
+    @mock.patch.object(requests.Session, 'send')
+    def test_credentials_are_part_of_the_key(self, send_mock):
+        """Test that responses are not shared between users."""
+        s = self.build_session()
+        send_mock.return_value = build_response(200, b'{}', {'ETag': '"a"'})
+        s.send(self.prepare(s))
+        s.token_auth('secret')
+        request = self.prepare(s)
+        s.send(request)
+        assert 'If-None-Match' not in request.headers
+
+    @mock.patch.object(requests.Session, 'send')
+    def test_ignores_explicit_conditional_requests(self, send_mock):
+        """Test that caller-provided conditional headers bypass the cache."""
+        s = self.build_session()
+        send_mock.return_value = build_response(200, b'{}', {'ETag': '"a"'})
+        s.send(self.prepare(s))
+        send_mock.return_value = build_response(304)
+        response = s.send(self.prepare(s, headers={'If-None-Match': '"b"'}))
+        assert response.status_code == 304
+
+    @mock.patch.object(requests.Session, 'send')
+    def test_ignores_non_get_requests(self, send_mock):
+        """Test that only GET requests are cached."""
+        s = self.build_session()
+        send_mock.return_value = build_response(200, b'{}', {'ETag': '"a"'})
+        s.send(self.prepare(s, method='POST'))
+        assert len(s.cache) == 0
+
+    @mock.patch.object(requests.Session, 'send')
+    def test_ignores_streamed_requests(self, send_mock):
+        """Test that streamed downloads are never cached."""
+        s = self.build_session()
+        send_mock.return_value = build_response(200, b'{}', {'ETag': '"a"'})
+        s.send(self.prepare(s), stream=True)
+        assert len(s.cache) == 0
+
+    def test_cache_is_disabled_by_default(self):
+        """Test that sessions do not cache unless asked to."""
+        assert session.GitHubSession().cache is None
+
+
+class TestGitHubSessionRateLimit:
+    def build_session(self, **kwargs):
+        s = session.GitHubSession()
+        s.ratelimit = ratelimit.RateLimitScheduler(**kwargs)
+        s.sleep = mock.Mock()
+        return s
+
+    @mock.patch.object(requests.Session, 'request')
+    def test_tracks_rate_limit_headers(self, request_mock):
+        request_mock.return_value = build_response(
+            200, headers={'X-RateLimit-Remaining': '4999'}
+        )
+        s = self.build_session()
+        s.get('https://api.github.com/user')
+        assert s.ratelimit.remaining() == 4999
+
+    @mock.patch.object(requests.Session, 'request')
+    def test_retries_after_abuse_limit(self, request_mock):
+        """Verify a Retry-After response is retried after sleeping."""
+        limited = build_response(403, headers={'Retry-After': '7'})
+        request_mock.side_effect = [limited, build_response(200)]
+        s = self.build_session(retry_abuse=True)
+        response = s.get('https://api.github.com/user')
+
+        assert response.status_code == 200
+        assert request_mock.call_count == 2
+        s.sleep.assert_any_call(7)
+
+    @mock.patch.object(requests.Session, 'request')
+    def test_returns_limited_responses_by_default(self, request_mock):
+        request_mock.return_value = build_response(
+            403, headers={'Retry-After': '7'}
+        )
+        s = self.build_session()
+        response = s.get('https://api.github.com/user')
+
+        assert response.status_code == 403
+        assert request_mock.call_count == 1
+
+    @mock.patch.object(requests.Session, 'request')
+    def test_does_not_retry_file_uploads(self, request_mock):
+        request_mock.return_value = build_response(
+            403, headers={'Retry-After': '7'}
+        )
+        s = self.build_session(retry_abuse=True)
+        s.post('https://uploads.github.com/', data=io.BytesIO(b'data'))
+        assert request_mock.call_count == 1
+
+    def test_pickling_keeps_the_scheduler(self):
+        s = session.GitHubSession()
+        loaded = pickle.loads(pickle.dumps(s, pickle.HIGHEST_PROTOCOL))
+        assert isinstance(loaded.ratelimit, ratelimit.RateLimitScheduler)
+
+
+class TestGitHubSessionHooks:
+    def prepare(self, s, url='https://api.github.com/user'):
+        return s.prepare_request(requests.Request('GET', url))
+
+    @mock.patch.object(requests.Session, 'send')
+    def test_calls_request_and_response_hooks(self, send_mock):
+        response = build_response(200)
+        send_mock.return_value = response
+        s = session.GitHubSession()
+        on_request, on_response = mock.Mock(), mock.Mock()
+        s.on_request.append(on_request)
+        s.on_response.append(on_response)
+
+        request = self.prepare(s)
+        s.send(request)
+
+        on_request.assert_called_once_with(request)
+        on_response.assert_called_once_with(response)
+
+    @mock.patch.object(requests.Session, 'send')
+    def test_response_hooks_see_cached_responses(self, send_mock):
+        s = session.GitHubSession(cache=MemoryCache())
+        send_mock.return_value = build_response(200, b'{}', {'ETag': '"a"'})
+        s.send(self.prepare(s))
+        send_mock.return_value = build_response(304)
+        on_response = mock.Mock()
+        s.on_response.append(on_response)
+
+        s.send(self.prepare(s))
+
+        assert on_response.call_args[0][0].from_cache is True
+
+    @mock.patch.object(requests.Session, 'request')
+    def test_calls_retry_hooks(self, request_mock):
+        limited = build_response(403, headers={'Retry-After': '7'})
+        request_mock.side_effect = [limited, build_response(200)]
+        s = session.GitHubSession()
+        s.ratelimit = ratelimit.RateLimitScheduler(retry_abuse=True)
+        s.sleep = mock.Mock()
+        on_retry = mock.Mock()
+        s.on_retry.append(on_retry)
+
+        s.get('https://api.github.com/user')
+
+        on_retry.assert_called_once_with(limited, 1, 7)
+
+    def test_instrument_registers_the_observer_methods(self):
+        class Observer(object):
+            def on_response(self, response):
+                pass
+
+        s = session.GitHubSession()
+        observer = Observer()
+        s.instrument(observer)
+
+        assert s.on_response == [observer.on_response]
+        assert s.on_request == [] and s.on_retry == []
+
+    def test_pickling_drops_the_hooks(self):
+        s = session.GitHubSession()
+        s.on_response.append(len)
+        loaded = pickle.loads(pickle.dumps(s, pickle.HIGHEST_PROTOCOL))
+        assert loaded.on_response == []
@@ -0,0 +1,174 @@
+import json
+import os
+import shutil
+import tempfile
+
+import pytest
+
+from requests.adapters import BaseAdapter
+
+from github3 import metrics
+from github3.repos.release import Release
+from github3.session import GitHubSession
+
+from . import test_repos_release
+from .helper import build_response
+
+
+@pytest.mark.parametrize('url, template', [
+    ('https://api.github.com/repos/sigmavirus24/github3.py',
+     '/repos/{owner}/{repo}'),
+    ('https://api.github.com/repos/sigmavirus24/github3.py/issues/42',
+     '/repos/{owner}/{repo}/issues/{id}'),
+    ('https://api.github.com/repos/a/b/issues/42/labels/bug',
+     '/repos/{owner}/{repo}/issues/{id}/labels/{name}'),
+    ('https://api.github.com/repos/a/b/contents/docs/index.rst?ref=x',
+     '/repos/{owner}/{repo}/contents/{path}'),
+    ('https://api.github.com/repos/a/b/git/refs/heads/master',
+     '/repos/{owner}/{repo}/git/refs/{ref}'),
+    ('https://api.github.com/repos/a/b/git/trees/'
+     '9fb037999f264ba9a7fc6274d15fa3ae2ab98312',
+     '/repos/{owner}/{repo}/git/trees/{sha}'),
+    ('https://api.github.com/users/octocat/repos', '/users/{user}/repos'),
+    ('https://api.github.com/user/repos', '/user/repos'),
+    ('https://api.github.com/search/issues?q=x', '/search/issues'),
+    ('https://github.example.com/api/v3/orgs/github3py',
+     '/orgs/{org}'),
+])
+def test_endpoint_template(url, template):
+    assert metrics.endpoint_template(url) == template
+
+
+class TestMetricsCollector:
+    def test_aggregates_per_endpoint(self):
+        collector = metrics.MetricsCollector(buckets=(0.1, 1))
+        for number in (1, 2):
+            collector.on_response(build_response(
+                'https://api.github.com/repos/a/b/issues/{0}'.format(number),
+                content=b'12345', elapsed=0.5,
+            ))
+        collector.on_response(build_response(
+            'https://api.github.com/repos/a/b/issues/3', status_code=404,
+            elapsed=5,
+        ))
+
+        stats = collector.as_dict()['endpoints'][
+            'GET /repos/{owner}/{repo}/issues/{id}'
+        ]
+        assert stats['requests'] == 3
+        assert stats['statuses'] == {200: 2, 404: 1}
+        assert stats['latency']['buckets'] == {0.1: 0, 1: 2, '+Inf': 3}
+        assert stats['latency']['sum'] == 6
+        assert stats['bytes_received'] == 12
+
+    def test_records_bytes_sent_cache_hits_and_retries(self):
+        collector = metrics.MetricsCollector()
+        url = 'https://api.github.com/repos/a/b/issues'
+        response = build_response(url, method='POST', data='{"title": "x"}')
+        response.from_cache = True
+        collector.on_response(response)
+        collector.on_retry(response, 1, 7)
+
+        stats = collector.as_dict()['endpoints'][
+            'POST /repos/{owner}/{repo}/issues'
+        ]
+        assert stats['bytes_sent'] == 14
+        assert stats['cache_hits'] == 1
+        assert stats['retries'] == 1
+
+    def test_records_ratelimit_remaining(self):
+        collector = metrics.MetricsCollector()
+        collector.on_response(build_response(
+            'https://api.github.com/search/code?q=x',
+            headers={'X-RateLimit-Remaining': '29'}
+        ))
+        collector.on_response(build_response(
+            'https://api.github.com/user',
+            headers={'X-RateLimit-Remaining': '4999'}
+        ))
+
+        assert collector.as_dict()['ratelimit_remaining'] == {
+            'search': 29, 'core': 4999,
+        }
+
+    def test_prometheus(self):
+        collector = metrics.MetricsCollector(buckets=(1,))
+        collector.on_response(build_response(
+            'https://api.github.com/users/octocat',
+            headers={'X-RateLimit-Remaining': '10'}
+        ))
+        text = collector.prometheus()
+
+        labels = 'endpoint="/users/{user}",method="GET"'
+        assert '# TYPE github3_request_duration_seconds histogram' in text
+        assert ('github3_requests_total{' + labels + ',status="200"} 1'
+                in text)
+        assert ('github3_request_duration_seconds_bucket{' + labels +
+                ',le="+Inf"} 1' in text)
+        assert 'github3_response_bytes_total{' + labels + '} 2' in text
+        assert 'github3_ratelimit_remaining{resource="core"} 10' in text
+
+    def test_reset(self):
+        collector = metrics.MetricsCollector()
+        collector.on_response(build_response('https://api.github.com/user'))
+        collector.reset()
+        assert collector.as_dict() == {'endpoints': {},
+                                       'ratelimit_remaining': {}}
+
+
+class UploadAdapter(BaseAdapter):
+    """Adapter reading the body of every request and creating an asset."""
+
+    def send(self, request, **kwargs):
+        body = request.body
+        if hasattr(body, 'read'):
+            body = body.read()
+        elif not isinstance(body, (bytes, bytearray)):
+            body = b''.join(bytes(chunk) for chunk in body)
+        self.received = len(body)
+        response = build_response(request.url, status_code=201, content=(
+            json.dumps({'url': test_repos_release.url_for('/assets/1'),
+                        'name': 'dist.zip'}).encode('utf-8')
+        ), method=request.method)
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+class TestInstrumentedUploads:
+    def setup_method(self, method):
+        self.adapter = UploadAdapter()
+        session = GitHubSession()
+        session.token_auth('token')
+        session.mount('https://', self.adapter)
+        self.collector = metrics.MetricsCollector()
+        session.instrument(self.collector)
+        self.release = Release(test_repos_release.TestRelease.example_data,
+                               session)
+        self.directory = tempfile.mkdtemp()
+
+    def teardown_method(self, method):
+        shutil.rmtree(self.directory)
+
+    def bytes_sent(self):
+        (stats,) = self.collector.as_dict()['endpoints'].values()
+        return stats['bytes_sent']
+
+    def test_records_streamed_uploads(self):
+        path = os.path.join(self.directory, 'dist.zip')
+        with open(path, 'wb') as fd:
+            fd.write(b'x' * 1000)
+        self.release.upload_asset('application/zip', 'dist.zip', path=path)
+
+        assert self.adapter.received == 1000
+        assert self.bytes_sent() == 1000
+
+    @pytest.mark.parametrize('asset, size', [
+        (bytearray(b'x' * 10), 10),
+        ((chunk for chunk in [b'x', b'y']), 0),
+    ])
+    def test_records_other_bodies(self, asset, size):
+        self.release.upload_asset('application/zip', 'dist.zip', asset)
+        assert self.bytes_sent() == size
@@ -0,0 +1,172 @@
+import copy
+import json
+import os
+import pickle
+
+import pytest
+
+from github3 import models, session
+from github3.git import Blob, Hash, Tree
+from github3.issues.label import Label
+from github3.repos.comparison import Comparison
+from github3.repos.repo import Repository
+from github3.users import User
+
+from .helper import mock
+
+
+def load_fixture(name):
+    path = os.path.join(os.path.dirname(__file__), '..', 'json', name)
+    with open(path) as fd:
+        return json.load(fd)
+
+
+class TestGitHubCore:
+    def test_creates_session_lazily(self):
+        """Verify objects built without a session only create one on use."""
+        with mock.patch.object(models, 'GitHubSession') as GitHubSession:
+            core = models.GitHubCore({})
+            assert GitHubSession.called is False
+            assert core.session is GitHubSession.return_value
+            assert core.session is GitHubSession.return_value
+        assert GitHubSession.call_count == 1
+
+    def test_shares_the_session_of_a_parent(self):
+        s = session.GitHubSession()
+        parent = models.GitHubCore({}, s)
+        child = models.GitHubCore({}, parent)
+        assert child.session is s
+
+    def test_session_can_be_assigned(self):
+        core = models.GitHubCore({})
+        s = session.GitHubSession()
+        core.session = s
+        assert core.session is s
+
+
+class TestNestedObjects:
+    def test_comparison_commits_share_its_session(self):
+        """Verify nested commits do not allocate their own sessions."""
+        s = session.GitHubSession()
+        comparison = Comparison(load_fixture('comparison'), s)
+        assert comparison.base_commit.session is s
+        assert all(c.session is s for c in comparison.commits)
+
+    def test_session_less_comparison_allocates_no_sessions(self):
+        with mock.patch.object(models, 'GitHubSession') as GitHubSession:
+            Comparison(load_fixture('comparison'))
+        assert GitHubSession.called is False
+
+
+class TestLazyObjects:
+    def test_attributes_are_decoded_on_first_access(self):
+        data = load_fixture('repo')
+        with mock.patch.object(Repository, '_update_attributes',
+                               autospec=True) as update:
+            repository = Repository(data, lazy=True)
+            assert update.called is False
+            repository.as_dict()
+            assert update.called is False
+
+    def test_lazy_objects_match_eager_ones(self):
+        eager = Repository(load_fixture('repo'))
+        lazy = Repository(load_fixture('repo'), lazy=True)
+        assert lazy.full_name == eager.full_name
+        assert lazy.created_at == eager.created_at
+        assert lazy.owner.login == eager.owner.login
+        assert lazy == eager
+        assert hash(lazy) == hash(eager)
+
+    def test_decodes_only_once(self):
+        repository = Repository(load_fixture('repo'), lazy=True)
+        repository.full_name
+        with mock.patch.object(Repository, '_update_attributes') as update:
+            repository.name
+        assert update.called is False
+
+    def test_missing_attributes_still_raise(self):
+        repository = Repository(load_fixture('repo'), lazy=True)
+        with pytest.raises(AttributeError):
+            repository.not_an_attribute
+
+    def test_from_dict_accepts_lazy(self):
+        repository = Repository.from_dict(load_fixture('repo'), lazy=True)
+        assert repository._lazy is True
+
+    def test_survives_pickle(self):
+        repository = Repository(load_fixture('repo'), lazy=True)
+        loaded = pickle.loads(pickle.dumps(repository))
+        assert loaded.full_name == 'sigmavirus24/github3.py'
+        assert loaded == Repository(load_fixture('repo'))
+
+    def test_survives_copy(self):
+        for (cls, fixture) in ((Repository, 'repo'), (User, 'user')):
+            lazy = cls(load_fixture(fixture), lazy=True)
+            eager = cls(load_fixture(fixture))
+            assert copy.copy(lazy).as_dict() == eager.as_dict()
+            assert copy.deepcopy(lazy) == eager
+
+
+def hash_data(sha='a' * 40):
+    return {'path': 'src/setup.py', 'mode': '100644', 'type': 'blob',
+            'size': 30, 'sha': sha,
+            'url': 'https://api.github.com/repos/o/r/git/blobs/' + sha}
+
+
+class TestCompactObjects:
+    def test_leaf_objects_have_no_dict(self):
+        for obj in (Hash(hash_data()),
+                    Label({'url': 'https://api.github.com/label',
+                           'name': 'bug', 'color': 'fc2929'})):
+            assert not hasattr(obj, '__dict__')
+
+    def test_keeps_the_json_by_default(self):
+        data = hash_data()
+        data['extra'] = True
+        h = Hash(data)
+        assert h.as_dict() is data
+
+    def test_rebuilds_the_json_of_compact_objects(self):
+        h = Hash(hash_data(), compact=True)
+        assert h._json_data is None
+        assert h.sha == 'a' * 40
+        assert h.as_dict() == hash_data()
+        assert json.loads(h.as_json()) == hash_data()
+
+    def test_label_url(self):
+        data = {'url': 'https://api.github.com/repos/o/r/labels/bug',
+                'name': 'bug', 'color': 'fc2929'}
+        for label in (Label(dict(data)), Label(dict(data), compact=True)):
+            assert label.url == data['url']
+            assert label._api == data['url']
+            assert label._uri.path == '/repos/o/r/labels/bug'
+        assert Label(dict(data), compact=True).as_dict() == data
+
+    def test_compact_blob(self):
+        data = {'content': 'Zm9v', 'encoding': 'base64', 'size': 3,
+                'sha': 'b' * 40, 'url': 'https://api.github.com/blob'}
+        blob = Blob(dict(data), compact=True)
+        assert blob.decoded == b'foo'
+        assert blob.as_dict() == data
+
+    def test_compact_objects_are_not_lazy(self):
+        assert Hash(hash_data(), lazy=True, compact=True)._lazy is False
+
+    def test_rejects_compact_for_other_objects(self):
+        with pytest.raises(TypeError):
+            models.GitHubObject({}, compact=True)
+
+    def test_slotted_objects_can_be_lazy(self):
+        h = Hash(hash_data(), lazy=True)
+        assert h._lazy is True
+        assert h.path == 'src/setup.py'
+
+    def test_compact_tree(self):
+        data = {'sha': 'c' * 40, 'url': 'https://api.github.com/tree',
+                'tree': [hash_data('d' * 40), hash_data('e' * 40)]}
+        tree = Tree(json.loads(json.dumps(data)), compact=True)
+
+        assert [h.sha for h in tree.tree] == ['d' * 40, 'e' * 40]
+        assert tree.tree[0]._json_data is None
+        assert 'tree' not in tree._json_data
+        assert tree.as_dict() == data
@@ -0,0 +1,130 @@
+import pytest
+
+from github3 import ratelimit
+
+from .helper import build_response, mock
+
+
+def limit_headers(remaining, reset=1000, limit=5000):
+    return {
+        'X-RateLimit-Limit': str(limit),
+        'X-RateLimit-Remaining': str(remaining),
+        'X-RateLimit-Reset': str(reset),
+    }
+
+
+class FrozenScheduler(ratelimit.RateLimitScheduler):
+    now = 900.0
+
+    def clock(self):
+        return self.now
+
+
+@pytest.mark.parametrize('url,resource', [
+    ('https://api.github.com/search/code?q=foo', 'search'),
+    ('https://ghe.example.com/api/v3/search/issues', 'search'),
+    ('https://api.github.com/repos/foo/search', 'core'),
+    ('https://api.github.com/users', 'core'),
+])
+def test_resource_for(url, resource):
+    assert ratelimit.resource_for(url) == resource
+
+
+class TestRateLimitScheduler:
+    def test_remaining_is_unknown_initially(self):
+        assert ratelimit.RateLimitScheduler().remaining() is None
+
+    def test_update_records_headers(self):
+        scheduler = ratelimit.RateLimitScheduler()
+        scheduler.update(build_response(headers=limit_headers(42)))
+        assert scheduler.remaining() == 42
+        assert scheduler.resources['core'] == {
+            'limit': 5000, 'remaining': 42, 'reset': 1000,
+        }
+
+    def test_update_uses_the_resource_of_the_url(self):
+        scheduler = ratelimit.RateLimitScheduler()
+        scheduler.update(build_response(
+            url='https://api.github.com/search/code', headers=limit_headers(9)
+        ))
+        assert scheduler.remaining('search') == 9
+        assert scheduler.remaining('core') is None
+
+    def test_update_ignores_responses_without_headers(self):
+        scheduler = ratelimit.RateLimitScheduler()
+        scheduler.update(build_response())
+        assert scheduler.resources == {}
+
+    def test_delay_reserves_requests_from_the_budget(self):
+        scheduler = ratelimit.RateLimitScheduler()
+        scheduler.update(build_response(headers=limit_headers(2)))
+        assert scheduler.delay('https://api.github.com/user') == 0
+        assert scheduler.remaining() == 1
+
+    def test_budget_does_not_go_below_zero(self):
+        scheduler = ratelimit.RateLimitScheduler()
+        scheduler.update(build_response(headers=limit_headers(0)))
+        scheduler.delay('https://api.github.com/user')
+        scheduler.delay('https://api.github.com/user')
+        assert scheduler.remaining() == 0
+
+    def test_does_not_wait_by_default(self):
+        scheduler = FrozenScheduler()
+        scheduler.update(build_response(headers=limit_headers(0)))
+        assert scheduler.delay('https://api.github.com/user') == 0
+
+    def test_waits_for_reset_when_exhausted(self):
+        scheduler = FrozenScheduler(wait=True)
+        scheduler.update(build_response(headers=limit_headers(0, reset=1000)))
+        assert scheduler.delay('https://api.github.com/user') == 101
+
+    def test_does_not_wait_longer_than_max_wait(self):
+        scheduler = FrozenScheduler(wait=True, max_wait=60)
+        scheduler.update(build_response(headers=limit_headers(0, reset=1000)))
+        with mock.patch.object(ratelimit, '__logs__') as logs:
+            assert scheduler.delay('https://api.github.com/user') == 0
+        assert logs.warning.called is True
+
+    def test_token_bucket_paces_requests(self):
+        scheduler = FrozenScheduler(rate=2, burst=1)
+        url = 'https://api.github.com/user'
+        assert scheduler.delay(url) == 0
+        assert scheduler.delay(url) == 0.5
+        scheduler.now += 10
+        assert scheduler.delay(url) == 0
+
+    def test_retries_abuse_limits_when_asked(self):
+        response = build_response(status_code=403,
+                                  headers={'Retry-After': '30'})
+        assert ratelimit.RateLimitScheduler().retry_after(response, 0) is None
+        scheduler = ratelimit.RateLimitScheduler(retry_abuse=True)
+        assert scheduler.retry_after(response, 0) == 30
+        assert scheduler.retry_after(response, 3) is None
+
+    def test_retries_exhausted_limits_when_waiting(self):
+        scheduler = FrozenScheduler(wait=True)
+        response = build_response(status_code=403,
+                                  headers=limit_headers(0, reset=950))
+        assert scheduler.retry_after(response, 0) == 51
+
+    def test_does_not_retry_other_responses(self):
+        scheduler = FrozenScheduler(wait=True, retry_abuse=True)
+        for status_code in (404, 403):
+            response = build_response(status_code=status_code)
+            assert scheduler.retry_after(response, 0) is None
+
+    def test_waits_for_some_resources_in_a_block(self):
+        scheduler = FrozenScheduler()
+        search = 'https://api.github.com/search/code?q=foo'
+        scheduler.update(build_response(search,
+                                        headers=limit_headers(0, reset=1000)))
+        scheduler.update(build_response(headers=limit_headers(0, reset=1000)))
+        response = build_response(search, 403,
+                                  headers=limit_headers(0, reset=950))
+
+        with scheduler.waiting('search'):
+            assert scheduler.delay(search) == 101
+            assert scheduler.delay('https://api.github.com/user') == 0
+            assert scheduler.retry_after(response, 0) == 51
+        assert scheduler.delay(search) == 0
+        assert scheduler.retry_after(response, 0) is None
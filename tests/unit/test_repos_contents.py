@@ -0,0 +1,40 @@
+"""Unit tests for the Contents object."""
+from github3.repos.contents import Contents
+
+from .helper import UnitHelper, create_url_helper, mock
+
+url_for = create_url_helper(
+    'https://api.github.com/repos/octocat/Hello-World/contents'
+)
+
+
+class TestContents(UnitHelper):
+    described_class = Contents
+    example_data = {
+        'type': 'file',
+        'encoding': 'base64',
+        'size': 6,
+        'name': 'README',
+        'path': 'README',
+        'content': 'aGVsbG8K',
+        'sha': '3d21ec53a331a6f037a91c368710b99387d012c1',
+        'url': url_for('README') + '?ref=master',
+    }
+
+    def test_decoded_lazily(self):
+        """Test that the content is only decoded when read."""
+        assert self.instance._decoded is None
+        assert self.instance.decoded == b'hello\n'
+        assert self.instance == b'hello\n'
+
+    def test_stream(self):
+        """Test streaming the raw content of the file."""
+        response = mock.Mock(status_code=200, headers={})
+        response.iter_content.return_value = [b'hello\n']
+        self.session.get.return_value = response
+
+        assert list(self.instance.stream()) == [b'hello\n']
+        self.session.get.assert_called_once_with(
+            url_for('README') + '?ref=master', stream=True,
+            headers={'Accept': 'application/vnd.github.v3.raw'}
+        )
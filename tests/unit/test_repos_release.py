@@ -1,9 +1,15 @@
 from github3.repos.release import Release, Asset
+from github3 import exceptions
 
 from .helper import UnitHelper, UnitIteratorHelper, create_url_helper, mock
 
+import hashlib
 import json
+import os
 import pytest
+import shutil
+import tempfile
+import threading
 
 url_for = create_url_helper(
     'https://api.github.com/repos/octocat/Hello-World/releases'
@@ -57,6 +63,108 @@ class TestRelease(UnitHelper):
         )
 
 
+class TestReleaseUploads(UnitHelper):
+    described_class = Release
+    example_data = TestRelease.example_data
+    content = bytes(bytearray(i % 251 for i in range(200000)))
+
+    def after_setup(self):
+        self.bodies = []
+        self.failures = 0
+        self.session.post.side_effect = self.post
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'dist.zip')
+        with open(self.path, 'wb') as fd:
+            fd.write(self.content)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def post(self, url, data, headers=None, **kwargs):
+        if isinstance(data, bytes) or hasattr(data, 'read'):
+            body = data if isinstance(data, bytes) else data.read()
+        else:
+            body = b''.join(bytes(chunk) for chunk in data)
+        self.bodies.append((url, body, headers))
+        response = mock.Mock(status_code=201)
+        if self.failures:
+            self.failures -= 1
+            response.status_code = 500
+            response.json.return_value = {'message': 'Error'}
+        response.content = json.dumps(
+            {'url': url_for('/assets/1'), 'name': 'dist.zip'}
+        ).encode('utf-8')
+        return response
+
+    def test_upload_bytes(self):
+        self.instance.upload_asset('text/plain', 'a.txt', b'hello')
+
+        (url, body, headers) = self.bodies[0]
+        assert url == url_for('/1/assets?name=a.txt')
+        assert body == b'hello'
+        assert headers['Content-Type'] == 'text/plain'
+
+    def test_upload_path(self):
+        progress = []
+        asset = self.instance.upload_asset(
+            'application/zip', 'dist.zip', path=self.path,
+            progress=lambda sent, total: progress.append((sent, total)))
+
+        assert isinstance(asset, Asset)
+        (url, body, headers) = self.bodies[0]
+        assert body == self.content
+        assert headers['Content-Length'] == str(len(self.content))
+        assert progress[-1] == (len(self.content), len(self.content))
+        assert len(progress) > 1
+
+    def test_upload_path_without_buffer_support(self):
+        """Test that mappings are sliced when they cannot be viewed."""
+        with mock.patch('github3.repos.release.memoryview', create=True,
+                        side_effect=TypeError):
+            self.instance.upload_asset('application/zip', 'dist.zip',
+                                       path=self.path)
+
+        assert self.bodies[0][1] == self.content
+
+    def test_upload_file_object(self):
+        with open(self.path, 'rb') as fd:
+            fd.seek(100)
+            self.instance.upload_asset('application/zip', 'dist.zip', fd)
+
+        (url, body, headers) = self.bodies[0]
+        assert body == self.content[100:]
+        assert headers['Content-Length'] == str(len(self.content) - 100)
+
+    def test_upload_requires_one_source(self):
+        with pytest.raises(ValueError):
+            self.instance.upload_asset('text/plain', 'a.txt')
+        with pytest.raises(ValueError):
+            self.instance.upload_asset('text/plain', 'a.txt', b'a',
+                                       path=self.path)
+
+    def test_upload_assets_retries(self):
+        self.failures = 1
+        progress = set()
+        assets = self.instance.upload_assets([
+            {'content_type': 'application/zip', 'name': 'dist.zip',
+             'path': self.path},
+        ], progress=lambda name, sent, total: progress.add(name))
+
+        assert isinstance(assets[0], Asset)
+        assert len(self.bodies) == 2
+        assert self.bodies[1][1] == self.content
+        assert progress == set(['dist.zip'])
+
+    def test_upload_assets_returns_errors(self):
+        self.failures = 3
+        assets = self.instance.upload_assets([
+            {'content_type': 'text/plain', 'name': 'a.txt', 'asset': b'a'},
+        ], retries=1)
+
+        assert isinstance(assets[0], exceptions.GitHubError)
+        assert len(self.bodies) == 2
+
+
 class TestReleaseIterators(UnitIteratorHelper):
 
     """Test iterator methods on the Release class."""
@@ -131,3 +239,98 @@ class TestAsset(UnitHelper):
         assert json.loads(kwargs['data']) == {
             'name': 'new name', 'label': 'label'
             }
+
+
+class TestAssetSegmentedDownload(UnitHelper):
+    described_class = Asset
+    example_data = TestAsset.example_data
+    content = bytes(bytearray(i % 251 for i in range(1024)))
+    location = 'https://s3.amazonaws.com/github/example.zip'
+
+    def after_setup(self):
+        self.session.no_auth.return_value = mock.MagicMock()
+        self.session.get.side_effect = self.get
+        self.ranges = []
+        self.honour_ranges = True
+        self.failing = set()
+        self.lock = threading.Lock()
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'example.zip')
+        self.record = self.path + '.segments'
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def get(self, url, headers=None, **kwargs):
+        response = mock.Mock(headers={})
+        if url == self.example_data['url']:
+            response.status_code = 302
+            response.headers['location'] = self.location
+            return response
+        body = self.content
+        rng = headers.get('Range')
+        if rng and self.honour_ranges:
+            start, end = map(int, rng[len('bytes='):].split('-'))
+            with self.lock:
+                self.ranges.append(start)
+            if start in self.failing:
+                response.status_code = 500
+                response.json.return_value = {'message': 'Error'}
+                return response
+            body = body[start:end + 1]
+            response.status_code = 206
+        else:
+            response.status_code = 200
+        response.iter_content.side_effect = lambda chunk_size: [
+            body[i:i + chunk_size] for i in range(0, len(body), chunk_size)]
+        return response
+
+    def download(self, **kwargs):
+        kwargs.setdefault('workers', 4)
+        kwargs.setdefault('segment_size', 100)
+        return self.instance.download(self.path, **kwargs)
+
+    def read(self):
+        with open(self.path, 'rb') as fd:
+            return fd.read()
+
+    def test_segments(self):
+        checksum = hashlib.sha256()
+        assert self.download(checksum=checksum) == self.path
+
+        assert self.read() == self.content
+        assert sorted(self.ranges) == list(range(0, 1024, 100))
+        assert checksum.hexdigest() == hashlib.sha256(self.content).hexdigest()
+        assert not os.path.exists(self.record)
+
+    def test_ranges_not_supported(self):
+        self.honour_ranges = False
+        checksum = hashlib.sha256()
+        self.download(checksum=checksum)
+
+        assert self.read() == self.content
+        assert checksum.hexdigest() == hashlib.sha256(self.content).hexdigest()
+
+    def test_resume(self):
+        self.failing = set([300, 700])
+        with pytest.raises(exceptions.GitHubError):
+            self.download()
+        assert os.path.getsize(self.path) == 1024
+        assert os.path.exists(self.record)
+
+        self.failing = set()
+        self.ranges = []
+        self.download(resume=True)
+        assert self.read() == self.content
+        assert sorted(self.ranges) == [300, 700]
+        assert not os.path.exists(self.record)
+
+    def test_resume_ignores_other_downloads(self):
+        with open(self.path, 'wb') as fd:
+            fd.write(b'x' * 2048)
+        with open(self.record, 'w') as fd:
+            fd.write('2048 100\n0\n1\n')
+        self.download(resume=True)
+
+        assert self.read() == self.content
+        assert len(self.ranges) == 11
@@ -1,8 +1,11 @@
 """Unit tests for Repositories."""
 import datetime
+import json
+import mock
 import pytest
 
 from github3 import GitHubError
+from github3.cache import ObjectCache
 from github3.null import NullObject
 from github3.repos.repo import Repository
 
@@ -240,6 +243,15 @@ class TestRepository(UnitHelper):
             params={'ref': 'some-sha'}
         )
 
+    def test_issues_by_number(self):
+        """Verify that every issue is requested."""
+        results = self.instance.issues_by_number([1, 2, 3], workers=2)
+
+        assert len(results) == 3
+        requested = sorted(c[0][0] for c in self.session.get.call_args_list)
+        assert requested == [url_for('issues/1'), url_for('issues/2'),
+                             url_for('issues/3')]
+
     def test_key(self):
         """Test the ability to fetch a deploy key."""
         self.instance.key(10)
@@ -278,6 +290,97 @@ class TestRepository(UnitHelper):
 
         self.session.get.assert_called_once_with(url_for('pages'))
 
+    def test_stream_file(self):
+        """Test streaming the raw content of a file."""
+        response = mock.Mock(status_code=200, headers={})
+        response.iter_content.return_value = [b'abc', b'def']
+        self.session.get.return_value = response
+        chunks = self.instance.stream_file('setup.py', ref='v1', chunk_size=3)
+
+        assert b''.join(chunks) == b'abcdef'
+        self.session.get.assert_called_once_with(
+            url_for('contents/setup.py'), params={'ref': 'v1'}, stream=True,
+            headers={'Accept': 'application/vnd.github.v3.raw'}
+        )
+        response.iter_content.assert_called_once_with(chunk_size=3)
+        response.close.assert_called_once_with()
+
+    def test_stream_blob_to_file(self):
+        """Test writing the raw content of a blob to a file."""
+        response = mock.Mock(status_code=200, headers={})
+        self.session.get.return_value = response
+        with mock.patch('github3.models.stream_response_to_file') as stream:
+            self.instance.stream_blob('abc', to='blob.bin')
+
+        self.session.get.assert_called_once_with(
+            url_for('git/blobs/abc'), stream=True,
+            headers={'Accept': 'application/vnd.github.v3.raw'}
+        )
+        stream.assert_called_once_with(response, 'blob.bin', 256 * 1024)
+
+    def test_stream_missing_file(self):
+        """Test that streaming a missing file returns None."""
+        response = mock.Mock(status_code=404)
+        self.session.get.return_value = response
+        assert self.instance.stream_file('missing') is None
+        response.close.assert_called_once_with()
+
+    def test_stream_closes_errors(self):
+        """Test that the connection is released when streaming fails."""
+        response = mock.Mock(status_code=500, headers={}, content=b'{}')
+        response.json.return_value = {'message': 'Server Error'}
+        self.session.get.return_value = response
+        with pytest.raises(GitHubError):
+            self.instance.stream_blob('abc')
+        response.close.assert_called_once_with()
+
+
+class TestRepositoryObjectCache(UnitHelper):
+
+    """Test that objects addressed by a SHA are served from the cache."""
+
+    described_class = Repository
+    example_data = repo_example_data
+    sha = '6dcb09b5b57875f334f61aebed695e2e4193db5e'
+
+    def after_setup(self):
+        self.session.object_cache = ObjectCache()
+        self.session.headers = {'Accept': 'application/vnd.github.v3+json'}
+        response = mock.Mock(status_code=200, headers={})
+        response.content = json.dumps({
+            'url': url_for('git/blobs/' + self.sha), 'sha': self.sha,
+            'content': 'aGVsbG8=', 'encoding': 'base64', 'size': 5,
+        }).encode('utf-8')
+        self.session.get.return_value = response
+
+    def test_objects_are_requested_once(self):
+        for method in ('blob', 'commit', 'git_commit', 'tag', 'tree'):
+            first = getattr(self.instance, method)(self.sha)
+            second = getattr(self.instance, method)(self.sha)
+            assert first.as_dict() == second.as_dict()
+        assert self.session.get.call_count == 5
+
+    def test_contents_at_a_sha(self):
+        self.instance.file_contents('README', ref=self.sha)
+        self.instance.file_contents('README', ref=self.sha)
+        self.instance.file_contents('LICENSE', ref=self.sha)
+        assert self.session.get.call_count == 2
+
+    def test_names_are_not_cached(self):
+        self.instance.tree('master')
+        self.instance.tree('master')
+        self.instance.file_contents('README', ref='master')
+        self.instance.file_contents('README', ref='master')
+        assert self.session.get.call_count == 4
+
+    def test_shared_between_sessions(self):
+        self.instance.blob(self.sha)
+        other = Repository(repo_example_data, self.create_session_mock())
+        other.session.object_cache = self.session.object_cache
+        other.session.headers = self.session.headers
+        assert other.blob(self.sha).decoded == b'hello'
+        assert other.session.get.called is False
+
 
 class TestRepositoryIterator(UnitIteratorHelper):
 
@@ -0,0 +1,237 @@
+"""Unit tests for the statistics of repositories."""
+import json
+
+import mock
+import pytest
+
+import github3
+from github3.repos import stats
+from github3.repos.repo import Repository
+
+from .test_repos_repo import repo_example_data
+
+
+def response(status_code, body=None):
+    r = mock.Mock(status_code=status_code, headers={})
+    r.content = json.dumps(body).encode('utf-8') if body is not None else b''
+    r.json.return_value = body or {'message': 'Error'}
+    return r
+
+
+def repository(name, *responses):
+    session = mock.create_autospec(github3.session.GitHubSession)()
+    session.codec = github3.codec.JSONCodec()
+    session.object_cache = None
+    session.get.side_effect = list(responses)
+    session.build_url.side_effect = lambda *a, **kw: '/'.join(
+        (kw['base_url'],) + a)
+    data = dict(repo_example_data, name=name,
+                url=repo_example_data['url'][:-len('Hello-World')] + name)
+    return Repository(data, session)
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestPollStatistics:
+    def poll(self, repositories, statistic='code_frequency', **kwargs):
+        kwargs.setdefault('base_delay', 0)
+        clock = FakeClock()
+        with mock.patch.object(stats, 'time', clock):
+            results = list(stats.poll_statistics(repositories, statistic,
+                                                 **kwargs))
+        return results, clock.sleeps
+
+    def test_polls_until_ready(self):
+        ready = repository('ready', response(200, [[1, 2, -3]]))
+        later = repository('later', response(202), response(202),
+                           response(200, [[4, 5, -6]]))
+        results, _ = self.poll([later, ready])
+
+        assert results[0] == (ready, [[1, 2, -3]])
+        assert results[1] == (later, [[4, 5, -6]])
+        assert later.session.get.call_count == 3
+        later.session.get.assert_called_with(
+            repo_example_data['url'][:-len('Hello-World')] +
+            'later/stats/code_frequency')
+
+    def test_gives_up_after_the_timeout(self):
+        slow = repository('slow', *[response(202)] * 3)
+        results, _ = self.poll([slow], base_delay=10, timeout=5)
+
+        assert results == [(slow, None)]
+
+    def test_errors_and_empty_repositories(self):
+        broken = repository('broken', response(500))
+        empty = repository('empty', response(204))
+        results = dict(self.poll([broken, empty],
+                                 'contributor_statistics')[0])
+
+        assert isinstance(results[broken], github3.GitHubError)
+        assert results[empty] == []
+
+    def test_builds_the_results_of_each_statistic(self):
+        contributors = repository('c', response(200, [
+            {'author': {'login': 'octocat'}, 'total': 1, 'weeks': []}]))
+        participation = repository('p', response(200, {'all': [1],
+                                                       'owner': [0]}))
+        (_, [result]), = self.poll([contributors],
+                                   'contributor_statistics')[0]
+        assert isinstance(result, stats.ContributorStats)
+        (_, counts), = self.poll([participation], 'weekly_commit_count')[0]
+        assert counts == {'all': [1], 'owner': [0]}
+
+    def test_waits_with_exponential_backoff(self):
+        later = repository('later', response(202), response(202),
+                           response(200, []))
+        with mock.patch.object(stats.random, 'uniform', lambda a, b: b):
+            _, delays = self.poll([later], base_delay=1, max_delay=1.5)
+
+        assert delays == [1, 1.5]
+
+    def test_unknown_statistic(self):
+        with pytest.raises(ValueError):
+            list(stats.poll_statistics([], 'stargazers'))
+
+
+contributors_json = [
+    {'author': {'login': 'octocat'}, 'total': 3, 'weeks': [
+        {'w': 100, 'a': 10, 'd': 1, 'c': 1},
+        {'w': 200, 'a': 20, 'd': 2, 'c': 2},
+    ]},
+    {'author': {'login': 'hubot'}, 'total': 5, 'weeks': [
+        {'w': 100, 'a': 1, 'd': 0, 'c': 4},
+        {'w': 200, 'a': 0, 'd': 5, 'c': 1},
+    ]},
+]
+
+
+class TestStatsColumns:
+    backend = 'array'
+
+    def columns(self, statistic, json):
+        return stats.StatsColumns.from_json(statistic, json, self.backend)
+
+    def test_contributors(self):
+        columns = self.columns('contributor_statistics', contributors_json)
+
+        assert len(columns) == 4
+        assert list(columns.weeks) == [100, 200, 100, 200]
+        assert list(columns.contributors) == [0, 0, 1, 1]
+        assert columns.totals() == {'additions': 31, 'deletions': 8,
+                                    'commits': 8}
+        assert columns.by_contributor() == {
+            'octocat': {'additions': 30, 'deletions': 3, 'commits': 3},
+            'hubot': {'additions': 1, 'deletions': 5, 'commits': 5},
+        }
+        by_week = columns.by_week()
+        assert list(by_week.weeks) == [100, 200]
+        assert list(by_week.additions) == [11, 20]
+        assert list(by_week.commits) == [5, 3]
+
+    def test_code_frequency_and_commit_activity(self):
+        frequency = self.columns('code_frequency', [[100, 5, -2]])
+        assert list(frequency.deletions) == [2]
+        assert frequency.by_contributor() == {}
+
+        activity = self.columns('commit_activity', [
+            {'week': 100, 'total': 7, 'days': [1, 1, 1, 1, 1, 1, 1]}])
+        assert list(activity.commits) == [7]
+
+    def test_weekly_commit_count(self):
+        columns = self.columns('weekly_commit_count',
+                               {'all': [3, 4], 'owner': [1, 0]})
+        assert list(columns.by_week().commits) == [3, 4]
+        assert columns.by_contributor()['others']['commits'] == 6
+
+    def test_combine(self):
+        first = self.columns('code_frequency', [[100, 5, -2], [200, 1, 0]])
+        second = self.columns('code_frequency', [[200, 3, -1], [300, 1, 0]])
+        combined = stats.combine([first, second])
+
+        assert combined.backend == self.backend
+        assert list(combined.weeks) == [100, 200, 300]
+        assert list(combined.additions) == [5, 4, 1]
+        assert list(combined.deletions) == [2, 1, 0]
+
+    def test_combine_skips_missing_statistics(self):
+        first = self.columns('code_frequency', [[100, 5, -2]])
+        combined = stats.combine([None, first, ValueError('timeout')])
+
+        assert list(combined.weeks) == [100]
+        assert list(combined.additions) == [5]
+
+    def test_contributor_stats_columns(self):
+        contributor = stats.ContributorStats(dict(contributors_json[0]),
+                                             None)
+        columns = contributor.columns(self.backend)
+        assert list(columns.additions) == [10, 20]
+        assert columns.names == ['octocat']
+
+
+class TestNumpyStatsColumns(TestStatsColumns):
+    backend = 'numpy'
+
+    def setup_method(self, method):
+        pytest.importorskip('numpy')
+
+
+class TestColumnarStatistics:
+    def test_alt_weeks_are_built_lazily(self):
+        contributor = stats.ContributorStats(dict(contributors_json[0]),
+                                             None)
+        assert contributor._alt_weeks is None
+        assert contributor.alt_weeks[1]['additions'] == 20
+
+    def test_unavailable_backend(self):
+        with pytest.raises(ValueError):
+            stats.StatsColumns([], [], [], [], backend='pandas')
+        with mock.patch.object(stats, 'numpy', None):
+            assert stats.StatsColumns([], [], [], []).backend == 'array'
+            with pytest.raises(ValueError):
+                stats.StatsColumns([], [], [], [], backend='numpy')
+
+    def test_poll_columnar_statistics(self):
+        repo = repository('c', response(200, contributors_json))
+        with mock.patch.object(stats, 'time', FakeClock()):
+            (_, columns), = stats.poll_statistics(
+                [repo], columnar=True, backend='array')
+
+        assert isinstance(columns, stats.StatsColumns)
+        assert columns.names == ['octocat', 'hubot']
+
+    def test_repository_methods(self):
+        participation = {'all': [3, 4], 'owner': [1, 0]}
+        repo = repository('c', response(200, contributors_json),
+                          response(200, [[100, 5, -2], [200, 1, 0]]),
+                          response(200, [{'week': 100, 'total': 3,
+                                          'days': [3, 0, 0, 0, 0, 0, 0]}]),
+                          response(200, participation))
+
+        contributors = repo.contributor_statistics(columnar=True,
+                                                   backend='array')
+        assert contributors.names == ['octocat', 'hubot']
+        code = repo.code_frequency(number=1, columnar=True, backend='array')
+        assert list(code.deletions) == [2]
+        activity = repo.commit_activity(columnar=True, backend='array')
+        assert list(activity.commits) == [3]
+        weekly = repo.weekly_commit_count(columnar=True, backend='array')
+        assert weekly.by_contributor()['others']['commits'] == 6
+
+    def test_repository_methods_while_computing(self):
+        repo = repository('c', response(202), response(304))
+        assert repo.code_frequency(columnar=True) is None
+        assert repo.contributor_statistics(etag='"a"', columnar=True) is None
+        repo.session.get.assert_called_with(
+            repo._build_url('stats', 'contributors', base_url=repo._api),
+            headers={'If-None-Match': '"a"'})
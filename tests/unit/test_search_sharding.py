@@ -0,0 +1,228 @@
+"""Unit tests for sharded searches."""
+import json
+import os
+import re
+import threading
+
+from datetime import date, datetime, timedelta
+
+import mock
+import pytest
+import requests
+
+from requests.adapters import BaseAdapter
+from requests.compat import urlparse
+
+from github3.github import GitHub
+from github3.search import sharding
+
+try:
+    from urllib.parse import parse_qs
+except ImportError:  # (No coverage)
+    from urlparse import parse_qs
+
+from .helper import UnitHelper
+
+
+class FakeSearch(object):
+
+    """Search API over ``items``, capping results at the search limit."""
+
+    def __init__(self, items, qualifier='created'):
+        self.items = items
+        self.qualifier = qualifier
+        self.queries = []
+
+    def _build_url(self, *args):
+        return 'https://api.github.com/' + '/'.join(args)
+
+    def _get(self, url, params=None, headers=None):
+        return params['q']
+
+    def matching(self, query):
+        self.queries.append(query)
+        (low, high) = re.search(self.qualifier + r':(\S+)\.\.(\S+)',
+                                query).groups()
+        if self.qualifier == 'size':
+            (low, high) = (int(low), int(high))
+        return [i for i in self.items
+                if low <= i[self.qualifier] <= high]
+
+    def _json(self, query, status_code):
+        return {'total_count': len(self.matching(query))}
+
+    def _search_iter(self, count, url, cls, params, etag, headers):
+        results = []
+        for item in self.matching(params['q'])[:sharding.SEARCH_LIMIT]:
+            results.append(mock.Mock(**{'as_dict.return_value': item}))
+        return results
+
+
+def dated_items(n, start=datetime(2015, 1, 1), step=timedelta(hours=1)):
+    return [{'url': 'https://api.github.com/repos/o/r{0}'.format(i),
+             'created': (start + i * step).strftime(sharding._format)}
+            for i in range(n)]
+
+
+class TestShardedSearch:
+    def search(self, fake, kind='repositories', **kwargs):
+        kwargs.setdefault('start', date(2015, 1, 1))
+        kwargs.setdefault('end', datetime(2016, 1, 1))
+        return sharding.ShardedSearch(fake, kind, 'language:python',
+                                      **kwargs)
+
+    def test_splits_until_shards_fit(self):
+        fake = FakeSearch(dated_items(2500))
+        search = self.search(fake)
+        results = list(search)
+
+        assert len(results) == 2500
+        assert sum(count for (_, count) in search.shard_counts) == 2500
+        assert all(count <= sharding.SEARCH_LIMIT
+                   for (_, count) in search.shard_counts)
+        assert all(q.startswith('language:python created:')
+                   for (q, _) in search.shard_counts)
+
+    def test_removes_duplicates(self):
+        items = dated_items(1500)
+        fake = FakeSearch(items + items[:10])
+        assert len(list(self.search(fake))) == 1500
+
+    def test_small_queries_are_not_split(self):
+        fake = FakeSearch(dated_items(10))
+        search = self.search(fake)
+        assert len(list(search)) == 10
+        assert len(search.shard_counts) == 1
+
+    def test_shards_on_sizes(self):
+        items = [{'url': str(i), 'size': i % 700} for i in range(3000)]
+        fake = FakeSearch(items, 'size')
+        search = self.search(fake, qualifier='size', start=None, end=1000)
+        assert len(list(search)) == 3000
+
+    def test_stops_at_the_smallest_range(self):
+        items = dated_items(1200, step=timedelta(0))
+        search = self.search(FakeSearch(items))
+        assert len(list(search)) == sharding.SEARCH_LIMIT
+        assert search.shard_counts[0][1] == 1200
+
+    def test_validates_the_qualifier(self):
+        fake = FakeSearch([])
+        with pytest.raises(ValueError):
+            self.search(fake, kind='code', qualifier='created')
+        with pytest.raises(ValueError):
+            self.search(fake, kind='stars')
+        with pytest.raises(ValueError):
+            sharding.ShardedSearch(fake, 'users', 'created:>2015-01-01')
+
+    def test_default_qualifiers(self):
+        fake = FakeSearch([])
+        assert self.search(fake, kind='code', start=0,
+                           end=10).qualifier == 'size'
+        assert self.search(fake, kind='users').qualifier == 'created'
+
+
+class RateLimitedSearchAdapter(BaseAdapter):
+
+    """Search API allowing ``limit`` requests per minute of ``clock``."""
+
+    def __init__(self, search, clock, limit):
+        super(RateLimitedSearchAdapter, self).__init__()
+        self.search = search
+        self.clock = clock
+        self.limit = limit
+        self.remaining = limit
+        self.reset = clock.now + 60
+        self.rejected = 0
+        self.lock = threading.Lock()
+        path = os.path.join(os.path.dirname(__file__), '..', 'json', 'repo')
+        with open(path) as fd:
+            self.repository = json.load(fd)
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.url = request.url
+        response.request = request
+        response.encoding = 'utf-8'
+        with self.lock:
+            if self.clock.now >= self.reset:
+                self.remaining = self.limit
+                self.reset = self.clock.now + 60
+            if self.remaining == 0:
+                self.rejected += 1
+                response.status_code = 403
+                body = {'message': 'API rate limit exceeded'}
+            else:
+                self.remaining -= 1
+                response.status_code = 200
+                body = self.page(request.url, response)
+            response.headers.update({
+                'X-RateLimit-Limit': str(self.limit),
+                'X-RateLimit-Remaining': str(self.remaining),
+                'X-RateLimit-Reset': str(int(self.reset)),
+            })
+        response._content = json.dumps(body).encode('utf-8')
+        return response
+
+    def page(self, url, response):
+        query = dict((k, v[0]) for (k, v) in
+                     parse_qs(urlparse(url).query).items())
+        (per_page, page) = (int(query['per_page']),
+                            int(query.get('page', 1)))
+        matching = self.search.matching(query['q'])
+        if page * per_page < len(matching):
+            response.headers['Link'] = '<{0}&page={1}>; rel="next"'.format(
+                url.split('&page=')[0], page + 1)
+        items = []
+        for item in matching[(page - 1) * per_page:page * per_page]:
+            items.append(dict(self.repository, score=1.0, **item))
+        return {'total_count': len(matching), 'items': items}
+
+    def close(self):
+        pass
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 1000.0
+        self.lock = threading.Lock()
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        with self.lock:
+            self.now += seconds
+
+
+class TestShardedSearchRateLimit:
+    def test_waits_for_the_search_budget(self):
+        """Test that sharding outlasts the search rate limit."""
+        clock = FakeClock()
+        fake = FakeSearch(dated_items(2500))
+        adapter = RateLimitedSearchAdapter(fake, clock, limit=10)
+        g = GitHub(token='token')
+        g.session.mount('https://', adapter)
+        g.session.ratelimit.clock = clock.time
+        g.session.sleep = clock.sleep
+
+        search = g.search_sharded('repositories', 'language:python',
+                                  start=date(2015, 1, 1),
+                                  end=datetime(2016, 1, 1))
+        results = list(search)
+
+        assert len(results) == 2500
+        assert clock.now >= 1060
+        assert g.session.ratelimit.wait is False
+
+
+class TestGitHubSearchSharded(UnitHelper):
+    described_class = mock.Mock
+
+    def test_search_sharded(self):
+        from github3.github import GitHub
+        g = GitHub()
+        search = g.search_sharded('issues', 'is:open', 'updated')
+        assert isinstance(search, sharding.ShardedSearch)
+        assert search.url == 'https://api.github.com/search/issues'
+        assert search.bounds[0] == sharding.EPOCH
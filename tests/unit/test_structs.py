@@ -1,5 +1,17 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+
+import pytest
+import requests
+
 from .helper import UnitHelper, mock
-from github3.structs import GitHubIterator
+from github3.git import Hash
+from github3.cache import MemoryCache
+from github3.structs import (GitHubIterator, JSONItemScanner, SearchIterator,
+                             page_key, page_number, page_url)
 
 
 class TestGitHubIterator(UnitHelper):
@@ -19,6 +31,7 @@ class TestGitHubIterator(UnitHelper):
     def test_sets_per_page_to_100(self):
         """Test that the Iterator defaults the per_page parameter to 100"""
         self.session.get.return_value = mock.Mock(status_code=200,
+                                                  content=b'[]',
                                                   json=lambda: [],
                                                   links={})
 
@@ -35,3 +48,369 @@ class TestGitHubIterator(UnitHelper):
         i = GitHubIterator(count, url, cls, session, headers=headers)
         assert i.headers != {}
         assert i.headers.get('Accept') == 'foo'
+
+
+def ids(iterator):
+    return [item['id'] for item in iterator]
+
+
+def page_response(items, links=None):
+    """Build a JSON page response with the given Link header entries."""
+    response = requests.Response()
+    response.status_code = 200
+    items = [{'id': i} for i in items]
+    response._content = json.dumps(items).encode('utf-8')
+    response.encoding = 'utf-8'
+    if links:
+        response.headers['Link'] = ', '.join(
+            '<{0}>; rel="{1}"'.format(url, rel) for (rel, url) in links
+        )
+    return response
+
+
+class TestGitHubIteratorPrefetching(UnitHelper):
+    described_class = GitHubIterator
+    url = 'https://api.github.com/users'
+
+    def create_instance_of_described_class(self):
+        return self.described_class(count=-1, url=self.url,
+                                    cls=dict,
+                                    session=self.session, prefetch=2)
+
+    def page(self, number):
+        return self.url + '?per_page=100&page={0}'.format(number)
+
+    def responses_by_url(self, responses):
+        def get(url, **kwargs):
+            return responses[url]
+        self.session.get.side_effect = get
+
+    def test_defaults_to_no_prefetching(self):
+        """Test that iterators fetch pages serially by default."""
+        i = GitHubIterator(-1, self.url, object, self.session)
+        assert i.prefetch == 0
+
+    def test_page_url(self):
+        """Test that page numbers are substituted in the query string."""
+        url = page_url(self.page(2), 7)
+        assert page_number(url) == 7
+        assert 'per_page=100' in url
+
+    def test_fans_out_numbered_pages(self):
+        """Test that the pages up to rel=last are requested ahead."""
+        last = self.page(4)
+        self.responses_by_url({
+            self.url: page_response([1], [('next', self.page(2)),
+                                          ('last', last)]),
+            self.page(2): page_response([2], [('next', self.page(3)),
+                                              ('last', last)]),
+            self.page(3): page_response([3], [('next', last),
+                                              ('last', last)]),
+            last: page_response([4]),
+        })
+
+        assert ids(self.instance) == [1, 2, 3, 4]
+        urls = [c[0][0] for c in self.session.get.call_args_list]
+        assert sorted(urls) == sorted([self.url, self.page(2),
+                                       self.page(3), last])
+
+    def test_follows_rel_next_without_rel_last(self):
+        """Test that the next page is requested when rel=last is absent."""
+        self.responses_by_url({
+            self.url: page_response([1, 2], [('next', self.page(2))]),
+            self.page(2): page_response([3]),
+        })
+
+        assert ids(self.instance) == [1, 2, 3]
+        assert self.session.get.call_count == 2
+
+    def test_does_not_prefetch_pages_beyond_count(self):
+        """Test that a limited iterator does not request unneeded pages."""
+        last = self.page(3)
+        self.responses_by_url({
+            self.url: page_response([1, 2], [('next', self.page(2)),
+                                             ('last', last)]),
+        })
+        i = GitHubIterator(2, self.url, dict, self.session,
+                           prefetch=2)
+
+        assert ids(i) == [1, 2]
+        assert self.session.get.call_count == 1
+
+
+class TestGitHubIteratorPageStore(UnitHelper):
+    described_class = GitHubIterator
+    url = 'https://api.github.com/orgs/github/members'
+
+    def create_instance_of_described_class(self):
+        return self.described_class(count=-1, url=self.url, cls=dict,
+                                    session=self.session,
+                                    page_store=MemoryCache())
+
+    def after_setup(self):
+        self.next_url = self.url + '?per_page=100&page=2'
+        self.pages = {
+            self.url: ([1, 2], '"a"'),
+            self.next_url: ([3], '"b"'),
+        }
+        self.session.get.side_effect = self.get
+        self.session.headers = {'Authorization': 'token abc'}
+
+    def get(self, url, params=None, headers=None, **kwargs):
+        (items, etag) = self.pages[url]
+        if headers.get('If-None-Match') == etag:
+            response = requests.Response()
+            response.status_code = 304
+        else:
+            links = [('next', self.next_url)] if url == self.url else None
+            response = page_response(items, links)
+            response.headers['ETag'] = etag
+        response.url = url
+        return response
+
+    def sent_etags(self):
+        return [c[1]['headers'].get('If-None-Match')
+                for c in self.session.get.call_args_list]
+
+    def test_serves_unchanged_pages_from_the_store(self):
+        assert ids(self.instance) == [1, 2, 3]
+        assert self.sent_etags() == [None, None]
+
+        self.session.get.reset_mock()
+        assert ids(self.instance.refresh(True)) == [1, 2, 3]
+        assert self.sent_etags() == ['"a"', '"b"']
+        assert self.instance.pages_not_modified == 2
+        assert self.instance.headers == {}
+
+    def test_downloads_changed_pages(self):
+        list(self.instance)
+        self.pages[self.next_url] = ([3, 4], '"c"')
+
+        assert ids(self.instance.refresh()) == [1, 2, 3, 4]
+        assert self.instance.pages_not_modified == 1
+
+        self.session.get.reset_mock()
+        list(self.instance.refresh())
+        assert self.sent_etags() == ['"a"', '"c"']
+
+    def test_shares_the_store_between_iterators(self):
+        list(self.instance)
+        iterator = GitHubIterator(-1, self.url, dict, self.session,
+                                  page_store=self.instance.page_store)
+        assert ids(iterator) == [1, 2, 3]
+        assert iterator.pages_not_modified == 2
+
+    def test_page_key(self):
+        assert (page_key(self.url, {'per_page': 100, 'page': 2}) ==
+                page_key(self.url + '?page=2&per_page=100'))
+        assert (page_key(self.url, headers={'Accept': 'a'}) !=
+                page_key(self.url, headers={'Accept': 'b'}))
+
+
+class TestGitHubIteratorCheckpoints(UnitHelper):
+    described_class = GitHubIterator
+    url = 'https://api.github.com/users'
+
+    def create_instance_of_described_class(self):
+        return self.described_class(count=-1, url=self.url, cls=dict,
+                                    session=self.session)
+
+    def after_setup(self):
+        self.page2 = self.url + '?per_page=100&since=3'
+        self.page3 = self.url + '?per_page=100&since=5'
+        self.responses = {
+            self.url: page_response([1, 2, 3], [('next', self.page2)]),
+            self.page2: page_response([4, 5], [('next', self.page3)]),
+            self.page3: page_response([6]),
+        }
+        self.session.get.side_effect = (
+            lambda url, **kwargs: self.responses[url])
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        super(TestGitHubIteratorCheckpoints, self).tearDown()
+
+    def restore(self, checkpoint):
+        return GitHubIterator.from_checkpoint(
+            json.loads(json.dumps(checkpoint)), self.session)
+
+    def test_resumes_within_a_page(self):
+        iterator = iter(self.instance)
+        assert [next(iterator)['id'] for _ in range(4)] == [1, 2, 3, 4]
+        checkpoint = self.instance.checkpoint()
+        assert checkpoint['last_url'] == self.page2
+        assert checkpoint['offset'] == 1
+
+        self.session.get.reset_mock()
+        assert ids(self.restore(checkpoint)) == [5, 6]
+        self.session.get.assert_any_call(self.page2, params=None,
+                                         headers={})
+
+    def test_resumes_on_the_first_page(self):
+        iterator = iter(self.instance)
+        next(iterator)
+        restored = self.restore(self.instance.checkpoint())
+        assert ids(restored) == [2, 3, 4, 5, 6]
+        self.session.get.assert_called_with(self.page3, params=None,
+                                            headers={})
+        assert self.session.get.call_args_list[-3][1]['params'] == {
+            'per_page': 100}
+
+    def test_restores_the_remaining_count(self):
+        iterator = GitHubIterator(4, self.url, dict, self.session)
+        next(iter(iterator))
+        checkpoint = iterator.checkpoint()
+        assert checkpoint['count'] == 3
+        assert ids(self.restore(checkpoint)) == [2, 3, 4]
+
+    def test_restores_iterators_not_started(self):
+        assert ids(self.restore(self.instance.checkpoint())) == list(
+            range(1, 7))
+
+    def test_saves_checkpoints_every_n_pages(self):
+        path = os.path.join(self.directory, 'users.json')
+        self.instance.checkpoint_path = path
+        self.instance.checkpoint_every = 2
+        iterator = iter(self.instance)
+        for _ in range(5):
+            next(iterator)
+        assert not os.path.exists(path)
+
+        next(iterator)
+        restored = GitHubIterator.from_checkpoint(path, self.session)
+        assert restored.last_url == self.page3
+        assert ids(restored) == [6]
+
+        list(iterator)
+        assert ids(GitHubIterator.from_checkpoint(path, self.session)) == []
+        assert os.listdir(self.directory) == ['users.json']
+
+    def test_imports_the_class_of_the_items(self):
+        iterator = GitHubIterator(-1, self.url, Hash, self.session)
+        restored = self.restore(iterator.checkpoint())
+        assert restored.cls is Hash
+
+    def test_rejects_unknown_checkpoints(self):
+        checkpoint = self.instance.checkpoint()
+        checkpoint['version'] = 0
+        with pytest.raises(ValueError):
+            self.restore(checkpoint)
+
+        iterator = GitHubIterator(-1, self.url, lambda i: i, self.session)
+        with pytest.raises(ValueError):
+            self.restore(iterator.checkpoint())
+
+
+class TestGitHubIteratorLaziness(UnitHelper):
+    described_class = GitHubIterator
+    url = 'https://api.github.com/users'
+
+    def create_instance_of_described_class(self):
+        return self.described_class(count=-1, url=self.url, cls=Hash,
+                                    session=self.session)
+
+    def test_is_eager_by_default(self):
+        self.session.get.return_value = page_response([1])
+        assert next(iter(self.instance))._lazy is False
+
+    def test_builds_lazy_items(self):
+        """Test that lazy iterators defer decoding their items."""
+        self.session.get.return_value = page_response([1])
+        self.instance.lazy = True
+        assert next(iter(self.instance))._lazy is True
+
+
+def streamed_response(body, links=None):
+    """Build a response whose body, JSON or its text, has not been read yet.
+    """
+    if not isinstance(body, str):
+        body = json.dumps(body)
+    response = page_response([], links)
+    response._content = False
+    response.raw = io.BytesIO(body.encode('utf-8'))
+    return response
+
+
+def scan(scanner, text, size):
+    items = []
+    for start in range(0, len(text), size):
+        items.extend(scanner.feed(text[start:start + size]))
+    return items
+
+
+class TestJSONItemScanner:
+    def test_splits_arrays_whatever_the_chunk_size(self):
+        items = [{'a': 'x"\\y,]}', 'b': [1, {'c': None}]}, {'d': u'\u2603'},
+                 1, 'two', [3]]
+        text = json.dumps(items)
+        for size in (1, 2, 7, len(text)):
+            assert scan(JSONItemScanner(), text, size) == items
+
+    def test_finds_the_array_of_a_member(self):
+        # The members preceding the array must come first in the text
+        page = ('{"total_count": 2, "incomplete_results": false, '
+                '"items": [{"name": "items"}, {"name": "other"}]}')
+        scanner = JSONItemScanner('items')
+
+        assert scan(scanner, page, 3) == [{'name': 'items'},
+                                          {'name': 'other'}]
+        assert scanner.members == {'total_count': 2,
+                                   'incomplete_results': False}
+
+    def test_releases_decoded_items(self):
+        scanner = JSONItemScanner()
+        scanner.feed('[{"id": 1}, {"id": 2}, {"id"')
+        assert scanner._buffer == ' {"id"'
+
+    def test_falls_back_on_unexpected_documents(self):
+        scanner = JSONItemScanner()
+        assert scanner.feed('{"Python": 1}') == []
+        assert scanner.fallback is True
+        assert scanner.document() == {'Python': 1}
+
+
+class TestGitHubIteratorStreaming(UnitHelper):
+    described_class = GitHubIterator
+    url = 'https://api.github.com/users'
+
+    def create_instance_of_described_class(self):
+        iterator = self.described_class(count=-1, url=self.url, cls=dict,
+                                        session=self.session)
+        iterator.stream = True
+        return iterator
+
+    def test_streams_every_page(self):
+        next_url = self.url + '?since=2'
+        responses = [
+            streamed_response([{'id': 1}, {'id': 2}], [('next', next_url)]),
+            streamed_response([{'id': 3}]),
+        ]
+        self.session.get.side_effect = lambda *a, **k: responses.pop(0)
+
+        assert ids(self.instance) == [1, 2, 3]
+        self.session.get.assert_called_with(next_url, params=None,
+                                            headers={}, stream=True)
+        assert self.instance.last_response._content is False
+
+    def test_closes_partially_read_pages(self):
+        response = streamed_response([{'id': 1}, {'id': 2}])
+        response.close = mock.Mock()
+        self.session.get.return_value = response
+
+        iterator = GitHubIterator(1, self.url, dict, self.session)
+        iterator.stream = True
+
+        assert ids(iterator) == [1]
+        response.close.assert_called_once_with()
+
+    def test_search_iterator(self):
+        response = streamed_response(
+            '{"total_count": 1, "items": [{"id": 1}]}')
+        self.session.get.return_value = response
+        iterator = SearchIterator(-1, self.url, dict, self.session)
+        iterator.stream = True
+
+        assert ids(iterator) == [1]
+        assert iterator.total_count == 1
+        assert iterator.items == []
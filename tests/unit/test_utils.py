@@ -1,10 +1,14 @@
-from datetime import datetime
-from github3.utils import stream_response_to_file, timestamp_parameter
+from datetime import datetime, timedelta, tzinfo
+from github3 import utils
+from github3.utils import (extract_response, parse_timestamp,
+                           stream_response_to_file, timestamp_parameter, utc)
 
 import io
 import mock
 import pytest
 import requests
+import tarfile
+import zipfile
 
 
 class TestTimestampConverter:
@@ -34,6 +38,19 @@ class TestTimestampConverter:
         for timestamp in testvals:
             pytest.raises(ValueError, timestamp_parameter, timestamp)
 
+    def test_aware_datetimes_are_converted_to_utc(self):
+        class Offset(tzinfo):
+            def utcoffset(self, dt):
+                return timedelta(hours=2)
+
+        timestamp = datetime(2010, 6, 1, 14, 15, 30, tzinfo=Offset())
+        assert '2010-06-01T12:15:30Z' == timestamp_parameter(timestamp)
+
+    def test_parsed_timestamps_are_valid(self):
+        parse_timestamp('2010-06-01T12:15:30Z')
+        assert '2010-06-01T12:15:30Z' == timestamp_parameter(
+            '2010-06-01T12:15:30Z')
+
     def test_none_handling(self):
         assert timestamp_parameter(None, allow_none=True) is None
         pytest.raises(ValueError, timestamp_parameter, None,
@@ -81,6 +98,13 @@ class TestStreamingDownloads:
         assert fd.written_to is True
         assert fd.data == b'fake data'
 
+    def test_writes_bytes_to_other_files(self, response):
+        fd = mock.Mock(spec=['write'])
+        stream_response_to_file(response, fd)
+        data = fd.write.call_args[0][0]
+        assert isinstance(data, bytes)
+        assert data == b'fake data'
+
     def test_finds_filename_in_headers(self, mocked_open, response):
         with mock.patch('github3.utils.open', mocked_open, create=True):
             stream_response_to_file(response)
@@ -88,3 +112,147 @@ class TestStreamingDownloads:
         mocked_open.assert_called_once_with('a_file_name', 'wb')
         mocked_open().write.assert_called_once_with(b'fake data')
         mocked_open().close.assert_called_once_with()
+
+    def test_reads_into_a_buffer(self, response):
+        response.raw = mock.Mock(wraps=io.BytesIO(b'x' * 10))
+        fd = io.BytesIO()
+        stream_response_to_file(response, fd, chunk_size=4)
+
+        assert fd.getvalue() == b'x' * 10
+        assert response.raw.readinto.call_count == 4
+
+    def test_decodes_compressed_bodies(self, response):
+        response.headers['Content-Encoding'] = 'gzip'
+        with mock.patch.object(response, 'iter_content',
+                               return_value=[b'fake ', b'data']) as chunks:
+            fd = OpenFile()
+            stream_response_to_file(response, fd, chunk_size=1024)
+
+        chunks.assert_called_once_with(chunk_size=1024)
+        assert fd.data == b'fake data'
+
+
+def archive_response(format, files):
+    body = io.BytesIO()
+    if format == 'tarball':
+        with tarfile.open(fileobj=body, mode='w:gz') as tar:
+            for (name, data) in files:
+                info = tarfile.TarInfo(name)
+                if data is None:
+                    info.type = tarfile.DIRTYPE
+                elif data.startswith('->'):
+                    info.type = tarfile.SYMTYPE
+                    info.linkname = data[2:]
+                else:
+                    info.size = len(data)
+                tar.addfile(info, io.BytesIO(data.encode()) if
+                            info.isfile() else None)
+    else:
+        with zipfile.ZipFile(body, 'w') as archive:
+            for (name, data) in files:
+                archive.writestr(name, data or '')
+    body.seek(0)
+    r = requests.Response()
+    r.raw = body
+    return r
+
+
+class TestExtractResponse:
+    files = [
+        ('o-r-1/', None),
+        ('o-r-1/setup.py', 'setup'),
+        ('o-r-1/src/', None),
+        ('o-r-1/src/a.py', 'a'),
+        ('o-r-1/docs/index.rst', 'docs'),
+    ]
+
+    @pytest.mark.parametrize('format', ['tarball', 'zipball'])
+    def test_extracts_everything(self, tmpdir, format):
+        response = archive_response(format, self.files)
+        extracted = extract_response(response, str(tmpdir), format)
+
+        assert 'o-r-1/src/a.py' in extracted
+        assert tmpdir.join('o-r-1', 'src', 'a.py').read() == 'a'
+        assert tmpdir.join('o-r-1', 'docs', 'index.rst').read() == 'docs'
+
+    @pytest.mark.parametrize('format', ['tarball', 'zipball'])
+    def test_prefixes(self, tmpdir, format):
+        response = archive_response(format, self.files)
+        extracted = extract_response(response, str(tmpdir), format,
+                                     prefixes=['src/', 'setup.py'])
+
+        assert sorted(extracted) == ['o-r-1/setup.py', 'o-r-1/src',
+                                     'o-r-1/src/a.py']
+        assert not tmpdir.join('o-r-1', 'docs').check()
+
+    def test_skips_unsafe_members(self, tmpdir):
+        response = archive_response('tarball', [
+            ('o-r-1/../escape.txt', 'x'),
+            ('/etc/passwd', 'x'),
+            ('o-r-1/link', '->../../outside'),
+            ('o-r-1/ok', '->src/a.py'),
+        ])
+        directory = tmpdir.join('out')
+        extracted = extract_response(response, str(directory))
+
+        assert extracted == ['o-r-1/ok']
+        assert not tmpdir.join('escape.txt').check()
+
+    def test_unknown_format(self, tmpdir):
+        with pytest.raises(ValueError):
+            extract_response(requests.Response(), str(tmpdir), 'rar')
+
+
+class TestParseTimestamp:
+    def test_parses_github_timestamps(self):
+        dt = parse_timestamp('2012-10-04T06:42:55Z')
+        assert dt.replace(tzinfo=None) == datetime(2012, 10, 4, 6, 42, 55)
+        assert dt.utcoffset() == timedelta(0)
+
+    def test_uses_a_single_tzinfo(self):
+        first = parse_timestamp('2012-10-04T06:42:55Z')
+        second = parse_timestamp('2013-01-01T00:00:00Z')
+        assert first.tzinfo is second.tzinfo is utc
+
+    def test_memoizes_parsed_values(self):
+        assert (parse_timestamp('2014-02-03T04:05:06Z') is
+                parse_timestamp('2014-02-03T04:05:06Z'))
+
+    def test_cache_is_bounded(self):
+        with mock.patch('github3.utils._timestamp_cache_size', 2):
+            for second in range(10):
+                parse_timestamp('2014-02-03T04:05:{0:02d}Z'.format(second))
+            assert len(utils._timestamp_cache) <= 2
+
+    def test_handles_empty_values(self):
+        assert parse_timestamp(None) is None
+        assert parse_timestamp('') is None
+
+    def test_rejects_invalid_timestamps(self):
+        for value in ('2012-13-04T06:42:55Z', 'not a timestamp',
+                      '2012-10-04 06:42:55'):
+            pytest.raises(ValueError, parse_timestamp, value)
+
+    def test_matches_strptime(self):
+        value = '2011-01-26T19:01:12Z'
+        expected = datetime.strptime(value, '%Y-%m-%dT%H:%M:%SZ')
+        assert parse_timestamp(value) == expected.replace(tzinfo=utc)
+
+
+class TestMapConcurrently:
+    def test_preserves_order(self):
+        assert utils.map_concurrently(lambda x: x * 2, range(20),
+                                      workers=4) == list(range(0, 40, 2))
+
+    def test_returns_exceptions_in_place(self):
+        def func(x):
+            if x == 1:
+                raise ValueError(x)
+            return x
+
+        results = utils.map_concurrently(func, [0, 1, 2])
+        assert results[0] == 0 and results[2] == 2
+        assert isinstance(results[1], ValueError)
+
+    def test_handles_no_items(self):
+        assert utils.map_concurrently(len, []) == []